@@ -47,6 +47,9 @@ class Settings(BaseSettings):
         log_level: Logging verbosity (DEBUG, INFO, WARNING, ERROR)
         log_rotation_hours: Hours between log file rotations
         log_retention_days: Days to keep old log files
+        log_sample_debug: Fraction of DEBUG log events to keep
+        log_sample_info: Fraction of INFO log events to keep
+        log_file_format: Log file format, json or text
         
     Examples:
         >>> # Load settings from environment and .env file
@@ -138,6 +141,32 @@ class Settings(BaseSettings):
     # Increase for slower models or local setups, decrease for faster responses
     openai_timeout: int = Field(default=60, validation_alias=AliasChoices("OPENAI_TIMEOUT"))
     
+    # =============================================================================
+    # DATABASE CONNECTION POOL
+    # =============================================================================
+    # Connections kept open per worker process. Database work runs in the
+    # threadpool (40 threads by default), and a chat turn holds its connection
+    # for the whole AI call, so pool size + overflow should cover the threadpool.
+    db_pool_size: int = Field(default=32, ge=1, validation_alias=AliasChoices("DB_POOL_SIZE"))
+    
+    # Extra connections allowed beyond the pool size under bursts
+    db_max_overflow: int = Field(default=16, ge=0, validation_alias=AliasChoices("DB_MAX_OVERFLOW"))
+    
+    # Seconds after which a pooled connection is replaced - keeps connections
+    # younger than server/proxy idle timeouts without a ping per checkout
+    db_pool_recycle_seconds: int = Field(default=1800, validation_alias=AliasChoices("DB_POOL_RECYCLE_SECONDS"))
+    
+    # Test each connection with a round-trip on checkout; only needed when
+    # connections can be dropped sooner than the recycle interval
+    db_pool_pre_ping: bool = Field(default=False, validation_alias=AliasChoices("DB_POOL_PRE_PING"))
+    
+    # SQLite only: bytes of the database file read through memory-mapped I/O
+    # per connection (0 disables it)
+    sqlite_mmap_size_bytes: int = Field(default=268435456, ge=0, validation_alias=AliasChoices("SQLITE_MMAP_SIZE_BYTES"))
+    
+    # SQLite only: page cache size per connection, in KiB
+    sqlite_cache_size_kib: int = Field(default=65536, ge=0, validation_alias=AliasChoices("SQLITE_CACHE_SIZE_KIB"))
+    
     # =============================================================================
     # LOGGING CONFIGURATION
     # =============================================================================
@@ -155,6 +184,14 @@ class Settings(BaseSettings):
     # Days to keep old log files before deletion - manages disk space
     log_retention_days: int = Field(default=7, validation_alias=AliasChoices("LOG_RETENTION_DAYS"))
     
+    # Fraction of DEBUG / INFO events to keep (0.0-1.0) - sheds log volume under load
+    # WARNING and above are never sampled
+    log_sample_debug: float = Field(default=1.0, ge=0.0, le=1.0, validation_alias=AliasChoices("LOG_SAMPLE_DEBUG"))
+    log_sample_info: float = Field(default=1.0, ge=0.0, le=1.0, validation_alias=AliasChoices("LOG_SAMPLE_INFO"))
+    
+    # Log file format - "json" (one JSON object per line) or "text" (plain text)
+    log_file_format: str = Field(default="json", validation_alias=AliasChoices("LOG_FILE_FORMAT"))
+    
     # =============================================================================
     # INPUT VALIDATION  
     # =============================================================================
@@ -165,6 +202,17 @@ class Settings(BaseSettings):
     # Minimum length for character names - ensures meaningful inputs
     min_character_length: int = Field(default=1, validation_alias=AliasChoices("MIN_CHARACTER_LENGTH"))
     
+    # =============================================================================
+    # CHAT CONFIGURATION
+    # =============================================================================
+    # Character budget for the conversation history sent with each chat message;
+    # the oldest messages that do not fit are left out of the model call
+    chat_history_max_chars: int = Field(default=8000, ge=0, validation_alias=AliasChoices("CHAT_HISTORY_MAX_CHARS"))
+    
+    # Maximum number of recent messages read from the database as chat history;
+    # bounds the history query before the character budget is applied
+    chat_history_max_messages: int = Field(default=50, ge=0, validation_alias=AliasChoices("CHAT_HISTORY_MAX_MESSAGES"))
+    
     # =============================================================================
     # RETRY CONFIGURATION
     # =============================================================================
@@ -261,6 +309,22 @@ class Settings(BaseSettings):
         # Remove trailing slash for consistency
         return v.rstrip("/") if v else v
     
+    @field_validator("provider_model")
+    @classmethod
+    def intern_provider_model(cls, v: Optional[str]) -> Optional[str]:
+        """Intern the model identifier.
+        
+        The pricing tables intern their model keys, so interning this value
+        makes the per-request pricing lookup an identity match.
+        
+        Args:
+            v: The model identifier (from PROVIDER_MODEL env var)
+            
+        Returns:
+            The interned model identifier or None if not provided
+        """
+        return sys.intern(v) if v else v
+    
     @field_validator("provider_headers")
     @classmethod
     def parse_provider_headers(cls, v: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
@@ -93,6 +93,9 @@ class CustomProviderSettings(BaseSettings):
     log_level: str = Field(default="INFO", validation_alias=AliasChoices("LOG_LEVEL"))
     log_rotation_hours: int = Field(default=1, validation_alias=AliasChoices("LOG_ROTATION_HOURS"))
     log_retention_days: int = Field(default=7, validation_alias=AliasChoices("LOG_RETENTION_DAYS"))
+    log_sample_debug: float = Field(default=1.0, ge=0.0, le=1.0, validation_alias=AliasChoices("LOG_SAMPLE_DEBUG"))
+    log_sample_info: float = Field(default=1.0, ge=0.0, le=1.0, validation_alias=AliasChoices("LOG_SAMPLE_INFO"))
+    log_file_format: str = Field(default="json", validation_alias=AliasChoices("LOG_FILE_FORMAT"))
     
     # =============================================================================
     # RETRY CONFIGURATION (inherited from main settings)
@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, ForeignKey, Numeric
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, DateTime, Float, ForeignKey, Index, Numeric, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
-from typing import Generator
+from types import MappingProxyType
+from typing import Generator, Mapping
 import os
 import time
 from contextlib import contextmanager
@@ -15,14 +16,44 @@ logger = get_logger(__name__)
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./stories.db")
 
+# Connection pool sized for the threadpool that runs database work; an
+# in-memory SQLite database lives in a single connection and is not pooled
+_pool_options = {
+    "pool_pre_ping": settings.db_pool_pre_ping,
+    "pool_recycle": settings.db_pool_recycle_seconds,
+}
+if DATABASE_URL not in ("sqlite://", "sqlite:///:memory:"):
+    _pool_options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-    pool_pre_ping=True,
-    echo=settings.debug_mode
+    echo=settings.debug_mode,
+    **_pool_options
 )
 
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection, connection_record):
+        """Apply the per-connection SQLite settings.
+        
+        Foreign keys, which SQLite leaves off, are needed for ON DELETE
+        CASCADE from chat conversations to their messages. WAL journaling
+        lets reads such as the cost analytics run while a request is being
+        saved, and NORMAL sync is safe under WAL. The memory-mapped I/O and
+        page cache serve the analytics' range scans without a read call
+        per page.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}")
+        cursor.close()
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -54,6 +85,15 @@ class Story(Base):
     output_cost_per_1k_tokens = Column(Numeric(precision=8, scale=6), nullable=True, comment="Cost per 1000 output tokens used for calculation")
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # The cost analytics read only billed stories by date; the partial index
+    # holds just those rows, with every column the aggregates read
+    __table_args__ = (
+        Index("ix_stories_billed_created", "created_at", "estimated_cost_usd",
+              "method", "model", "total_tokens",
+              sqlite_where=text("estimated_cost_usd IS NOT NULL"),
+              postgresql_where=text("estimated_cost_usd IS NOT NULL")),
+    )
 
 class ChatConversation(Base):
     __tablename__ = "chat_conversations"
@@ -65,16 +105,24 @@ class ChatConversation(Base):
     provider = Column(String(50))
     model = Column(String(100))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Conversation list order
     
     # Relationship to messages
-    messages = relationship("ChatMessage", back_populates="conversation", cascade="all, delete-orphan")
+    # Tables created before chat_messages declared ON DELETE CASCADE keep the
+    # plain foreign key (create_all does not alter existing tables), so the
+    # ORM still deletes a conversation's messages itself
+    messages = relationship("ChatMessage", back_populates="conversation", cascade="all, delete-orphan",
+                            order_by="(ChatMessage.created_at, ChatMessage.id)")
+    
+    # Server-generated IDs and timestamps come back with the INSERT
+    # (RETURNING where supported), so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
     
     id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("chat_conversations.id"), nullable=False)
+    conversation_id = Column(Integer, ForeignKey("chat_conversations.id", ondelete="CASCADE"), nullable=False)
     role = Column(String(20), nullable=False)  # 'user' or 'assistant'
     content = Column(Text, nullable=False)
     generation_time_ms = Column(Float)
@@ -93,6 +141,20 @@ class ChatMessage(Base):
     
     # Relationship to conversation
     conversation = relationship("ChatConversation", back_populates="messages")
+    
+    # History and last-message lookups read one conversation's messages in
+    # created_at order, which this index serves without a sort. The cost
+    # analytics read only billed AI replies by date; the partial index holds
+    # just those rows, with every column the aggregates and their filter
+    # read, so they are answered from the index alone.
+    __table_args__ = (
+        Index("ix_chat_messages_conversation_created", "conversation_id", "created_at"),
+        Index("ix_chat_messages_billed_created", "created_at", "conversation_id",
+              "estimated_cost_usd", "total_tokens", "role",
+              sqlite_where=text("role = 'assistant' AND estimated_cost_usd IS NOT NULL"),
+              postgresql_where=text("role = 'assistant' AND estimated_cost_usd IS NOT NULL")),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
 class ContextPromptExecution(Base):
     __tablename__ = "context_prompt_executions"
@@ -143,6 +205,64 @@ class ContextPromptExecution(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # The cost analytics read only completed, billed executions by date; the
+    # partial index holds just those rows, with every column the aggregates
+    # and their filter read
+    __table_args__ = (
+        Index("ix_context_prompt_executions_billed_created", "created_at", "estimated_cost_usd",
+              "method", "model", "total_tokens", "status",
+              sqlite_where=text("status = 'completed' AND estimated_cost_usd IS NOT NULL"),
+              postgresql_where=text("status = 'completed' AND estimated_cost_usd IS NOT NULL")),
+    )
+
+# Stories, chat messages and context executions are the billed rows the
+# cost analytics read. The analytics cache their responses, so every commit
+# of an application session that wrote billed rows starts a new version of
+# the billed data, which makes the cached responses stale.
+_BILLED_MODELS = (Story, ChatMessage, ContextPromptExecution)
+_billed_data_version = 0
+
+def get_billed_data_version() -> int:
+    """Get the current version of the billed data.
+    
+    Returns:
+        A number that changes whenever billed rows are committed.
+    """
+    return _billed_data_version
+
+def billed_data_changed() -> None:
+    """Start a new version of the billed data.
+    
+    Commits through ``SessionLocal`` sessions do this on their own. Bulk
+    deletes fire no flush events, so callers that bulk delete billed rows
+    call this after committing them.
+    """
+    global _billed_data_version
+    _billed_data_version += 1
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_billed_changes(session, flush_context) -> None:
+    """Remember that the session flushed billed rows.
+    
+    The version only moves on at commit: a read between the flush and the
+    commit still sees the old data, and caching it under a version taken
+    at flush would hide the new rows.
+    """
+    if any(isinstance(obj, _BILLED_MODELS)
+           for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["billed_data_changed"] = True
+
+@event.listens_for(SessionLocal, "after_commit")
+def _commit_billed_changes(session) -> None:
+    """Start a new billed data version once flushed billed rows are committed."""
+    if session.info.pop("billed_data_changed", False):
+        billed_data_changed()
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_billed_changes(session) -> None:
+    """Forget billed rows whose flush was rolled back."""
+    session.info.pop("billed_data_changed", None)
 
 # Dependency to get DB session
 def get_db() -> Generator:
@@ -309,22 +429,26 @@ def init_db():
                         error_type=type(fallback_error).__name__)
             raise
 
-def get_model_info() -> dict:
+# Provider and model are fixed once settings load, so the info is built once
+_MODEL_INFO: Mapping[str, str] = MappingProxyType({
+    "provider": settings.provider_name,
+    "model": settings.provider_model
+})
+
+def get_model_info() -> Mapping[str, str]:
     """Get current model information.
     
     Returns information about the currently configured
     provider and model based on the application settings.
+    The mapping is shared and read-only.
     
     Returns:
-        A dictionary containing:
+        A mapping containing:
         - provider: The provider name
         - model: The specific model being used
         
     Examples:
-        >>> get_model_info()
+        >>> dict(get_model_info())
         {'provider': 'LLM Provider', 'model': 'llama2'}
     """
-    return {
-        "provider": settings.provider_name,
-        "model": settings.provider_model
-    }
\ No newline at end of file
+    return _MODEL_INFO
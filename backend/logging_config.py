@@ -1,19 +1,78 @@
+import orjson
 import structlog
+import atexit
 import logging
 import logging.handlers
+import queue
+import random
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional
 import os
 import re
 import sys
-from datetime import datetime
+import time
 
-# Import transaction context functions
+# Import the transaction GUID context variable
 try:
-    from .transaction_context import get_current_transaction_guid
+    from .transaction_context import _transaction_guid_var
 except ImportError:
     # Fallback for when module is run directly
-    from transaction_context import get_current_transaction_guid
+    from transaction_context import _transaction_guid_var
+
+
+# Matches the "%Y-%m-%d_%H" suffix of rotated log files
+_ROTATED_SUFFIX_RE = re.compile(r"^\d{4}-\d{2}-\d{2}_\d{2}$")
+
+# Event keys rendered in the plain text prefix rather than as key=value extras
+_SKIP_KEYS = frozenset({'timestamp', 'level', 'logger', 'event'})
+
+
+class IsoTimeStamper:
+    """Processor that adds a UTC ISO 8601 timestamp to log entries.
+    
+    Produces the same ``2024-01-01T12:00:00.123456Z`` format as
+    ``structlog.processors.TimeStamper(fmt="iso")`` but caches the
+    ``YYYY-MM-DDTHH:MM:SS`` prefix for the current second, so ``strftime``
+    runs at most once per second and each event only formats microseconds.
+    """
+    
+    __slots__ = ('_cached', '_time')
+    
+    def __init__(self):
+        """Initialize the stamper with an empty cache."""
+        # (whole second, formatted prefix) - one attribute so readers on other
+        # threads never see a prefix from a different second
+        self._cached = (-1, '')
+        self._time = time.time
+    
+    def stamp(self) -> str:
+        """Return the current UTC time as an ISO 8601 string ending in ``Z``."""
+        now = self._time()
+        second = int(now)
+        cached_second, prefix = self._cached
+        if second != cached_second:
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._cached = (second, prefix)
+        return f"{prefix}.{int((now - second) * 1_000_000):06d}Z"
+    
+    def __call__(self, logger, method_name, event_dict):
+        """Add the ``timestamp`` key to a log event.
+        
+        Args:
+            logger: The logger instance.
+            method_name: The logging method name (info, error, etc.).
+            event_dict: The structured log event data.
+            
+        Returns:
+            The event_dict with timestamp added.
+        """
+        event_dict['timestamp'] = self.stamp()
+        return event_dict
+
+
+# Shared stamper for the processor chain and the formatter fallback
+_iso_stamper = IsoTimeStamper()
 
 
 class PlainTextFormatter(logging.Formatter):
@@ -27,7 +86,10 @@ class PlainTextFormatter(logging.Formatter):
         """Format a log record as plain text.
         
         Converts structured log data into a readable format:
-        [timestamp] [LEVEL] [logger] message key=value key=value
+        [timestamp] [LEVEL] [logger] message | key=value key=value
+        
+        Records produced by ``DualOutputProcessor`` carry the structlog
+        event dict as ``msg``; anything else uses standard formatting.
         
         Args:
             record: The LogRecord to format.
@@ -35,72 +97,199 @@ class PlainTextFormatter(logging.Formatter):
         Returns:
             A formatted plain text string.
         """
+        data = record.msg
+        if not isinstance(data, dict):
+            return super().format(record)
+        
         try:
-            # Parse the structured log data
-            if hasattr(record, 'msg') and isinstance(record.msg, dict):
-                data = record.msg
-            else:
-                # Try to parse as a structured message
-                msg = str(record.getMessage())
-                if msg.startswith('{') and msg.endswith('}'):
-                    import json
-                    try:
-                        data = json.loads(msg)
-                    except:
-                        data = {'event': msg}
-                else:
-                    data = {'event': msg}
-            
             # Extract main components
-            timestamp = data.get('timestamp', datetime.utcnow().isoformat() + 'Z')
+            timestamp = data['timestamp'] if 'timestamp' in data else _iso_stamper.stamp()
             level = data.get('level', record.levelname).upper()
             logger_name = data.get('logger', record.name)
             event = data.get('event', '')
             
-            # Build the base message
-            parts = [
-                f"[{timestamp}]",
-                f"[{level}]",
-                f"[{logger_name}]" if logger_name else "",
-                event
-            ]
-            
-            base_message = " ".join(filter(None, parts))
+            # Append every fragment to one buffer and join once at the end,
+            # omitting an empty logger name or event
+            buf = ['[', timestamp, '] [', level, ']']
+            append = buf.append
+            if logger_name:
+                append(' [')
+                append(logger_name)
+                append(']')
+            if event:
+                append(' ')
+                append(event)
             
             # Add additional key-value pairs
-            extras = []
-            skip_keys = {'timestamp', 'level', 'logger', 'event'}
-            
+            skip_keys = _SKIP_KEYS
+            separator = ' | '
             for key, value in data.items():
                 if key not in skip_keys and value is not None:
-                    extras.append(f"{key}={value}")
+                    append(separator)
+                    append(key)
+                    append('=')
+                    append(value if type(value) is str else str(value))
+                    separator = ' '
             
-            if extras:
-                return f"{base_message} | {' '.join(extras)}"
-            else:
-                return base_message
+            return "".join(buf)
                 
         except Exception:
             # Fallback to standard formatting
             return super().format(record)
 
 
+# Numeric stdlib level for each structlog method name
+_LEVEL_MAP = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'warn': logging.WARNING,
+    'error': logging.ERROR,
+    'exception': logging.ERROR,
+    'critical': logging.CRITICAL,
+    'fatal': logging.CRITICAL,
+}
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Formatter for JSON-lines file logging.
+    
+    Structlog event dicts are serialized with orjson. Anything else, such as
+    a line already rendered to JSON by the production pipeline, is written
+    as its message unchanged.
+    """
+    
+    def format(self, record):
+        """Format a log record as a single JSON line.
+        
+        Args:
+            record: The LogRecord to format.
+            
+        Returns:
+            The JSON line without a trailing newline.
+        """
+        data = record.msg
+        if not isinstance(data, dict):
+            return super().format(record)
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except Exception:
+            return super().format(record)
+
+
+class BufferedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Timed rotating file handler that buffers writes instead of flushing per record.
+    
+    The stock ``StreamHandler.emit`` flushes after every record, costing one
+    ``write()`` syscall per log line. This handler opens the log file with a
+    large write buffer and only flushes when:
+    
+    - a record at or above ``flush_level`` is emitted (errors hit disk at once),
+    - ``flush_interval`` seconds have passed since the last flush, or
+    - ``flush()`` is called explicitly (the file writer thread does this when
+      its queue runs dry, and rollover/close flush as part of closing the stream).
+    """
+    
+    def __init__(self, *args, buffer_size: int = 65536, flush_level: int = logging.ERROR,
+                 flush_interval: float = 30.0, **kwargs):
+        """Initialize the buffered handler.
+        
+        Args:
+            *args: Positional arguments for ``TimedRotatingFileHandler``.
+            buffer_size: Size of the file write buffer in bytes. Defaults to 64 KiB.
+            flush_level: Records at or above this level are flushed immediately.
+                Defaults to ERROR.
+            flush_interval: Maximum seconds buffered records may wait before a
+                flush. Defaults to 30.
+            **kwargs: Keyword arguments for ``TimedRotatingFileHandler``.
+        """
+        # Must be set before the base class opens the stream
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        """Open the current log file with a ``buffer_size`` write buffer."""
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        """Write a record to the buffer, rolling over and flushing as needed.
+        
+        Args:
+            record: The LogRecord to write.
+        """
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if (record.levelno >= self.flush_level
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        """Flush the write buffer to disk."""
+        super().flush()
+        self._last_flush = time.monotonic()
+
+
 class DualOutputProcessor:
     """Processor to handle dual output to console and file with different formats.
     
     This processor intercepts log messages and sends them to file handlers
-    with plain text formatting while allowing console output to use colors.
+    with their own formatting while allowing console output to use colors.
+    
+    With ``rendered=True`` it is placed after the renderer instead and tees
+    the already-rendered line (``str`` or ``bytes``) to the file, so each
+    event is serialized only once.
+    
+    File output is asynchronous: ``__call__`` only enqueues a snapshot of the
+    event, and a single daemon thread drains the queue in batches, building
+    the ``LogRecord`` objects and flushing the handler whenever the queue runs
+    dry. This keeps record construction, formatting and the ``write()`` syscall
+    off the request path.
+    
+    When the backlog exceeds ``max_queue_size``, DEBUG and INFO events are
+    dropped; WARNING and above are always enqueued so they are never lost.
     """
     
-    def __init__(self, file_handler, debug_mode=False):
-        """Initialize the dual output processor.
+    # Log methods whose events may be dropped when the queue is saturated
+    DROPPABLE_METHODS = frozenset({'debug', 'info'})
+    
+    def __init__(self, file_handler, debug_mode=False, batch_size=256, max_queue_size=10000,
+                 rendered=False):
+        """Initialize the dual output processor and start its writer thread.
         
         Args:
-            file_handler: The file handler to write plain text logs to.
+            file_handler: The file handler to write logs to.
             debug_mode: Whether debug mode is enabled.
+            batch_size: Maximum number of records written per flush.
+            max_queue_size: Backlog size above which DEBUG/INFO events are dropped.
+            rendered: Whether events arrive already rendered by the final
+                structlog renderer rather than as event dicts.
         """
         self.file_handler = file_handler
         self.debug_mode = debug_mode
+        self.rendered = rendered
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self.dropped_count = 0
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._drain,
+            name="log-file-writer",
+            daemon=True
+        )
+        self._thread.start()
     
     def __call__(self, logger, method_name, event_dict):
         """Process a log event for dual output.
@@ -108,33 +297,107 @@ class DualOutputProcessor:
         Args:
             logger: The logger instance.
             method_name: The logging method name (info, error, etc.).
-            event_dict: The structured log event data.
+            event_dict: The structured log event data, or the rendered line
+                when ``rendered`` is set.
             
         Returns:
             The event_dict unchanged (for console processing).
         """
-        # Create a log record for file output
-        if self.file_handler:
-            try:
-                # Create a plain text version for file
-                record = logging.LogRecord(
-                    name=event_dict.get('logger', ''),
-                    level=getattr(logging, method_name.upper(), logging.INFO),
-                    pathname='',
-                    lineno=0,
-                    msg=event_dict,
-                    args=(),
-                    exc_info=None
-                )
-                
-                # Write to file handler
-                self.file_handler.emit(record)
-                
-            except Exception:
-                # If file logging fails, don't break console logging
-                pass
+        if self.file_handler and not self._closed:
+            if (method_name in self.DROPPABLE_METHODS
+                    and self._queue.qsize() >= self.max_queue_size):
+                self.dropped_count += 1
+            elif self.rendered:
+                # Rendered lines are immutable, no copy needed
+                self._queue.put((method_name, event_dict))
+            else:
+                # Snapshot the event: console renderers mutate event_dict
+                # before the writer thread gets to it
+                self._queue.put((method_name, dict(event_dict)))
         
         return event_dict
+    
+    def _drain(self):
+        """Write queued events to the file handler until closed.
+        
+        Blocks for the first event of each batch, then takes up to
+        ``batch_size - 1`` more without waiting. The handler is flushed once
+        the queue is empty; while it stays busy, a buffering handler decides
+        when to write.
+        """
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        running = True
+        
+        while running:
+            batch = [get()]
+            idle = False
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                idle = True
+            
+            for item in batch:
+                if item is None:
+                    # Shutdown sentinel from close()
+                    running = False
+                    continue
+                self._write(*item)
+            
+            if idle or not running:
+                try:
+                    self.file_handler.flush()
+                except Exception:
+                    pass
+    
+    def _write(self, method_name, event_dict):
+        """Build a LogRecord for a queued event and hand it to the file handler.
+        
+        Args:
+            method_name: The logging method name (info, error, etc.).
+            event_dict: Snapshot of the structured log event data, or the
+                rendered line when ``rendered`` is set.
+        """
+        try:
+            if self.rendered:
+                name = ''
+                if isinstance(event_dict, bytes):
+                    event_dict = event_dict.decode('utf-8', 'replace')
+            else:
+                name = event_dict.get('logger', '')
+            
+            record = logging.LogRecord(
+                name=name,
+                level=_LEVEL_MAP.get(method_name, logging.INFO),
+                pathname='',
+                lineno=0,
+                msg=event_dict,
+                args=(),
+                exc_info=None
+            )
+            
+            # Write to file handler
+            self.file_handler.handle(record)
+            
+        except Exception:
+            # If file logging fails, don't break console logging
+            pass
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain any pending events and stop the writer thread.
+        
+        Safe to call more than once; the active processor is closed at
+        exit by ``_shutdown_logging``.
+        
+        Args:
+            timeout: Seconds to wait for the writer thread to finish.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
 
 
 class TransactionGuidProcessor:
@@ -143,8 +406,18 @@ class TransactionGuidProcessor:
     This processor adds the current transaction GUID to all log entries
     if one exists in the context. This ensures complete traceability
     without requiring manual GUID inclusion in every log call.
+    
+    The context variable's ``get`` is bound once at construction so each
+    event costs a single C call, and events logged outside a transaction
+    return immediately.
     """
     
+    __slots__ = ('_get',)
+    
+    def __init__(self):
+        """Bind the transaction GUID context variable lookup."""
+        self._get = _transaction_guid_var.get
+    
     def __call__(self, logger, method_name, event_dict):
         """Process a log event to add transaction GUID.
         
@@ -156,27 +429,305 @@ class TransactionGuidProcessor:
         Returns:
             The event_dict with transaction_guid added if available.
         """
-        # Get current transaction GUID from context
-        transaction_guid = get_current_transaction_guid()
+        transaction_guid = self._get()
         
         # Only add if GUID exists and isn't already in the event
-        if transaction_guid and 'transaction_guid' not in event_dict:
+        if transaction_guid is not None and 'transaction_guid' not in event_dict:
             event_dict['transaction_guid'] = transaction_guid
         
         return event_dict
 
+
+class SamplingProcessor:
+    """Processor to keep only a fraction of low-severity log events.
+    
+    Events whose method name has a configured rate below 1.0 are dropped
+    at random with probability ``1 - rate`` by raising ``structlog.DropEvent``.
+    Placed right after level filtering, so dropped events skip timestamping,
+    callsite lookup, rendering and file output. Methods without a rate
+    (WARNING and above by default) are always kept.
+    """
+    
+    __slots__ = ('rates', '_random')
+    
+    def __init__(self, rates: Dict[str, float]):
+        """Initialize the sampler.
+        
+        Args:
+            rates: Mapping of log method name (``debug``, ``info``, ...) to the
+                fraction of events to keep, between 0.0 and 1.0.
+        """
+        self.rates = rates
+        self._random = random.random
+    
+    def __call__(self, logger, method_name, event_dict):
+        """Drop the event if it loses the sampling draw.
+        
+        Args:
+            logger: The logger instance.
+            method_name: The logging method name (info, error, etc.).
+            event_dict: The structured log event data.
+            
+        Returns:
+            The event_dict unchanged if it is kept.
+            
+        Raises:
+            structlog.DropEvent: If the event is sampled out.
+        """
+        rate = self.rates.get(method_name)
+        if rate is not None and self._random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+
+class NamedBytesLogger(structlog.BytesLogger):
+    """``BytesLogger`` that remembers the name it was requested under.
+    
+    Lets ``structlog.stdlib.add_logger_name`` work in the production
+    pipeline, which writes bytes directly instead of using stdlib loggers.
+    """
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, file=None, name: str = ''):
+        super().__init__(file)
+        self.name = name
+
+
+class NamedBytesLoggerFactory:
+    """Produce ``NamedBytesLogger`` instances for ``structlog.configure``."""
+    
+    __slots__ = ('_file',)
+    
+    def __init__(self, file=None):
+        """Initialize the factory.
+        
+        Args:
+            file: Binary file to write to. Defaults to ``sys.stdout.buffer``.
+        """
+        self._file = file
+    
+    def __call__(self, *args: Any) -> NamedBytesLogger:
+        """Create a logger named after the first positional argument, if any."""
+        return NamedBytesLogger(self._file, args[0] if args else '')
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the log queue is full.
+    
+    Logging call sites only pay for a ``put_nowait``; when the console
+    listener falls behind, records are counted in ``dropped_count`` instead
+    of blocking the caller or printing a handler error.
+    """
+    
+    def __init__(self, queue):
+        """Initialize the handler.
+        
+        Args:
+            queue: Bounded queue shared with a ``LogQueueListener``.
+        """
+        super().__init__(queue)
+        self.dropped_count = 0
+    
+    def enqueue(self, record):
+        """Enqueue a record, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_count += 1
+
+
+class QueuedStream:
+    """Write-only binary stream that hands each write to a log queue.
+    
+    Used as the ``file`` of the production structlog ``BytesLogger`` so
+    rendered lines are written to the console by the listener thread.
+    """
+    
+    __slots__ = ('_queue', 'dropped_count')
+    
+    def __init__(self, log_queue):
+        """Initialize the stream.
+        
+        Args:
+            log_queue: Bounded queue shared with a ``LogQueueListener``.
+        """
+        self._queue = log_queue
+        self.dropped_count = 0
+    
+    def write(self, data: bytes) -> None:
+        """Enqueue rendered bytes, dropping them if the queue is full."""
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self.dropped_count += 1
+    
+    def flush(self) -> None:
+        """No-op; the listener thread flushes the real stream."""
+
+
+class LogQueueListener(logging.handlers.QueueListener):
+    """QueueListener that writes queued records and rendered lines to the console.
+    
+    ``LogRecord`` items are dispatched to the handlers as usual; ``bytes``
+    items from a ``QueuedStream`` are written to ``stream`` directly.
+    
+    The thread drains up to ``batch_size`` items per wakeup and writes runs
+    of rendered lines with a single ``write`` and ``flush``, so a burst of
+    log calls costs one syscall instead of one per line.
+    """
+    
+    def __init__(self, log_queue, stream, *handlers, batch_size=256):
+        """Initialize the listener.
+        
+        Args:
+            log_queue: Queue fed by ``DroppingQueueHandler``/``QueuedStream``.
+            stream: Binary stream for rendered lines, e.g. ``sys.stderr.buffer``.
+            *handlers: Handlers for ``LogRecord`` items.
+            batch_size: Maximum number of items handled per wakeup.
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.stream = stream
+        self.batch_size = batch_size
+    
+    def handle(self, record):
+        """Write a rendered line or dispatch a record to the handlers."""
+        if isinstance(record, bytes):
+            self._write_lines([record])
+        else:
+            super().handle(record)
+    
+    def _write_lines(self, lines):
+        """Write rendered lines to the stream with one write and flush."""
+        try:
+            self.stream.write(lines[0] if len(lines) == 1 else b"".join(lines))
+            self.stream.flush()
+        except (OSError, ValueError):
+            # Stream closed or unavailable; nothing useful to report to
+            pass
+    
+    def _monitor(self):
+        """Drain the queue in batches until the stop sentinel is seen."""
+        log_queue = self.queue
+        has_task_done = hasattr(log_queue, 'task_done')
+        batch_size = self.batch_size
+        stopping = False
+        while not stopping:
+            batch = [self.dequeue(True)]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            
+            lines = []
+            for item in batch:
+                if item is self._sentinel:
+                    stopping = True
+                elif isinstance(item, bytes):
+                    lines.append(item)
+                else:
+                    # Keep ordering: write pending lines before the record
+                    if lines:
+                        self._write_lines(lines)
+                        lines = []
+                    super().handle(item)
+            if lines:
+                self._write_lines(lines)
+            
+            if has_task_done:
+                for _ in batch:
+                    log_queue.task_done()
+    
+    def enqueue_sentinel(self):
+        """Enqueue the stop sentinel, waiting for room if the queue is full."""
+        self.queue.put(self._sentinel)
+    
+    def stop(self):
+        """Drain the queue and stop the listener thread. Safe to call twice."""
+        if self._thread is not None:
+            super().stop()
+
+
+# Third-party loggers routed to the console handler by configure_logging
+_THIRD_PARTY_LOGGERS = (
+    'uvicorn', 'uvicorn.access', 'uvicorn.error', 'fastapi',
+    'sqlalchemy.engine', 'sqlalchemy', 'alembic',
+    'tenacity', 'openai', 'httpx', 'httpcore'
+)
+# Subset capped at WARNING to suppress retry-related noise
+_QUIET_THIRD_PARTY_LOGGERS = frozenset({'tenacity', 'openai', 'httpx', 'httpcore'})
+
+# Stateless processors shared by every configure_logging call, built once
+# per process so reconfiguring (tests, --reload) does not rebuild them
+_COMMON_PROCESSORS = (
+    structlog.contextvars.merge_contextvars,  # Per-request fields bound by middleware
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    _iso_stamper,
+    TransactionGuidProcessor(),  # Add transaction GUID to all log entries
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+)
+_CALLSITE_PROCESSOR = structlog.processors.CallsiteParameterAdder(
+    parameters=[
+        structlog.processors.CallsiteParameter.FILENAME,
+        structlog.processors.CallsiteParameter.LINENO,
+    ]
+)
+# orjson.dumps returns bytes, as the production BytesLogger expects
+_JSON_RENDERER = structlog.processors.JSONRenderer(
+    serializer=orjson.dumps,
+    option=orjson.OPT_NON_STR_KEYS
+)
+
+# Active file-output processor, closed when logging is reconfigured
+_dual_output_processor: Optional[DualOutputProcessor] = None
+
+# Console output goes through this queue and listener thread. Both live for
+# the whole process: loggers resolved under an earlier configuration keep
+# the stream they were bound with, so reconfiguring only swaps the
+# listener's console handler and output stream.
+_LOG_QUEUE_SIZE = 10000
+_log_queue: queue.Queue = queue.Queue(maxsize=_LOG_QUEUE_SIZE)
+_queued_stream = QueuedStream(_log_queue)
+_queue_listener: Optional[LogQueueListener] = None
+
+
+def _shutdown_logging() -> None:
+    """Write out pending console and file output at interpreter exit."""
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    if _dual_output_processor is not None:
+        _dual_output_processor.close()
+
+
+atexit.register(_shutdown_logging)
+
+# Whether DEBUG events are emitted; structlog's default config prints everything
+_debug_enabled = True
+
+
 def configure_logging(
     debug: bool = False, 
     log_file_path: Optional[str] = None,
     log_level: str = "INFO",
     rotation_hours: int = 1,
-    retention_days: int = 7
+    retention_days: int = 7,
+    sample_rates: Optional[Dict[str, float]] = None,
+    file_format: str = "json"
 ) -> None:
     """Configure structured logging for the application.
     
     Sets up both console and file logging with structured log formatting
-    using structlog. Console output uses colored formatting in debug mode,
-    while file output always uses plain text format for readability.
+    using structlog. Console output uses colored formatting in debug mode.
+    Neither output blocks the caller: console writes go through a bounded
+    queue to a listener thread, and file writes to a separate writer thread.
+    File output is JSON lines by default; in production the line rendered
+    for the console is reused so events are serialized once. The older
+    plain text file format is available with ``file_format="text"``.
     
     Args:
         debug: Whether to enable debug mode with colored console output.
@@ -188,18 +739,27 @@ def configure_logging(
         rotation_hours: Hours between log file rotations. Defaults to 1.
         retention_days: Number of days to retain rotated log files.
             Defaults to 7.
+        sample_rates: Fraction of events to keep per log method, e.g.
+            ``{"debug": 0.01, "info": 0.1}``. Methods not listed, or with a
+            rate of 1.0, are always kept. Defaults to None (no sampling).
+        file_format: File log format, "json" or "text". Defaults to "json".
             
     Examples:
         >>> configure_logging(debug=True)  # Debug mode with console only
         >>> configure_logging(log_file_path="logs/app.log")  # With file logging
         >>> configure_logging(log_level="DEBUG", retention_days=30)
+        >>> configure_logging(sample_rates={"debug": 0.01, "info": 0.1})
+        >>> configure_logging(log_file_path="logs/app.log", file_format="text")
     """
     
+    global _dual_output_processor, _queue_listener, _debug_enabled
+    
     # Set log level
     if debug:
         level = logging.DEBUG
     else:
         level = getattr(logging, log_level.upper(), logging.INFO)
+    _debug_enabled = level <= logging.DEBUG
     
     # Clear any existing handlers
     root_logger = logging.getLogger()
@@ -216,15 +776,16 @@ def configure_logging(
     console_handler.setFormatter(console_formatter)
     handlers.append(console_handler)
     
-    # File handler (if log file path is provided) - uses plain text formatting
+    # File handler (if log file path is provided) - JSON lines or plain text
+    json_file_format = file_format.lower() != "text"
     file_handler = None
     if log_file_path:
         # Ensure log directory exists
         log_path = Path(log_file_path)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Create rotating file handler (rotates every hour)
-        file_handler = logging.handlers.TimedRotatingFileHandler(
+        # Create buffered rotating file handler (rotates every hour)
+        file_handler = BufferedTimedRotatingFileHandler(
             filename=log_file_path,
             when='H',  # Rotate hourly
             interval=rotation_hours,  # Rotation interval
@@ -236,37 +797,46 @@ def configure_logging(
         
         # Set file naming pattern for rotated logs
         file_handler.suffix = "%Y-%m-%d_%H"
-        file_handler.extMatch = re.compile(r"^\d{4}-\d{2}-\d{2}_\d{2}$")
+        file_handler.extMatch = _ROTATED_SUFFIX_RE
         
-        # Plain text formatter for file logs (readable in text editors)
-        file_formatter = PlainTextFormatter()
+        # JSON lines, or plain text readable in text editors
+        file_formatter = JsonLineFormatter() if json_file_format else PlainTextFormatter()
         file_handler.setFormatter(file_formatter)
         handlers.append(file_handler)
         
         print(f"File logging enabled: {log_file_path} (rotation: {rotation_hours}h, retention: {retention_days}d)")
     
+    # Console output is written by a listener thread; log calls only enqueue
+    queue_handler = DroppingQueueHandler(_log_queue)
+    queue_handler.setLevel(level)
+    if _queue_listener is None:
+        _queue_listener = LogQueueListener(_log_queue, sys.stderr.buffer, console_handler)
+    else:
+        _queue_listener.handlers = (console_handler,)
+        _queue_listener.stream = sys.stderr.buffer
+    if _queue_listener._thread is None:
+        _queue_listener.start()
+    
     # Configure standard logging to intercept non-structlog messages
     logging.basicConfig(
         level=level,
-        handlers=[console_handler],  # Only console handler in basicConfig
+        handlers=[queue_handler],  # Only the queued console handler in basicConfig
         format="%(message)s"
     )
     
-    # Configure third-party loggers to use consistent formatting
-    third_party_loggers = [
-        'uvicorn', 'uvicorn.access', 'uvicorn.error', 'fastapi',
-        'sqlalchemy.engine', 'sqlalchemy', 'alembic',
-        'tenacity', 'openai', 'httpx', 'httpcore'  # Suppress retry-related logs
-    ]
-    
-    for logger_name in third_party_loggers:
+    # Configure third-party loggers in a single pass: consistent formatting
+    # for all of them, plus a WARNING floor for the noisy retry/HTTP loggers
+    for logger_name in _THIRD_PARTY_LOGGERS:
         third_party_logger = logging.getLogger(logger_name)
         # In debug mode, let them propagate to get colored output
         if debug:
             third_party_logger.propagate = True
         else:
-            third_party_logger.handlers = [console_handler]
+            third_party_logger.handlers = [queue_handler]
             third_party_logger.propagate = False
+        # Suppress retry-related logs to avoid unformatted output
+        if logger_name in _QUIET_THIRD_PARTY_LOGGERS:
+            third_party_logger.setLevel(logging.WARNING)
     
     # Set SQLAlchemy engine logging to INFO level to reduce noise but keep colors
     if debug:
@@ -274,32 +844,39 @@ def configure_logging(
     else:
         logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
     
-    # Suppress retry-related logs to avoid unformatted output
-    for retry_logger in ['tenacity', 'openai', 'httpx', 'httpcore']:
-        logging.getLogger(retry_logger).setLevel(logging.WARNING)
-    
     # Configure structlog with dual output support
-    processors = [
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        TransactionGuidProcessor(),  # Add transaction GUID to all log entries
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.CallsiteParameterAdder(
-            parameters=[
-                structlog.processors.CallsiteParameter.FILENAME,
-                structlog.processors.CallsiteParameter.LINENO,
-            ]
-        ),
-    ]
+    if debug:
+        # Route through stdlib logging so the colored console handler applies
+        processors = [structlog.stdlib.filter_by_level]
+    else:
+        # Level filtering happens in the bound logger class instead
+        processors = []
+    
+    # Sample low-severity events before any further work is spent on them
+    active_rates = {method: rate for method, rate in (sample_rates or {}).items() if rate < 1.0}
+    if active_rates:
+        processors.append(SamplingProcessor(active_rates))
     
-    # Add dual output processor if we have file logging (must be before renderer)
+    processors += _COMMON_PROCESSORS
+    
+    # Callsite lookup walks the stack on every event, so only pay for it in
+    # debug mode; in production the logger name and transaction GUID are
+    # enough to trace an entry back to its request
+    if debug:
+        processors.append(_CALLSITE_PROCESSOR)
+    
+    # Stop the writer thread of any previous configuration
+    if _dual_output_processor is not None:
+        _dual_output_processor.close()
+        _dual_output_processor = None
+    
+    # Production JSON file output reuses the console's rendered line, so its
+    # processor goes after the renderer; otherwise it must come before it
+    tee_rendered_line = json_file_format and not debug
     if file_handler:
-        processors.append(DualOutputProcessor(file_handler, debug))
+        _dual_output_processor = DualOutputProcessor(file_handler, debug, rendered=tee_rendered_line)
+        if not tee_rendered_line:
+            processors.append(_dual_output_processor)
     
     # Choose renderer based on output type (for console)
     if debug:
@@ -312,15 +889,46 @@ def configure_logging(
             repr_native_str=False,
             exception_formatter=structlog.dev.plain_traceback
         ))
+        # structlog keeps settings left unset, so replace any filtering
+        # wrapper left behind by an earlier production configuration
+        structlog.configure(
+            processors=processors,
+            context_class=dict,
+            wrapper_class=structlog.stdlib.BoundLogger,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
     else:
-        processors.append(structlog.processors.JSONRenderer())
+        # Production: serialize with orjson straight to bytes and queue them
+        # for stderr (where the console handler writes) without going
+        # through stdlib logging
+        processors.append(_JSON_RENDERER)
+        if _dual_output_processor is not None and tee_rendered_line:
+            processors.append(_dual_output_processor)
+        structlog.configure(
+            processors=processors,
+            context_class=dict,
+            wrapper_class=structlog.make_filtering_bound_logger(level),
+            logger_factory=NamedBytesLoggerFactory(file=_queued_stream),
+            cache_logger_on_first_use=True,
+        )
+
+def is_debug_enabled() -> bool:
+    """Check whether DEBUG events are emitted under the current configuration.
     
-    structlog.configure(
-        processors=processors,
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
+    Filtered-out log calls are cheap, but their keyword arguments are still
+    evaluated. Guard debug calls with expensive arguments on hot paths with
+    this check so production (INFO and above) skips building them.
+    
+    Returns:
+        True if the configured level is DEBUG (or logging is unconfigured).
+        
+    Examples:
+        >>> if is_debug_enabled():
+        ...     logger.debug("Cost calculated", total_cost=float(total_cost))
+    """
+    return _debug_enabled
+
 
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a configured logger instance with automatic transaction GUID injection.
@@ -332,6 +940,15 @@ def get_logger(name: str) -> structlog.BoundLogger:
     This enhancement maintains backward compatibility - existing code
     continues to work without changes, but now gets automatic GUID tracking.
     
+    Once ``configure_logging`` has run, the returned logger is already
+    resolved (not a lazy proxy), so log calls skip the proxy indirection.
+    Loggers requested earlier, e.g. at import time of configuration modules,
+    stay lazy and resolve against the final configuration on first use.
+    
+    Call this once per module at import time (``logger = get_logger(__name__)``).
+    Request handlers should not call it per request; bind request context on
+    the module logger instead, e.g. ``log = logger.bind(request_id=request_id)``.
+    
     Args:
         name: The name for the logger, typically __name__ of the
             calling module.
@@ -348,8 +965,47 @@ def get_logger(name: str) -> structlog.BoundLogger:
         >>> logger.error("Database error", error="Connection failed", retries=3)
         # All log entries automatically include the current transaction GUID
     """
+    if structlog.is_configured():
+        return structlog.get_logger(name).bind()
     return structlog.get_logger(name)
 
+# Key skeletons for the log context helpers below. Copying a prebuilt dict
+# keeps the key order stable and avoids rebuilding the literal on every call.
+_API_REQUEST_TEMPLATE = {"event": "api_request", "method": None, "path": None}
+_API_RESPONSE_TEMPLATE = {"event": "api_response", "status_code": None, "duration_ms": None}
+_SERVICE_CALL_TEMPLATE = {"event": "service_call", "service": None, "method": None}
+_RATE_LIMIT_CHECK_TEMPLATE = {
+    "event": "rate_limit_check",
+    "limit_type": None,
+    "identifier": None,
+    "limit": None,
+    "current_count": None,
+    "remaining": None,
+    "utilization_percent": None,
+}
+_RATE_LIMIT_VIOLATION_TEMPLATE = {
+    "event": "rate_limit_violation",
+    "limit_type": None,
+    "identifier": None,
+    "limit": None,
+    "current_count": None,
+    "retry_after_seconds": None,
+    "exceeded_by": None,
+    "utilization_percent": None,
+}
+_RATE_LIMIT_RESET_TEMPLATE = {
+    "event": "rate_limit_reset",
+    "limit_type": None,
+    "identifier": None,
+    "previous_count": None,
+}
+
+
+def _utilization_percent(current_count: int, limit: int) -> float:
+    """Return ``current_count`` as a percentage of ``limit``, to one decimal."""
+    return round(current_count * 100.0 / limit, 1) if limit > 0 else 0
+
+
 def log_api_request(method: str, path: str, **kwargs) -> Dict[str, Any]:
     """Create a log context for API requests.
     
@@ -368,12 +1024,12 @@ def log_api_request(method: str, path: str, **kwargs) -> Dict[str, Any]:
         >>> context = log_api_request("POST", "/api/stories", user_id=123)
         >>> logger.info("Request received", **context)
     """
-    return {
-        "event": "api_request",
-        "method": method,
-        "path": path,
-        **kwargs
-    }
+    context = _API_REQUEST_TEMPLATE.copy()
+    context["method"] = method
+    context["path"] = path
+    if kwargs:
+        context.update(kwargs)
+    return context
 
 def log_api_response(status_code: int, duration_ms: float, **kwargs) -> Dict[str, Any]:
     """Create a log context for API responses.
@@ -393,12 +1049,12 @@ def log_api_response(status_code: int, duration_ms: float, **kwargs) -> Dict[str
         >>> context = log_api_response(200, 45.3, bytes_sent=1024)
         >>> logger.info("Request completed", **context)
     """
-    return {
-        "event": "api_response",
-        "status_code": status_code,
-        "duration_ms": duration_ms,
-        **kwargs
-    }
+    context = _API_RESPONSE_TEMPLATE.copy()
+    context["status_code"] = status_code
+    context["duration_ms"] = duration_ms
+    if kwargs:
+        context.update(kwargs)
+    return context
 
 def log_service_call(service: str, method: str, **kwargs) -> Dict[str, Any]:
     """Create a log context for service calls.
@@ -419,12 +1075,12 @@ def log_service_call(service: str, method: str, **kwargs) -> Dict[str, Any]:
         ...                           model="gpt-3.5-turbo", tokens=500)
         >>> logger.info("Calling LLM service", **context)
     """
-    return {
-        "event": "service_call",
-        "service": service,
-        "method": method,
-        **kwargs
-    }
+    context = _SERVICE_CALL_TEMPLATE.copy()
+    context["service"] = service
+    context["method"] = method
+    if kwargs:
+        context.update(kwargs)
+    return context
 
 def log_rate_limit_check(limit_type: str, identifier: str, limit: int, 
                         current_count: int, remaining: int, **kwargs) -> Dict[str, Any]:
@@ -452,16 +1108,16 @@ def log_rate_limit_check(limit_type: str, identifier: str, limit: int,
         ...                               client_ip="192.168.1.1", path="/api/langchain")
         >>> logger.warning("Rate limit exceeded", **context)
     """
-    return {
-        "event": "rate_limit_check",
-        "limit_type": limit_type,
-        "identifier": identifier,
-        "limit": limit,
-        "current_count": current_count,
-        "remaining": remaining,
-        "utilization_percent": round((current_count / limit) * 100, 1) if limit > 0 else 0,
-        **kwargs
-    }
+    context = _RATE_LIMIT_CHECK_TEMPLATE.copy()
+    context["limit_type"] = limit_type
+    context["identifier"] = identifier
+    context["limit"] = limit
+    context["current_count"] = current_count
+    context["remaining"] = remaining
+    context["utilization_percent"] = _utilization_percent(current_count, limit)
+    if kwargs:
+        context.update(kwargs)
+    return context
 
 def log_rate_limit_violation(limit_type: str, identifier: str, limit: int,
                            current_count: int, retry_after_seconds: int, 
@@ -487,17 +1143,17 @@ def log_rate_limit_violation(limit_type: str, identifier: str, limit: int,
         ...                                   client_ip="192.168.1.1", path="/api/stories")
         >>> logger.warning("Rate limit exceeded - request blocked", **context)
     """
-    return {
-        "event": "rate_limit_violation",
-        "limit_type": limit_type,
-        "identifier": identifier,
-        "limit": limit,
-        "current_count": current_count,
-        "retry_after_seconds": retry_after_seconds,
-        "exceeded_by": current_count - limit,
-        "utilization_percent": round((current_count / limit) * 100, 1) if limit > 0 else 0,
-        **kwargs
-    }
+    context = _RATE_LIMIT_VIOLATION_TEMPLATE.copy()
+    context["limit_type"] = limit_type
+    context["identifier"] = identifier
+    context["limit"] = limit
+    context["current_count"] = current_count
+    context["retry_after_seconds"] = retry_after_seconds
+    context["exceeded_by"] = current_count - limit
+    context["utilization_percent"] = _utilization_percent(current_count, limit)
+    if kwargs:
+        context.update(kwargs)
+    return context
 
 def log_rate_limit_reset(limit_type: str, identifier: str, 
                         previous_count: int, **kwargs) -> Dict[str, Any]:
@@ -519,10 +1175,10 @@ def log_rate_limit_reset(limit_type: str, identifier: str,
         >>> context = log_rate_limit_reset("per_ip", "192.168.1.1", 45)
         >>> logger.debug("Rate limit window reset", **context)
     """
-    return {
-        "event": "rate_limit_reset",
-        "limit_type": limit_type,
-        "identifier": identifier,
-        "previous_count": previous_count,
-        **kwargs
-    }
\ No newline at end of file
+    context = _RATE_LIMIT_RESET_TEMPLATE.copy()
+    context["limit_type"] = limit_type
+    context["identifier"] = identifier
+    context["previous_count"] = previous_count
+    if kwargs:
+        context.update(kwargs)
+    return context
\ No newline at end of file
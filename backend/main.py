@@ -2,14 +2,17 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, HTMLResponse, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from contextlib import asynccontextmanager
 import time
-from typing import Dict, Any
+import hashlib
+import orjson
+from typing import Dict, Any, Tuple
 import sys
 import os
 import platform
 from datetime import datetime
+from types import MappingProxyType
 
 # Ensure backend directory is in path for all imports
 backend_dir = os.path.dirname(os.path.abspath(__file__))
@@ -35,7 +38,12 @@ configure_logging(
     log_file_path=settings.log_file_path,
     log_level=settings.log_level,
     rotation_hours=settings.log_rotation_hours,
-    retention_days=settings.log_retention_days
+    retention_days=settings.log_retention_days,
+    sample_rates={
+        "debug": settings.log_sample_debug,
+        "info": settings.log_sample_info,
+    },
+    file_format=settings.log_file_format
 )
 logger = get_logger(__name__)
 
@@ -62,7 +70,7 @@ except Exception as e:
         from fastapi import APIRouter
         context_router = APIRouter(prefix="/api/context", tags=["context"])
         logger.warning("Using dummy context router")
-from middleware import LoggingMiddleware, ErrorHandlingMiddleware
+from middleware import ObservabilityMiddleware
 from database import init_db
 
 # Import rate limiting middleware (from parent directory - already added to path above)
@@ -70,6 +78,15 @@ from database import init_db
 from simple_rate_limiting import SimpleRateLimitingMiddleware as RateLimitingMiddleware
 
 
+def _compute_provider_info(settings) -> Dict[str, Any]:
+    """Build the /api/provider response from the (static) provider settings"""
+    return {
+        "provider": settings.provider_name or "Not configured",
+        "model": settings.provider_model or "Not configured",
+        "configured": bool(settings.provider_api_key and settings.provider_api_base_url)
+    }
+
+
 @asynccontextmanager
 async def base_lifespan(app: FastAPI):
     """Handle application startup and shutdown"""
@@ -90,8 +107,8 @@ async def base_lifespan(app: FastAPI):
     logger.debug("Application configuration",
                 startup_id=startup_id,
                 cors_enabled=True,
-                api_docs_url="/api/docs",
-                api_redoc_url="/api/redoc",
+                api_docs_url=app.docs_url,
+                api_redoc_url=app.redoc_url,
                 api_timeout=settings.api_timeout,
                 openai_timeout=settings.openai_timeout)
     
@@ -130,8 +147,10 @@ app = FastAPI(
     title=f"{settings.app_name} - Backend API",
     version=settings.app_version,
     lifespan=base_lifespan,
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
+    # API docs only in debug mode; without openapi_url the schema is never built
+    openapi_url="/openapi.json" if settings.debug_mode else None,
+    docs_url="/api/docs" if settings.debug_mode else None,
+    redoc_url="/api/redoc" if settings.debug_mode else None,
 )
 
 logger.info("FastAPI app created",
@@ -159,22 +178,24 @@ logger.info("CORS middleware configured",
             max_age=cors_config["max_age"])
 
 # Add middleware (order matters - last added is executed first)
-app.add_middleware(ErrorHandlingMiddleware)
-app.add_middleware(LoggingMiddleware)
+app.add_middleware(ObservabilityMiddleware)
 app.add_middleware(RateLimitingMiddleware)
 
 logger.info("Custom middleware added",
-            middlewares=["ErrorHandlingMiddleware", "LoggingMiddleware", "RateLimitingMiddleware"])
+            middlewares=["ObservabilityMiddleware", "RateLimitingMiddleware"])
 
-# Add trusted host middleware for security
+# Add trusted host middleware for security. With every host allowed it
+# would only add a pass-through layer to each request, so skip it then
 allowed_hosts = ["localhost", "127.0.0.1", "*.localhost", "backend"] if settings.debug_mode else ["*"]
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=allowed_hosts
-)
+if "*" not in allowed_hosts:
+    app.add_middleware(
+        TrustedHostMiddleware,
+        allowed_hosts=allowed_hosts
+    )
 
 logger.info("TrustedHost middleware configured",
             allowed_hosts=allowed_hosts,
+            enabled="*" not in allowed_hosts,
             debug_mode=settings.debug_mode)
 
 # Custom exception handler for validation errors
@@ -184,6 +205,17 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     errors = exc.errors()
     error_id = f"val_err_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(str(errors)) % 10000}"
     
+    # Format errors once; the same list is logged and returned
+    formatted_errors = [
+        {
+            "field": " -> ".join(map(str, error.get("loc", ()))),
+            "message": error.get("msg", "Unknown error"),
+            "type": error.get("type", "unknown"),
+            "input": error.get("input")
+        }
+        for error in errors
+    ]
+    
     # Log validation error details
     logger.error("Validation error",
                 error_id=error_id,
@@ -191,19 +223,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
                 path=request.url.path,
                 method=request.method,
                 client_host=request.client.host if request.client else None,
-                error_count=len(errors),
-                errors=errors,
-                body=exc.body if hasattr(exc, 'body') else None)
-    
-    # Format error response
-    formatted_errors = []
-    for error in errors:
-        formatted_errors.append({
-            "field": " -> ".join(str(loc) for loc in error.get("loc", [])),
-            "message": error.get("msg", "Unknown error"),
-            "type": error.get("type", "unknown"),
-            "input": error.get("input", None)
-        })
+                error_count=len(formatted_errors),
+                errors=formatted_errors,
+                body=getattr(exc, 'body', None))
     
     response_content = {
         "error": {
@@ -219,7 +241,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
                 status_code=422,
                 error_fields=[err["field"] for err in formatted_errors])
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content=response_content
     )
@@ -235,7 +257,7 @@ routers = [
 
 for router_name, router in routers:
     app.include_router(router)
-    logger.debug(f"Router included: {router_name}",
+    logger.debug("Router included",
                 router_name=router_name,
                 prefix=getattr(router, "prefix", "none"),
                 tags=getattr(router, "tags", []))
@@ -268,17 +290,28 @@ async def mcp_status(request: Request):
     
     return status_info
 
-@app.get("/", response_class=HTMLResponse)
-async def root(request: Request):
-    """Root endpoint - API only backend with helpful links"""
-    request_id = getattr(request.state, 'request_id', None)
-    
-    logger.debug("Root endpoint accessed",
-                request_id=request_id,
-                client_host=request.client.host if request.client else None,
-                user_agent=request.headers.get("user-agent", "unknown"))
-    
-    html_content = f"""
+def _static_page(content: str) -> Tuple[bytes, str]:
+    """Encode a static page once and derive its ETag"""
+    body = content.encode("utf-8")
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+def _static_page_response(request: Request, page: Tuple[bytes, str], media_type: str) -> Response:
+    """Serve a cached static page, or 304 if the client already has it"""
+    body, etag = page
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type=media_type, headers={"ETag": etag})
+
+# Static pages only depend on settings, so they are rendered and encoded once.
+# The docs links are only shown when the docs are served (debug mode).
+_DOCS_CARD = f"""<div class="card">
+            <h3>📖 API Documentation</h3>
+            <p>Explore the API endpoints and test them directly:</p>
+            <a href="{app.docs_url}" class="btn">Interactive API Docs (Swagger)</a>
+            <a href="{app.redoc_url}" class="btn">API Documentation (ReDoc)</a>
+        </div>
+        """ if app.docs_url else ""
+_ROOT_HTML = f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -300,13 +333,7 @@ async def root(request: Request):
             <p>Version: {settings.app_version}</p>
         </div>
         
-        <div class="card">
-            <h3>📖 API Documentation</h3>
-            <p>Explore the API endpoints and test them directly:</p>
-            <a href="/api/docs" class="btn">Interactive API Docs (Swagger)</a>
-            <a href="/api/redoc" class="btn">API Documentation (ReDoc)</a>
-        </div>
-        
+        {_DOCS_CARD}
         <div class="card">
             <h3>🌐 Frontend Applications</h3>
             <p>Choose your preferred frontend interface:</p>
@@ -336,38 +363,66 @@ async def root(request: Request):
     </body>
     </html>
     """
-    return html_content
+_ROOT_PAGE = _static_page(_ROOT_HTML)
 
-@app.get("/favicon.ico")
-async def favicon():
-    """Simple favicon response to avoid 404"""
-    # Return a minimal SVG favicon
-    svg_content = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="#007bff">
+# Minimal SVG favicon
+_FAVICON_SVG = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="#007bff">
         <path d="M12 2l3.09 6.26L22 9.27l-5 4.87 1.18 6.88L12 17.77l-6.18 3.25L7 14.14 2 9.27l6.91-1.01L12 2z"/>
     </svg>"""
-    return Response(content=svg_content, media_type="image/svg+xml")
+_FAVICON_PAGE = _static_page(_FAVICON_SVG)
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Root endpoint - API only backend with helpful links"""
+    request_id = getattr(request.state, 'request_id', None)
+    
+    logger.debug("Root endpoint accessed",
+                request_id=request_id,
+                client_host=request.client.host if request.client else None,
+                user_agent=request.headers.get("user-agent", "unknown"))
+    
+    return _static_page_response(request, _ROOT_PAGE, "text/html; charset=utf-8")
+
+@app.get("/favicon.ico")
+async def favicon(request: Request):
+    """Simple favicon response to avoid 404"""
+    return _static_page_response(request, _FAVICON_PAGE, "image/svg+xml")
+
+# Static part of the /health payload, serialized once; probes only pay for
+# the timestamp, uptime and request ID
+_HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "version": settings.app_version,
+    "environment": "development" if settings.debug_mode else "production",
+})[:-1] + b',"timestamp":'
 
 @app.get("/health")
-async def health_check(request: Request) -> Dict[str, Any]:
+async def health_check(request: Request) -> Response:
     """Health check endpoint"""
-    health_data = {
-        "status": "healthy",
-        "timestamp": time.time(),
-        "version": settings.app_version,
-        "request_id": getattr(request.state, 'request_id', None),
-        "environment": "development" if settings.debug_mode else "production",
-        "uptime_seconds": int(time.time() - app.state.startup_time) if hasattr(app.state, 'startup_time') else 0
-    }
+    now = time.time()
+    request_id = getattr(request.state, 'request_id', None)
+    startup_time = getattr(app.state, 'startup_time', None)
+    uptime_seconds = int(now - startup_time) if startup_time is not None else 0
     
     logger.debug("Health check requested",
-                request_id=health_data["request_id"],
+                request_id=request_id,
                 client_host=request.client.host if request.client else None,
-                status=health_data["status"])
+                status="healthy")
     
-    return health_data
+    content = b"".join((
+        _HEALTH_PREFIX, repr(now).encode(),
+        b',"uptime_seconds":', str(uptime_seconds).encode(),
+        b',"request_id":', orjson.dumps(request_id), b'}'
+    ))
+    return Response(content=content, media_type="application/json")
+
+# Provider settings don't change after startup, so the /api/provider
+# response is built and serialized once
+_PROVIDER_INFO = MappingProxyType(_compute_provider_info(settings))
+_PROVIDER_INFO_JSON = orjson.dumps(dict(_PROVIDER_INFO))
 
 @app.get("/api/provider")
-async def get_provider_info(request: Request) -> Dict[str, Any]:
+async def get_provider_info(request: Request) -> Response:
     """Get current LLM provider information"""
     request_id = getattr(request.state, 'request_id', None)
     
@@ -375,23 +430,13 @@ async def get_provider_info(request: Request) -> Dict[str, Any]:
                 request_id=request_id,
                 client_host=request.client.host if request.client else None)
     
-    provider_name = settings.provider_name or "Not configured"
-    provider_model = settings.provider_model or "Not configured"
-    is_configured = bool(settings.provider_api_key and settings.provider_api_base_url)
-    
-    provider_info = {
-        "provider": provider_name,
-        "model": provider_model,
-        "configured": is_configured
-    }
-    
     logger.debug("Provider info returned",
                 request_id=request_id,
-                provider=provider_name,
-                model=provider_model,
-                configured=is_configured)
+                provider=_PROVIDER_INFO["provider"],
+                model=_PROVIDER_INFO["model"],
+                configured=_PROVIDER_INFO["configured"])
     
-    return provider_info
+    return Response(content=_PROVIDER_INFO_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
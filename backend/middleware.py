@@ -1,19 +1,29 @@
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
-import uuid
-from typing import Callable
-import json
+import orjson
+import structlog
+from typing import Optional
 
-from logging_config import get_logger
+from config import settings
+from logging_config import get_logger, is_debug_enabled
 from exceptions import Error
-from transaction_context import transaction_context, get_current_transaction_guid
+from transaction_context import transaction_context, request_id_context, get_current_transaction_guid, generate_transaction_guid
 
 logger = get_logger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests and responses.
+# Error payload for unexpected exceptions; no exception details are exposed
+_INTERNAL_ERROR_BODY = orjson.dumps({
+    "error": {
+        "type": "InternalServerError",
+        "message": "An unexpected error occurred",
+        "code": "INTERNAL_ERROR"
+    }
+})
+
+
+class ObservabilityMiddleware:
+    """Middleware for logging requests and responses and handling exceptions.
     
     This middleware intercepts all HTTP requests and responses to provide
     comprehensive logging including:
@@ -25,195 +35,206 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     Each request is assigned a unique ID that is included in all related
     log entries and returned in the X-Request-ID response header.
     
+    Exceptions raised by the application are converted to JSON error
+    responses:
+    - Custom Error exceptions become 400 responses with their error code
+    - Unexpected exceptions become generic 500 responses
+    
+    It is a pure ASGI middleware, and a single layer rather than separate
+    logging and error handling middlewares: the request body is teed into a
+    bounded buffer as the application reads it, and response messages are
+    passed straight through, so neither body is held back or replayed.
+    
     Examples:
         >>> app = FastAPI()
-        >>> app.add_middleware(LoggingMiddleware)
+        >>> app.add_middleware(ObservabilityMiddleware)
+        
+        Custom error response:
+        >>> {
+        ...   "error": {
+        ...     "type": "ValidationError",
+        ...     "message": "Invalid input",
+        ...     "code": "VALIDATION_ERROR"
+        ...   }
+        ... }
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp, max_body_log_bytes: int = 65536,
+                 max_error_body_log_bytes: int = 4096,
+                 capture_request_body: Optional[bool] = None):
+        """Initialize the middleware.
+        
+        Args:
+            app: The ASGI application to wrap.
+            max_body_log_bytes: Maximum number of request body bytes kept
+                for logging. Defaults to 64 KiB.
+            max_error_body_log_bytes: Maximum number of 4xx/5xx response
+                body bytes kept for logging. Defaults to 4 KiB.
+            capture_request_body: Whether POST bodies are copied into the
+                request log. Defaults to ``settings.debug_mode``, so
+                production does not pay for copying large prompts.
+        """
+        self.app = app
+        self.max_body_log_bytes = max_body_log_bytes
+        self.capture_request_body = settings.debug_mode if capture_request_body is None else capture_request_body
+        self.max_error_body_log_bytes = max_error_body_log_bytes
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process and log HTTP requests and responses.
         
+        Adds X-Request-ID and X-Transaction-GUID headers to the response.
+        
         Args:
-            request: The incoming HTTP request.
-            call_next: The next middleware or endpoint handler.
-            
-        Returns:
-            The HTTP response with added X-Request-ID and X-Transaction-GUID headers.
+            scope: The ASGI connection scope.
+            receive: The ASGI receive callable.
+            send: The ASGI send callable.
             
         Raises:
-            Any exceptions from the application are passed through.
+            Exceptions raised after the response has started are passed
+            through, since no error response can be sent at that point.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Generate request ID and transaction GUID
-        request_id = str(uuid.uuid4())
-        transaction_guid = str(uuid.uuid4())
+        request_id = generate_transaction_guid()
+        transaction_guid = generate_transaction_guid()
+        
+        # request.state is backed by scope["state"]
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["transaction_guid"] = transaction_guid
         
-        request.state.request_id = request_id
-        request.state.transaction_guid = transaction_guid
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
         
-        # Set transaction context for the entire HTTP request lifecycle
-        with transaction_context(transaction_guid):
-            # Get request body for POST requests
-            request_body = None
-            if request.method == "POST":
-                try:
-                    body = await request.body()
-                    request_body = body.decode() if body else None
-                    # Need to recreate the request with the body since we consumed it
-                    from starlette.datastructures import Headers
-                    from starlette.requests import Request as StarletteRequest
-                    
-                    async def receive():
-                        return {"type": "http.request", "body": body}
-                    
-                    request = StarletteRequest(request.scope, receive)
-                    request.state.request_id = request_id
-                    request.state.transaction_guid = transaction_guid
-                except Exception as e:
-                    logger.error("Failed to read request body", error=str(e))
+        # Tee POST bodies into a bounded buffer as the app reads them
+        request_body = None
+        if self.capture_request_body and method == "POST":
+            request_body = bytearray()
+            max_body_log_bytes = self.max_body_log_bytes
+            downstream_receive = receive
             
-            # Log request
-            start_time = time.time()
-            logger.info("Request started",
-                       request_id=request_id,
-                       method=request.method,
-                       path=request.url.path,
-                       client_host=request.client.host if request.client else None,
-                       request_body=request_body)
+            async def receive() -> Message:
+                message = await downstream_receive()
+                if message["type"] == "http.request":
+                    room = max_body_log_bytes - len(request_body)
+                    if room > 0:
+                        request_body.extend(message.get("body", b"")[:room])
+                return message
+        
+        status_code = None
+        error_body = bytearray()
+        error_body_truncated = False
+        max_error_body_log_bytes = self.max_error_body_log_bytes
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, error_body_truncated
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID and transaction GUID to response headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Transaction-GUID"] = transaction_guid
+            elif message["type"] == "http.response.body" and status_code >= 400:
+                # Keep the start of the error body for the log; the message
+                # itself is sent unchanged
+                chunk = message.get("body", b"")
+                room = max_error_body_log_bytes - len(error_body)
+                if len(chunk) > room:
+                    error_body_truncated = True
+                if room > 0 and chunk:
+                    error_body.extend(memoryview(chunk)[:room])
+            await send(message)
+        
+        # Set transaction and request ID context for the entire HTTP request
+        # lifecycle, and bind the request fields once for every log entry made
+        # while handling it
+        with transaction_context(transaction_guid), request_id_context(request_id), \
+                structlog.contextvars.bound_contextvars(request_id=request_id, method=method, path=path):
+            # Log request start in debug only; the completion entry carries
+            # the same fields plus status and duration
+            start_ns = time.perf_counter_ns()
+            if is_debug_enabled():
+                logger.debug("Request started",
+                            client_host=client[0] if client else None)
             
             # Process request
-            response = await call_next(request)
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception as e:
+                if status_code is not None:
+                    raise
+                await self._send_error_response(e, send_wrapper)
             
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+            # Calculate duration (monotonic clock, int math down to 10 µs)
+            duration_ms = ((time.perf_counter_ns() - start_ns) // 10_000) / 100
             
             # Log response with error details for 4xx/5xx status codes
             log_data = {
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_ms": round(duration_ms, 2)
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+                "request_body": request_body.decode(errors="replace") if request_body else None
             }
             
-            # For error responses, try to get the response body
-            if response.status_code >= 400:
-                try:
-                    # Store the body to log it
-                    body_bytes = b""
-                    async for chunk in response.body_iterator:
-                        body_bytes += chunk
-                    
-                    # Try to parse as JSON
+            if status_code is not None and status_code >= 400:
+                if error_body_truncated:
+                    log_data["error_response"] = error_body.decode(errors="replace")
+                    log_data["error_body_truncated"] = True
+                else:
+                    # Try to parse as JSON (orjson reads the bytes directly)
                     try:
-                        error_body = json.loads(body_bytes.decode())
-                        log_data["error_response"] = error_body
-                    except:
-                        log_data["error_response"] = body_bytes.decode()
-                    
-                    # Create a new response with the same body
-                    response = Response(
-                        content=body_bytes,
-                        status_code=response.status_code,
-                        headers=dict(response.headers),
-                        media_type=response.media_type
-                    )
-                    
-                    logger.error("Request failed", **log_data)
-                except Exception as e:
-                    logger.error("Failed to log error response", error=str(e), **log_data)
+                        log_data["error_response"] = orjson.loads(error_body)
+                    except orjson.JSONDecodeError:
+                        log_data["error_response"] = error_body.decode(errors="replace")
+                
+                logger.error("Request failed", **log_data)
             else:
                 logger.info("Request completed", **log_data)
-            
-            # Add request ID and transaction GUID to response headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Transaction-GUID"] = transaction_guid
-            
-            return response
-
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Middleware for handling exceptions.
-    
-    This middleware catches all exceptions thrown by the application and
-    converts them to appropriate JSON error responses. It handles:
-    - Custom Error exceptions with specific error codes
-    - Unexpected exceptions with generic error responses
     
-    All errors are logged with appropriate severity levels.
-    
-    Examples:
-        >>> app = FastAPI()
-        >>> app.add_middleware(ErrorHandlingMiddleware)
-    """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Handle exceptions and convert them to JSON responses.
+    @staticmethod
+    async def _send_error_response(error: Exception, send: Send) -> None:
+        """Log an application exception and send the matching JSON error response.
+        
+        Must be called from the ``except`` block handling ``error`` so the
+        traceback is available to the log entry.
         
         Args:
-            request: The incoming HTTP request.
-            call_next: The next middleware or endpoint handler.
-            
-        Returns:
-            Either the normal response or a JSON error response if an
-            exception occurred.
-            
-        Examples:
-            Normal response:
-            >>> {"result": "success"}
-            
-            Custom error response:
-            >>> {
-            ...   "error": {
-            ...     "type": "ValidationError",
-            ...     "message": "Invalid input",
-            ...     "code": "VALIDATION_ERROR"
-            ...   }
-            ... }
-            
-            Unexpected error response:
-            >>> {
-            ...   "error": {
-            ...     "type": "InternalServerError",
-            ...     "message": "An unexpected error occurred",
-            ...     "code": "INTERNAL_ERROR"
-            ...   }
-            ... }
+            error: The exception raised by the application.
+            send: The ASGI send callable.
         """
-        try:
-            response = await call_next(request)
-            return response
-        except Error as e:
+        if isinstance(error, Error):
             # Handle custom exceptions
+            error_code = getattr(error, 'error_code', None)
             logger.warning("Application error",
-                          error_type=type(e).__name__,
-                          error_message=str(e),
-                          error_code=getattr(e, 'error_code', None),
-                          request_id=getattr(request.state, 'request_id', None))
-            
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "error": {
-                        "type": type(e).__name__,
-                        "message": str(e),
-                        "code": getattr(e, 'error_code', None)
-                    }
+                          error_type=type(error).__name__,
+                          error_message=str(error),
+                          error_code=error_code)
+            status = 400
+            body = orjson.dumps({
+                "error": {
+                    "type": type(error).__name__,
+                    "message": str(error),
+                    "code": error_code
                 }
-            )
-        except Exception as e:
+            })
+        else:
             # Handle unexpected exceptions
             logger.error("Unexpected error",
-                        error_type=type(e).__name__,
-                        error_message=str(e),
-                        request_id=getattr(request.state, 'request_id', None),
+                        error_type=type(error).__name__,
+                        error_message=str(error),
                         exc_info=True)
-            
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "error": {
-                        "type": "InternalServerError",
-                        "message": "An unexpected error occurred",
-                        "code": "INTERNAL_ERROR"
-                    }
-                }
-            )
\ No newline at end of file
+            status = 500
+            body = _INTERNAL_ERROR_BODY
+        
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
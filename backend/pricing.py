@@ -2,10 +2,14 @@
 # Contains pricing information for different AI models and providers
 # Used for calculating costs based on token usage
 
-from typing import Dict, Tuple, Optional
+import sys
+from typing import Dict, Mapping, Tuple, Optional
 from decimal import Decimal
+from types import MappingProxyType
 import structlog
 
+from logging_config import is_debug_enabled
+
 logger = structlog.get_logger(__name__)
 
 # =============================================================================
@@ -156,8 +160,38 @@ DEFAULT_PRICING = {
     "output_cost_per_1k": Decimal("0.00000")
 }
 
+# Pricing tables are read-only lookup data; freeze them so nothing can
+# mutate shared prices at runtime. Model keys are interned, as is
+# settings.provider_model, so lookups for the configured model compare
+# by identity.
+PROVIDER_PRICING: Mapping[str, Mapping[str, Decimal]] = MappingProxyType({
+    sys.intern(model): MappingProxyType(pricing) for model, pricing in PROVIDER_PRICING.items()
+})
+DEFAULT_PRICING: Mapping[str, Decimal] = MappingProxyType(DEFAULT_PRICING)
+
+# Prices per 1k tokens as integer nano-dollars, (input, output), for
+# calculate_cost. All prices above have at most 9 decimal places, so the
+# conversion is exact and costs reduce to a single int multiply.
+_NANO = Decimal(10 ** 9)
+_PROVIDER_PRICING_NANO: Dict[str, Tuple[int, int]] = {
+    model: (int(pricing["input_cost_per_1k"] * _NANO), int(pricing["output_cost_per_1k"] * _NANO))
+    for model, pricing in PROVIDER_PRICING.items()
+}
+_DEFAULT_PRICING_NANO = (0, 0)
+
+# Shared result for free models (local, :free variants, unknown models)
+_ZERO = Decimal("0")
+_ZERO_TRIPLE = (_ZERO, _ZERO, _ZERO)
+
+
+def _log_unknown_model(model: str) -> None:
+    """Warn that a model has no pricing entry and is treated as free."""
+    logger.warning("Unknown model - using default (free) pricing",
+                  model=model,
+                  available_models=len(PROVIDER_PRICING))
 
-def get_model_pricing(model: str) -> Dict[str, Decimal]:
+
+def get_model_pricing(model: str) -> Mapping[str, Decimal]:
     """Get pricing information for a specific model.
     
     Returns pricing data for the specified model, including costs per
@@ -168,7 +202,7 @@ def get_model_pricing(model: str) -> Dict[str, Decimal]:
         model (str): Model identifier (e.g., "meta-llama/llama-3-8b-instruct")
         
     Returns:
-        Dict[str, Decimal]: Pricing information containing:
+        Mapping[str, Decimal]: Read-only pricing information containing:
             - input_cost_per_1k: Cost per 1,000 input tokens
             - output_cost_per_1k: Cost per 1,000 output tokens
             
@@ -185,10 +219,8 @@ def get_model_pricing(model: str) -> Dict[str, Decimal]:
     pricing = PROVIDER_PRICING.get(model, DEFAULT_PRICING)
     
     if model not in PROVIDER_PRICING:
-        logger.warning("Unknown model - using default (free) pricing",
-                      model=model,
-                      available_models=len(PROVIDER_PRICING))
-    else:
+        _log_unknown_model(model)
+    elif is_debug_enabled():
         logger.debug("Retrieved pricing for model",
                     model=model,
                     input_cost=pricing["input_cost_per_1k"],
@@ -233,21 +265,33 @@ def calculate_cost(
         >>> print(f"Local model cost: ${total}")
         Local model cost: $0.000000
     """
-    # Get pricing for the model
-    pricing = get_model_pricing(model)
+    # Get pricing for the model (nano-dollars per 1k tokens)
+    prices = _PROVIDER_PRICING_NANO.get(model)
+    if prices is None:
+        _log_unknown_model(model)
+        prices = _DEFAULT_PRICING_NANO
+    input_price_nano, output_price_nano = prices
     
-    # Calculate costs (convert tokens to thousands for pricing)
-    input_cost = (Decimal(input_tokens) / 1000) * pricing["input_cost_per_1k"]
-    output_cost = (Decimal(output_tokens) / 1000) * pricing["output_cost_per_1k"]
-    total_cost = input_cost + output_cost
+    # Free models: no arithmetic and nothing worth logging
+    if not input_price_nano and not output_price_nano:
+        return _ZERO_TRIPLE
     
-    logger.debug("Cost calculated for API request",
-                model=model,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                input_cost=float(input_cost),
-                output_cost=float(output_cost),
-                total_cost=float(total_cost))
+    # tokens * nano-dollars per 1k tokens is an exact int in pico-dollars
+    # (1e-12 USD); convert to Decimal only for the return value
+    input_cost_pico = input_tokens * input_price_nano
+    output_cost_pico = output_tokens * output_price_nano
+    input_cost = Decimal(input_cost_pico).scaleb(-12)
+    output_cost = Decimal(output_cost_pico).scaleb(-12)
+    total_cost = Decimal(input_cost_pico + output_cost_pico).scaleb(-12)
+    
+    if is_debug_enabled():
+        logger.debug("Cost calculated for API request",
+                    model=model,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    input_cost=float(input_cost),
+                    output_cost=float(output_cost),
+                    total_cost=float(total_cost))
     
     return input_cost, output_cost, total_cost
 
@@ -8,6 +8,14 @@ for different AI services (Semantic Kernel, LangChain, LangGraph).
 from pathlib import Path
 from .prompt_utils import load_prompt_file
 
+_PROMPT_DIR = Path(__file__).parent
+
+# Chat system prompts don't change at runtime, so read them once at import
+# rather than on every chat turn
+_SEMANTIC_KERNEL_CHAT_PROMPT = load_prompt_file("semantic_kernel_chat_system_prompt.txt", _PROMPT_DIR / "semantic_kernel")
+_LANGCHAIN_CHAT_PROMPT = load_prompt_file("langchain_chat_system_prompt.txt", _PROMPT_DIR / "langchain")
+_LANGGRAPH_CHAT_PROMPT = load_prompt_file("langgraph_chat_system_prompt.txt", _PROMPT_DIR / "langgraph")
+
 
 def get_semantic_kernel_chat_prompt() -> str:
     """
@@ -16,17 +24,12 @@ def get_semantic_kernel_chat_prompt() -> str:
     Returns:
         String content of the Semantic Kernel chat system prompt.
         
-    Raises:
-        FileNotFoundError: If the prompt file doesn't exist.
-        IOError: If there's an error reading the file.
-        
     Examples:
         >>> prompt = get_semantic_kernel_chat_prompt()
         >>> "creative writing" in prompt.lower()
         True
     """
-    prompt_dir = Path(__file__).parent / "semantic_kernel"
-    return load_prompt_file("semantic_kernel_chat_system_prompt.txt", prompt_dir)
+    return _SEMANTIC_KERNEL_CHAT_PROMPT
 
 
 def get_langchain_chat_prompt() -> str:
@@ -36,17 +39,12 @@ def get_langchain_chat_prompt() -> str:
     Returns:
         String content of the LangChain chat system prompt.
         
-    Raises:
-        FileNotFoundError: If the prompt file doesn't exist.
-        IOError: If there's an error reading the file.
-        
     Examples:
         >>> prompt = get_langchain_chat_prompt()
         >>> "LangChain" in prompt
         True
     """
-    prompt_dir = Path(__file__).parent / "langchain"
-    return load_prompt_file("langchain_chat_system_prompt.txt", prompt_dir)
+    return _LANGCHAIN_CHAT_PROMPT
 
 
 def get_langgraph_chat_prompt() -> str:
@@ -56,17 +54,12 @@ def get_langgraph_chat_prompt() -> str:
     Returns:
         String content of the LangGraph chat system prompt.
         
-    Raises:
-        FileNotFoundError: If the prompt file doesn't exist.
-        IOError: If there's an error reading the file.
-        
     Examples:
         >>> prompt = get_langgraph_chat_prompt()
         >>> "LangGraph" in prompt
         True
     """
-    prompt_dir = Path(__file__).parent / "langgraph"
-    return load_prompt_file("langgraph_chat_system_prompt.txt", prompt_dir)
+    return _LANGGRAPH_CHAT_PROMPT
 
 
 def get_chat_prompt_by_service(service_name: str) -> str:
@@ -81,8 +74,6 @@ def get_chat_prompt_by_service(service_name: str) -> str:
         
     Raises:
         ValueError: If service_name is not recognized.
-        FileNotFoundError: If the prompt file doesn't exist.
-        IOError: If there's an error reading the file.
         
     Examples:
         >>> prompt = get_chat_prompt_by_service("langchain")
@@ -1,30 +1,58 @@
 from langchain.schema import SystemMessage, HumanMessage
 from pathlib import Path
+from string import Formatter
+from typing import Callable
+
+_PROMPT_DIR = Path(__file__).parent
 
 def _load_prompt_file(filename: str) -> str:
     """Load prompt content from a .txt file"""
-    prompt_dir = Path(__file__).parent
-    file_path = prompt_dir / filename
+    file_path = _PROMPT_DIR / filename
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read().strip()
     except FileNotFoundError:
         raise FileNotFoundError(f"Prompt file not found: {filename}")
 
+# Prompts don't change at runtime, so read them once at import
+_SYSTEM_PROMPT = _load_prompt_file("langchain/langchain_system_prompt.txt")
+_USER_TEMPLATE = _load_prompt_file("langchain/langchain_user_prompt_template.txt")
+
+def _compile_user_template(template: str) -> Callable[[str, str], str]:
+    """Specialize the user template into a formatter that only concatenates strings"""
+    literals, fields = [], []
+    for literal, field, format_spec, conversion in Formatter().parse(template):
+        literals.append(literal)
+        if field is not None:
+            fields.append((field, format_spec, conversion))
+    
+    # Fast path for the shipped shape: plain {primary_character} then {secondary_character}
+    if fields == [("primary_character", "", None), ("secondary_character", "", None)]:
+        head, middle = literals[0], literals[1]
+        tail = literals[2] if len(literals) > 2 else ""
+        return lambda primary_character, secondary_character: (
+            head + primary_character + middle + secondary_character + tail
+        )
+    
+    # Any other template shape goes through str.format
+    return lambda primary_character, secondary_character: template.format(
+        primary_character=primary_character,
+        secondary_character=secondary_character
+    )
+
+_format_user_prompt = _compile_user_template(_USER_TEMPLATE)
+
 def get_system_prompt() -> str:
     """Get the system prompt for LangChain"""
-    return _load_prompt_file("langchain/langchain_system_prompt.txt")
+    return _SYSTEM_PROMPT
 
 def get_user_prompt_template() -> str:
     """Get the user prompt template for LangChain"""
-    return _load_prompt_file("langchain/langchain_user_prompt_template.txt")
+    return _USER_TEMPLATE
 
 def get_langchain_messages(primary_character: str, secondary_character: str) -> list:
     """Get formatted LangChain messages"""
     return [
-        SystemMessage(content=get_system_prompt()),
-        HumanMessage(content=get_user_prompt_template().format(
-            primary_character=primary_character,
-            secondary_character=secondary_character
-        ))
-    ]
\ No newline at end of file
+        SystemMessage(content=_SYSTEM_PROMPT),
+        HumanMessage(content=_format_user_prompt(primary_character, secondary_character))
+    ]
@@ -30,7 +30,7 @@ def load_prompt_file(filename: str, prompt_dir: Optional[Path] = None) -> str:
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read().strip()
-            logger.debug(f"Loaded prompt file: {filename} ({len(content)} characters)")
+            logger.debug("Loaded prompt file: %s (%d characters)", filename, len(content))
             return content
     except FileNotFoundError:
         logger.error(f"Prompt file not found: {filename} in {prompt_dir}")
@@ -91,6 +91,6 @@ def validate_template_variables(template: str, required_vars: list) -> bool:
     """
     for var in required_vars:
         if f"{{{var}}}" not in template:
-            logger.warning(f"Template missing required variable: {var}")
+            logger.warning("Template missing required variable: %s", var)
             return False
     return True
\ No newline at end of file
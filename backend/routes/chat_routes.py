@@ -1,32 +1,37 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from typing import Dict, Optional, List
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
 import time
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import orjson
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Row, and_, bindparam, case, desc, func, select, update
 
-from schemas import ChatMessageRequest, ChatMessageResponse, ChatResponse, ChatConversationList, ChatConversationResponse
-from services.chat_services import SemanticKernelChatService, LangChainChatService, LangGraphChatService
-from logging_config import get_logger
+from schemas import ChatMessageRequest, ChatMessageResponse, ChatResponse, ChatConversationList, ChatConversationResponse, ChatConversationSummary
+from services.chat_services import ChatService, SemanticKernelChatService, LangChainChatService, LangGraphChatService
+from logging_config import get_logger, is_debug_enabled
 from config import settings
 from database import get_db, ChatConversation, ChatMessage, get_model_info
+from transaction_context import get_current_request_id
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
-# Service instances (lazy loaded)
-_chat_services: Dict[str, Optional[object]] = {
-    "semantic_kernel": None,
-    "langchain": None,
-    "langgraph": None
-}
+# Service instances, built once at import; construction is cheap since each
+# service creates its API client on first use
+_chat_services: Mapping[str, ChatService] = MappingProxyType({
+    "semantic_kernel": SemanticKernelChatService(),
+    "langchain": LangChainChatService(),
+    "langgraph": LangGraphChatService()
+})
 
-def get_chat_service(service_name: str):
-    """Lazy load chat service instances.
+def get_chat_service(service_name: str) -> ChatService:
+    """Get a chat service instance.
     
-    Creates and caches chat service instances on first use to avoid
-    initialization overhead during startup.
+    Services are created when this module is imported, so lookups never
+    construct anything and concurrent first requests share one instance.
     
     Args:
         service_name: The name of the service to retrieve.
@@ -43,16 +48,200 @@ def get_chat_service(service_name: str):
         >>> isinstance(service, LangChainChatService)
         True
     """
-    if _chat_services[service_name] is None:
-        logger.info(f"Initializing {service_name} chat service")
-        if service_name == "semantic_kernel":
-            _chat_services[service_name] = SemanticKernelChatService()
-        elif service_name == "langchain":
-            _chat_services[service_name] = LangChainChatService()
-        elif service_name == "langgraph":
-            _chat_services[service_name] = LangGraphChatService()
     return _chat_services[service_name]
 
+# The message columns a ChatMessageResponse reads, so message lists loaded
+# only for the response skip the tracing columns. Derived from the schema so
+# a new response field can never turn into a lazy load per message.
+_MESSAGE_RESPONSE_COLUMNS = tuple(getattr(ChatMessage, name) for name in ChatMessageResponse.model_fields)
+
+# The driver returns a new string for every role it reads; history entries
+# use these shared constants instead
+_ROLES: Mapping[str, str] = MappingProxyType({"user": "user", "assistant": "assistant"})
+
+# The hot read statements are built once, at import, with bound parameters
+# for their per-request values; each request only binds and executes them,
+# and the compiled form comes from SQLAlchemy's statement cache.
+
+_CONVERSATION_EXISTS = select(ChatConversation.id).where(
+    ChatConversation.id == bindparam("conversation_id")
+)
+
+# A chat turn stamps its conversation with the database clock. The UPDATE
+# returns the metadata for the response, so nothing is read back after the
+# commit, and returns no row if the conversation has been deleted.
+_TOUCH_CONVERSATION = update(ChatConversation).where(
+    ChatConversation.id == bindparam("conversation_id")
+).values(updated_at=func.now()).returning(
+    *(getattr(ChatConversation, name) for name in ChatConversationSummary.model_fields)
+).execution_options(synchronize_session=False)
+
+# Walking back from the newest message, keep whole messages while their
+# running content length stays within the budget, up to the message limit
+_newest_first = (desc(ChatMessage.created_at), desc(ChatMessage.id))
+_content_chars = func.length(ChatMessage.content)
+_recent_messages = select(
+    ChatMessage.role.label("role"),
+    ChatMessage.content.label("content"),
+    _content_chars.label("chars"),
+    func.sum(_content_chars).over(order_by=_newest_first).label("running_chars"),
+    func.row_number().over(order_by=_newest_first).label("position")
+).where(
+    ChatMessage.conversation_id == bindparam("conversation_id")
+).order_by(*_newest_first).limit(bindparam("history_limit")).subquery()
+
+# The first message past the budget comes back too, without its content,
+# to tell whether anything was dropped
+_RECENT_HISTORY = select(
+    _recent_messages.c.role,
+    case((_recent_messages.c.running_chars <= bindparam("max_chars"), _recent_messages.c.content)).label("content"),
+    _recent_messages.c.running_chars
+).where(
+    _recent_messages.c.running_chars - _recent_messages.c.chars <= bindparam("max_chars")
+).order_by(_recent_messages.c.position)
+
+# The conversation list: pick the page of conversations first, so messages
+# are only counted and ranked for the conversations being returned. The ID
+# breaks ties in the ordering so pages are stable.
+_page = select(
+    ChatConversation.id,
+    ChatConversation.title,
+    ChatConversation.method,
+    ChatConversation.model,
+    ChatConversation.created_at,
+    ChatConversation.updated_at
+).order_by(
+    desc(ChatConversation.updated_at), desc(ChatConversation.id)
+).offset(bindparam("skip")).limit(bindparam("limit")).subquery()
+_page_ids = select(_page.c.id)
+
+_message_counts = select(
+    ChatMessage.conversation_id.label("conversation_id"),
+    func.count(ChatMessage.id).label("message_count")
+).where(
+    ChatMessage.conversation_id.in_(_page_ids)
+).group_by(ChatMessage.conversation_id).subquery()
+
+# Rank each conversation's messages newest first so the last message
+# preview can be joined in; only enough characters to tell whether the
+# preview needs an ellipsis are read
+_ranked_messages = select(
+    ChatMessage.conversation_id.label("conversation_id"),
+    func.substr(ChatMessage.content, 1, 101).label("preview"),
+    func.row_number().over(
+        partition_by=ChatMessage.conversation_id,
+        order_by=_newest_first
+    ).label("position")
+).where(
+    ChatMessage.conversation_id.in_(_page_ids)
+).subquery()
+
+# Message counts and previews are joined to the page in one Core select,
+# as plain rows holding just the listed columns rather than ORM objects
+_CONVERSATION_PAGE = select(
+    _page.c.id,
+    _page.c.title,
+    _page.c.method,
+    _page.c.model,
+    _page.c.created_at,
+    _page.c.updated_at,
+    func.coalesce(_message_counts.c.message_count, 0).label("message_count"),
+    _ranked_messages.c.preview
+).outerjoin(
+    _message_counts, _message_counts.c.conversation_id == _page.c.id
+).outerjoin(
+    _ranked_messages, and_(
+        _ranked_messages.c.conversation_id == _page.c.id,
+        _ranked_messages.c.position == 1
+    )
+).order_by(
+    desc(_page.c.updated_at), desc(_page.c.id)
+)
+
+# The chat handler awaits the AI service, so it is a coroutine and runs its
+# blocking session work through these helpers in the threadpool; the
+# DB-only endpoints below are plain functions, which FastAPI already runs in
+# the threadpool.
+
+def _load_conversation(
+    db: Session,
+    conversation_id: int,
+    history_limit: int,
+    max_chars: int
+) -> Tuple[bool, List[Dict[str, str]], bool]:
+    """Check a conversation exists and load the tail of its history for the AI call.
+    
+    The history is windowed in SQL: walking back from the newest message,
+    whole messages are kept while their running content length stays
+    within ``max_chars``, up to ``history_limit`` messages. Only role and
+    content are read, with Core selects returning plain rows, and the
+    content of older messages never leaves the database.
+    
+    The read transaction is ended before returning, so the session gives
+    its connection back to the pool instead of holding it for the whole
+    AI call.
+    
+    Returns:
+        Whether the conversation exists, its recent history in
+        chronological order, and whether the character budget dropped any
+        messages from it.
+    """
+    try:
+        params = {"conversation_id": conversation_id}
+        if db.execute(_CONVERSATION_EXISTS, params).first() is None:
+            return False, [], False
+        
+        rows = db.execute(_RECENT_HISTORY, {
+            **params, "history_limit": history_limit, "max_chars": max_chars
+        }).all()
+        
+        history = [{"role": _ROLES.get(row.role, row.role), "content": row.content}
+                   for row in reversed(rows) if row.running_chars <= max_chars]
+        return True, history, len(history) < len(rows)
+    finally:
+        db.commit()
+
+def _save_new_conversation(db: Session, conversation: ChatConversation) -> ChatConversation:
+    """Save a new conversation, with its messages, in one transaction.
+    
+    The INSERTs return the generated IDs and timestamps (the models use
+    eager defaults), so after the flush the conversation and its messages
+    are complete in memory. They are detached before the commit, which
+    would otherwise expire them, and returned without being reloaded.
+    """
+    db.add(conversation)
+    db.flush()
+    db.expunge(conversation)
+    db.commit()
+    return conversation
+
+def _save_continuation(
+    db: Session,
+    conversation_id: int,
+    new_messages: List[ChatMessage]
+) -> Optional[Row]:
+    """Save a chat turn to an existing conversation in one transaction.
+    
+    The new messages are detached after their flush, like a new
+    conversation, so they keep their generated IDs and timestamps through
+    the commit. The conversation's earlier messages are not loaded.
+    
+    Returns:
+        The conversation's metadata row, or None if it was deleted while
+        the AI response was being generated; nothing is saved in that case.
+    """
+    conversation = db.execute(_TOUCH_CONVERSATION, {"conversation_id": conversation_id}).first()
+    if conversation is None:
+        db.rollback()
+        return None
+    
+    db.add_all(new_messages)
+    db.flush()
+    for message in new_messages:
+        db.expunge(message)
+    db.commit()
+    return conversation
+
 def generate_conversation_title(first_message: str) -> str:
     """Generate a conversation title from the first message.
     
@@ -70,17 +259,19 @@ def generate_conversation_title(first_message: str) -> str:
         'Hello, how are you?'
         >>> generate_conversation_title("A" * 60)
         'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA...'
+        >>> generate_conversation_title("  Hello  " + " " * 50)
+        'Hello'
     """
-    # Take first 50 characters and add ellipsis if longer
-    title = first_message.strip()[:50]
-    if len(first_message) > 50:
-        title += "..."
-    return title
+    # Short titles are used as they are; only the stripped length decides
+    # whether the title is cut and gets an ellipsis
+    title = first_message.strip()
+    if len(title) <= 50:
+        return title
+    return title[:50] + "..."
 
 @router.post("/semantic-kernel", response_model=ChatResponse)
 async def chat_semantic_kernel(
     request: ChatMessageRequest,
-    request_obj: Request,
     db: Session = Depends(get_db)
 ):
     """Send a chat message using Semantic Kernel.
@@ -91,7 +282,6 @@ async def chat_semantic_kernel(
     Args:
         request: Chat message request containing the message and optional
             conversation ID.
-        request_obj: The FastAPI request object.
         db: Database session (injected).
         
     Returns:
@@ -114,12 +304,11 @@ async def chat_semantic_kernel(
         }
         ```
     """
-    return await handle_chat_message(request, "semantic_kernel", "Semantic Kernel", request_obj, db)
+    return await handle_chat_message(request, "semantic_kernel", "Semantic Kernel", db)
 
 @router.post("/langchain", response_model=ChatResponse)
 async def chat_langchain(
     request: ChatMessageRequest,
-    request_obj: Request,
     db: Session = Depends(get_db)
 ):
     """Send a chat message using LangChain.
@@ -130,7 +319,6 @@ async def chat_langchain(
     Args:
         request: Chat message request containing the message and optional
             conversation ID.
-        request_obj: The FastAPI request object.
         db: Database session (injected).
         
     Returns:
@@ -139,12 +327,11 @@ async def chat_langchain(
     Raises:
         HTTPException: 404 if specified conversation not found.
     """
-    return await handle_chat_message(request, "langchain", "LangChain", request_obj, db)
+    return await handle_chat_message(request, "langchain", "LangChain", db)
 
 @router.post("/langgraph", response_model=ChatResponse)
 async def chat_langgraph(
     request: ChatMessageRequest,
-    request_obj: Request,
     db: Session = Depends(get_db)
 ):
     """Send a chat message using LangGraph.
@@ -155,7 +342,6 @@ async def chat_langgraph(
     Args:
         request: Chat message request containing the message and optional
             conversation ID.
-        request_obj: The FastAPI request object.
         db: Database session (injected).
         
     Returns:
@@ -164,29 +350,76 @@ async def chat_langgraph(
     Raises:
         HTTPException: 404 if specified conversation not found.
     """
-    return await handle_chat_message(request, "langgraph", "LangGraph", request_obj, db)
+    return await handle_chat_message(request, "langgraph", "LangGraph", db)
+
+@router.post("/semantic-kernel/stream")
+async def chat_semantic_kernel_stream(
+    request: ChatMessageRequest,
+    db: Session = Depends(get_db)
+):
+    """Send a chat message using Semantic Kernel, streaming the response.
+    
+    Returns the AI response as server-sent events while it is generated;
+    see ``stream_chat_message`` for the events.
+    
+    Raises:
+        HTTPException: 404 if specified conversation not found.
+    """
+    return await stream_chat_message(request, "semantic_kernel", db)
+
+@router.post("/langchain/stream")
+async def chat_langchain_stream(
+    request: ChatMessageRequest,
+    db: Session = Depends(get_db)
+):
+    """Send a chat message using LangChain, streaming the response.
+    
+    Returns the AI response as server-sent events while it is generated;
+    see ``stream_chat_message`` for the events.
+    
+    Raises:
+        HTTPException: 404 if specified conversation not found.
+    """
+    return await stream_chat_message(request, "langchain", db)
+
+@router.post("/langgraph/stream")
+async def chat_langgraph_stream(
+    request: ChatMessageRequest,
+    db: Session = Depends(get_db)
+):
+    """Send a chat message using LangGraph, streaming the response.
+    
+    Returns the AI response as server-sent events while it is generated;
+    see ``stream_chat_message`` for the events.
+    
+    Raises:
+        HTTPException: 404 if specified conversation not found.
+    """
+    return await stream_chat_message(request, "langgraph", db)
 
 async def handle_chat_message(
     request: ChatMessageRequest,
     service_name: str,
     method_name: str,
-    request_obj: Request,
     db: Session
 ) -> ChatResponse:
     """Common chat message handling logic.
     
     Handles the complete chat workflow including:
-    - Loading or creating conversations
-    - Managing conversation history
+    - Loading the conversation history
     - Generating AI responses
     - Persisting messages to database
     - Performance tracking
     
+    Continuing a conversation loads its recent history, trimmed to the
+    context budget; a new conversation has nothing to load. No database
+    connection is held during the AI call, and nothing is written until
+    it has succeeded.
+    
     Args:
         request: The chat message request.
         service_name: The internal service name (e.g., "langchain").
         method_name: The display name of the method (e.g., "LangChain").
-        request_obj: The FastAPI request object for accessing request state.
         db: The database session.
         
     Returns:
@@ -194,7 +427,8 @@ async def handle_chat_message(
         and performance metrics.
         
     Raises:
-        HTTPException: 404 if specified conversation not found.
+        HTTPException: 404 if the specified conversation does not exist, or
+            was deleted while the response was being generated.
         Any exceptions from the AI service.
         
     Examples:
@@ -202,70 +436,201 @@ async def handle_chat_message(
         ...     request=ChatMessageRequest(message="Hello"),
         ...     service_name="langchain",
         ...     method_name="LangChain",
-        ...     request_obj=request,
         ...     db=session
         ... )
     """
-    start_time = time.time()
-    request_id = getattr(request_obj.state, 'request_id', None)
+    start_ns = time.perf_counter_ns()
+    request_id = get_current_request_id()
+    history, db_load_time = await _load_chat_history(request, service_name, db)
     
-    logger.info("Chat message processing started",
-               method=service_name,
-               message_length=len(request.message),
-               conversation_id=request.conversation_id,
-               has_existing_conversation=bool(request.conversation_id),
-               request_id=request_id)
-    
-    # Get or create conversation
-    conversation = None
-    conversation_history = []
-    db_load_start = time.time()
-    
-    if request.conversation_id:
-        logger.debug("Loading existing conversation", 
-                    conversation_id=request.conversation_id)
-        
-        # Load existing conversation
-        conversation = db.query(ChatConversation).filter(
-            ChatConversation.id == request.conversation_id
-        ).first()
-        
-        if not conversation:
-            logger.warning("Conversation not found", 
-                          conversation_id=request.conversation_id,
-                          request_id=request_id)
-            raise HTTPException(status_code=404, detail="Conversation not found")
-        
-        # Load conversation history
-        messages = db.query(ChatMessage).filter(
-            ChatMessage.conversation_id == conversation.id
-        ).order_by(ChatMessage.created_at).all()
-        
-        conversation_history = [
-            {"role": msg.role, "content": msg.content} for msg in messages
-        ]
+    ai_start_ns = time.perf_counter_ns()
+    ai_response, usage_info = await get_chat_service(service_name).send_message(request.message, history)
+    ai_generation_time = (time.perf_counter_ns() - ai_start_ns) / 1_000_000
+    
+    db_save_start_ns = time.perf_counter_ns()
+    conversation, ai_message = await _save_chat_turn(
+        request, service_name, db, ai_response, usage_info, ai_generation_time, request_id
+    )
+    db_save_time = (time.perf_counter_ns() - db_save_start_ns) / 1_000_000
+    
+    return _chat_turn_response(
+        request, service_name, conversation, ai_message, ai_response, usage_info,
+        history=history, start_ns=start_ns, ai_generation_time=ai_generation_time,
+        db_time=db_load_time + db_save_time, request_id=request_id
+    )
+
+async def stream_chat_message(
+    request: ChatMessageRequest,
+    service_name: str,
+    db: Session
+) -> StreamingResponse:
+    """Common streaming chat logic.
+    
+    Works like ``handle_chat_message``, but sends the AI response as
+    server-sent events while it is generated:
+    
+    - ``chunk``: ``{"content": ...}`` for each piece of the response.
+    - ``done``: the ChatResponse, once the turn has been saved.
+    - ``error``: ``{"detail": ...}`` if the turn fails after the stream
+      has started; nothing is saved in that case.
+    
+    The conversation is checked before the stream starts, so a missing
+    conversation is still a plain 404 response.
+    
+    Raises:
+        HTTPException: 404 if the specified conversation does not exist.
+    """
+    start_ns = time.perf_counter_ns()
+    request_id = get_current_request_id()
+    history, db_load_time = await _load_chat_history(request, service_name, db)
+    
+    return StreamingResponse(
+        _chat_turn_events(request, service_name, db, history,
+                          start_ns=start_ns, db_load_time=db_load_time, request_id=request_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _chat_turn_events(
+    request: ChatMessageRequest,
+    service_name: str,
+    db: Session,
+    history: List[Dict[str, str]],
+    *,
+    start_ns: int,
+    db_load_time: float,
+    request_id: Optional[str]
+) -> AsyncIterator[str]:
+    """Stream one chat turn as server-sent events, then save it.
+    
+    The session is closed when the stream ends: the request's dependency
+    cleanup may already have run by the time the body is sent.
+    """
+    try:
+        usage_info: Dict[str, Any] = {}
+        chunks = []
+        ai_start_ns = time.perf_counter_ns()
+        async for chunk in get_chat_service(service_name).stream_message(request.message, history, usage_info):
+            chunks.append(chunk)
+            yield _sse_event("chunk", {"content": chunk})
+        ai_generation_time = (time.perf_counter_ns() - ai_start_ns) / 1_000_000
+        ai_response = "".join(chunks)
+        
+        db_save_start_ns = time.perf_counter_ns()
+        conversation, ai_message = await _save_chat_turn(
+            request, service_name, db, ai_response, usage_info, ai_generation_time, request_id
+        )
+        db_save_time = (time.perf_counter_ns() - db_save_start_ns) / 1_000_000
+        
+        response = _chat_turn_response(
+            request, service_name, conversation, ai_message, ai_response, usage_info,
+            history=history, start_ns=start_ns, ai_generation_time=ai_generation_time,
+            db_time=db_load_time + db_save_time, request_id=request_id
+        )
+        yield _sse_event("done", response.model_dump(mode="json"))
+    except HTTPException as e:
+        yield _sse_event("error", {"detail": e.detail})
+    except Exception as e:
+        logger.error("Chat stream failed",
+                    service=service_name,
+                    conversation_id=request.conversation_id,
+                    error=str(e),
+                    error_type=type(e).__name__)
+        yield _sse_event("error", {"detail": str(e)})
+    finally:
+        await run_in_threadpool(db.close)
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+async def _load_chat_history(
+    request: ChatMessageRequest,
+    service_name: str,
+    db: Session
+) -> Tuple[List[Dict[str, str]], float]:
+    """Start a chat turn: load the history to send with the message.
+    
+    The history is loaded off the event loop; a new conversation has no
+    history and needs no database work.
+    
+    Returns:
+        The recent history in chronological order, and the time spent
+        loading it in milliseconds.
+        
+    Raises:
+        HTTPException: 404 if the conversation does not exist.
+    """
+    # Phases are logged at debug level; a single info entry with all the
+    # metrics is written when the turn completes
+    if is_debug_enabled():
+        logger.debug("Chat message processing started",
+                    method=service_name,
+                    message_length=len(request.message),
+                    conversation_id=request.conversation_id,
+                    has_existing_conversation=bool(request.conversation_id))
+    
+    if not request.conversation_id:
+        return [], 0.0
+    
+    db_load_start_ns = time.perf_counter_ns()
+    exists, conversation_history, trimmed = await run_in_threadpool(
+        _load_conversation, db, request.conversation_id,
+        settings.chat_history_max_messages, settings.chat_history_max_chars
+    )
+    
+    if not exists:
+        logger.warning("Conversation not found", 
+                      conversation_id=request.conversation_id)
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    db_load_time = (time.perf_counter_ns() - db_load_start_ns) / 1_000_000
+    
+    if is_debug_enabled():
+        logger.debug("Conversation history loaded", 
+                    conversation_id=request.conversation_id,
+                    message_count=len(conversation_history),
+                    db_load_time_ms=round(db_load_time, 2))
+    
+    # The history query keeps only the newest messages within the context
+    # budget; note when that dropped some
+    if trimmed:
+        logger.warning("Large conversation context trimmed",
+                      conversation_id=request.conversation_id,
+                      message_count=len(conversation_history),
+                      total_context_chars=sum(len(msg["content"]) for msg in conversation_history),
+                      max_context_chars=settings.chat_history_max_chars)
+    
+    return conversation_history, db_load_time
+
+async def _save_chat_turn(
+    request: ChatMessageRequest,
+    service_name: str,
+    db: Session,
+    ai_response: str,
+    usage_info: Dict,
+    ai_generation_time: float,
+    request_id: Optional[str]
+) -> Tuple[Union[ChatConversation, Row], ChatMessage]:
+    """Save the user message and the AI response, off the event loop.
+    
+    A new conversation and both messages are built in memory, linked
+    through the relationship, and written by a single commit; the
+    conversation ID is assigned during that flush. A continuation saves
+    both messages and the conversation's new timestamp in one commit.
+    
+    Returns:
+        The conversation (its metadata), and the saved AI message.
         
-        db_load_time = (time.time() - db_load_start) * 1000
-        total_context_chars = sum(len(msg["content"]) for msg in conversation_history)
-        
-        logger.info("Conversation history loaded", 
-                   conversation_id=request.conversation_id,
-                   message_count=len(conversation_history),
-                   total_context_chars=total_context_chars,
-                   db_load_time_ms=round(db_load_time, 2),
-                   request_id=request_id)
-        
-        # Warn about large contexts
-        if total_context_chars > 8000:
-            logger.warning("Large conversation context detected",
-                          conversation_id=request.conversation_id,
-                          total_context_chars=total_context_chars,
-                          message_count=len(conversation_history),
-                          request_id=request_id)
-    else:
-        logger.debug("Creating new conversation")
-        
-        # Create new conversation
+    Raises:
+        HTTPException: 404 if the conversation was deleted while the
+            response was being generated.
+    """
+    user_message, ai_message = _build_chat_messages(
+        request.message, ai_response, usage_info, ai_generation_time, request_id
+    )
+    
+    if not request.conversation_id:
         model_info = get_model_info()
         conversation = ChatConversation(
             title=generate_conversation_title(request.message),
@@ -273,54 +638,46 @@ async def handle_chat_message(
             provider=model_info["provider"],
             model=model_info["model"]
         )
-        db.add(conversation)
-        db.flush()  # Get the ID
-        
-        db_load_time = (time.time() - db_load_start) * 1000
-        logger.info("New conversation created", 
-                   conversation_id=conversation.id,
-                   title=conversation.title,
-                   db_create_time_ms=round(db_load_time, 2),
-                   request_id=request_id)
+        conversation.messages = [user_message, ai_message]
+        return await run_in_threadpool(_save_new_conversation, db, conversation), ai_message
     
-    # Save user message
+    user_message.conversation_id = request.conversation_id
+    ai_message.conversation_id = request.conversation_id
+    conversation = await run_in_threadpool(
+        _save_continuation, db, request.conversation_id, [user_message, ai_message]
+    )
+    if conversation is None:
+        logger.warning("Conversation deleted during chat turn",
+                      conversation_id=request.conversation_id)
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation, ai_message
+
+def _build_chat_messages(
+    message: str,
+    ai_response: str,
+    usage_info: Dict,
+    ai_generation_time: float,
+    request_id: Optional[str]
+) -> Tuple[ChatMessage, ChatMessage]:
+    """Build the user message and the AI message, with its token information.
+    
+    The user message sets the same columns as the AI message (to None) so
+    the ORM can batch both rows into one multi-row INSERT where the dialect
+    supports it (PostgreSQL).
+    """
     user_message = ChatMessage(
-        conversation_id=conversation.id,
         role="user",
-        content=request.message,
-        request_id=getattr(request_obj.state, 'request_id', None)
+        content=message,
+        generation_time_ms=None,
+        input_tokens=None,
+        output_tokens=None,
+        total_tokens=None,
+        request_id=request_id,
+        estimated_cost_usd=None,
+        input_cost_per_1k_tokens=None,
+        output_cost_per_1k_tokens=None
     )
-    db.add(user_message)
-    
-    # Generate AI response
-    ai_start_time = time.time()
-    logger.debug("Starting AI response generation", 
-                service=service_name,
-                context_length=len(conversation_history))
-    
-    service = get_chat_service(service_name)
-    ai_response, usage_info = await service.send_message(request.message, conversation_history)
-    
-    ai_generation_time = (time.time() - ai_start_time) * 1000
-    
-    logger.info("AI response generated", 
-               service=service_name,
-               response_length=len(ai_response),
-               ai_generation_time_ms=round(ai_generation_time, 2),
-               input_tokens=usage_info["input_tokens"],
-               output_tokens=usage_info["output_tokens"],
-               total_tokens=usage_info["total_tokens"],
-               tokens_per_second=round(usage_info["output_tokens"] / (ai_generation_time / 1000), 2) if ai_generation_time > 0 else 0,
-               conversation_id=conversation.id,
-               request_id=request_id)
-    
-    # Save messages to database
-    db_save_start = time.time()
-    logger.debug("Saving messages to database")
-    
-    # Save AI message with token information
     ai_message = ChatMessage(
-        conversation_id=conversation.id,
         role="assistant",
         content=ai_response,
         generation_time_ms=round(ai_generation_time, 2),
@@ -333,85 +690,63 @@ async def handle_chat_message(
         input_cost_per_1k_tokens=usage_info["input_cost_per_1k_tokens"],
         output_cost_per_1k_tokens=usage_info["output_cost_per_1k_tokens"]
     )
-    db.add(ai_message)
-    
-    # Update conversation timestamp
-    conversation.updated_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(conversation)
-    db.refresh(ai_message)
-    
-    db_save_time = (time.time() - db_save_start) * 1000
-    total_time = (time.time() - start_time) * 1000
+    return user_message, ai_message
+
+def _chat_turn_response(
+    request: ChatMessageRequest,
+    service_name: str,
+    conversation: Union[ChatConversation, Row],
+    ai_message: ChatMessage,
+    ai_response: str,
+    usage_info: Dict,
+    *,
+    history: List[Dict[str, str]],
+    start_ns: int,
+    ai_generation_time: float,
+    db_time: float,
+    request_id: Optional[str]
+) -> ChatResponse:
+    """Write the chat turn's info log entry and build the response.
     
-    # Load full conversation with messages for response
-    full_conversation = db.query(ChatConversation).filter(
-        ChatConversation.id == conversation.id
-    ).first()
+    The response carries the conversation's metadata and the new message
+    only; clients read the full history from GET /conversations/{id}.
+    """
+    total_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+    input_tokens, output_tokens, total_tokens = (
+        usage_info["input_tokens"], usage_info["output_tokens"], usage_info["total_tokens"]
+    )
+    tokens_per_second = round(output_tokens / (ai_generation_time / 1000), 2) if ai_generation_time > 0 else 0
+    percent_of_total = 100 / total_time if total_time > 0 else 0
     
-    # Final performance logging
+    # Final performance logging: the one info entry per chat turn
     logger.info("Chat message processing completed", 
                service=service_name,
                conversation_id=conversation.id,
+               new_conversation=not request.conversation_id,
                message_id=ai_message.id,
+               message_length=len(request.message),
+               response_length=len(ai_response),
+               context_messages=len(history),
+               context_chars=sum(len(msg["content"]) for msg in history),
                total_time_ms=round(total_time, 2),
                ai_generation_time_ms=round(ai_generation_time, 2),
-               db_operations_time_ms=round((db_load_time if 'db_load_time' in locals() else 0) + db_save_time, 2),
-               ai_percentage=round((ai_generation_time / total_time) * 100, 1) if total_time > 0 else 0,
-               db_percentage=round(((db_load_time if 'db_load_time' in locals() else 0) + db_save_time) / total_time * 100, 1) if total_time > 0 else 0,
-               tokens_per_second=round(usage_info["output_tokens"] / (ai_generation_time / 1000), 2) if ai_generation_time > 0 else 0,
-               total_tokens=usage_info["total_tokens"],
-               conversation_length=len(full_conversation.messages) if full_conversation else 0,
-               request_id=request_id)
-    
-    # Create response with proper date formatting
-    conversation_response = ChatConversationResponse(
-        id=full_conversation.id,
-        title=full_conversation.title,
-        method=full_conversation.method,
-        model=full_conversation.model,
-        created_at=full_conversation.created_at.isoformat() + 'Z' if full_conversation.created_at else None,
-        updated_at=full_conversation.updated_at.isoformat() + 'Z' if full_conversation.updated_at else None,
-        messages=[
-            ChatMessageResponse(
-                id=msg.id,
-                role=msg.role,
-                content=msg.content,
-                generation_time_ms=msg.generation_time_ms,
-                input_tokens=msg.input_tokens,
-                output_tokens=msg.output_tokens,
-                total_tokens=msg.total_tokens,
-                created_at=msg.created_at.isoformat() + 'Z' if msg.created_at else None,
-                estimated_cost_usd=float(msg.estimated_cost_usd) if msg.estimated_cost_usd else None,
-                input_cost_per_1k_tokens=float(msg.input_cost_per_1k_tokens) if msg.input_cost_per_1k_tokens else None,
-                output_cost_per_1k_tokens=float(msg.output_cost_per_1k_tokens) if msg.output_cost_per_1k_tokens else None
-            ) for msg in full_conversation.messages
-        ]
-    )
-    
-    message_response = ChatMessageResponse(
-        id=ai_message.id,
-        role=ai_message.role,
-        content=ai_message.content,
-        generation_time_ms=ai_message.generation_time_ms,
-        input_tokens=ai_message.input_tokens,
-        output_tokens=ai_message.output_tokens,
-        total_tokens=ai_message.total_tokens,
-        created_at=ai_message.created_at.isoformat() + 'Z' if ai_message.created_at else None,
-        estimated_cost_usd=float(ai_message.estimated_cost_usd) if ai_message.estimated_cost_usd else None,
-        input_cost_per_1k_tokens=float(ai_message.input_cost_per_1k_tokens) if ai_message.input_cost_per_1k_tokens else None,
-        output_cost_per_1k_tokens=float(ai_message.output_cost_per_1k_tokens) if ai_message.output_cost_per_1k_tokens else None
-    )
-    
+               db_operations_time_ms=round(db_time, 2),
+               ai_percentage=round(ai_generation_time * percent_of_total, 1),
+               db_percentage=round(db_time * percent_of_total, 1),
+               tokens_per_second=tokens_per_second,
+               input_tokens=input_tokens,
+               output_tokens=output_tokens,
+               total_tokens=total_tokens)
+    
+    # Validate the responses straight from the ORM objects or returned row
     return ChatResponse(
-        conversation=conversation_response,
-        message=message_response,
+        conversation=ChatConversationSummary.model_validate(conversation),
+        message=ChatMessageResponse.model_validate(ai_message),
         request_id=request_id
     )
 
 @router.get("/conversations", response_model=List[ChatConversationList])
-async def get_conversations(
+def get_conversations(
     skip: int = 0,
     limit: int = 20,
     db: Session = Depends(get_db)
@@ -444,44 +779,30 @@ async def get_conversations(
             }
         ]
     """
-    conversations = db.query(ChatConversation).order_by(
-        desc(ChatConversation.updated_at)
-    ).offset(skip).limit(limit).all()
+    # Counts and last message previews come back with the page in one query
+    rows = db.execute(_CONVERSATION_PAGE, {"skip": skip, "limit": limit}).all()
     
     result = []
-    for conv in conversations:
-        # Get message count
-        message_count = db.query(ChatMessage).filter(
-            ChatMessage.conversation_id == conv.id
-        ).count()
-        
-        # Get last message preview
-        last_message = db.query(ChatMessage).filter(
-            ChatMessage.conversation_id == conv.id
-        ).order_by(desc(ChatMessage.created_at)).first()
-        
-        last_message_preview = None
-        if last_message:
-            preview = last_message.content[:100]
-            if len(last_message.content) > 100:
-                preview += "..."
-            last_message_preview = preview
+    for row in rows:
+        preview = row.preview
+        if preview is not None and len(preview) > 100:
+            preview = preview[:100] + "..."
         
         result.append(ChatConversationList(
-            id=conv.id,
-            title=conv.title,
-            method=conv.method,
-            model=conv.model,
-            message_count=message_count,
-            last_message_preview=last_message_preview,
-            created_at=conv.created_at.isoformat() + 'Z' if conv.created_at else None,
-            updated_at=conv.updated_at.isoformat() + 'Z' if conv.updated_at else None
+            id=row.id,
+            title=row.title,
+            method=row.method,
+            model=row.model,
+            message_count=row.message_count,
+            last_message_preview=preview,
+            created_at=row.created_at,
+            updated_at=row.updated_at
         ))
     
     return result
 
 @router.get("/conversations/{conversation_id}", response_model=ChatConversationResponse)
-async def get_conversation(
+def get_conversation(
     conversation_id: int,
     db: Session = Depends(get_db)
 ):
@@ -513,40 +834,19 @@ async def get_conversation(
             ...
         }
     """
-    conversation = db.query(ChatConversation).filter(
+    conversation = db.query(ChatConversation).options(
+        selectinload(ChatConversation.messages).load_only(*_MESSAGE_RESPONSE_COLUMNS)
+    ).filter(
         ChatConversation.id == conversation_id
     ).first()
     
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    # Create response with proper date formatting
-    return ChatConversationResponse(
-        id=conversation.id,
-        title=conversation.title,
-        method=conversation.method,
-        model=conversation.model,
-        created_at=conversation.created_at.isoformat() + 'Z' if conversation.created_at else None,
-        updated_at=conversation.updated_at.isoformat() + 'Z' if conversation.updated_at else None,
-        messages=[
-            ChatMessageResponse(
-                id=msg.id,
-                role=msg.role,
-                content=msg.content,
-                generation_time_ms=msg.generation_time_ms,
-                input_tokens=msg.input_tokens,
-                output_tokens=msg.output_tokens,
-                total_tokens=msg.total_tokens,
-                created_at=msg.created_at.isoformat() + 'Z' if msg.created_at else None,
-                estimated_cost_usd=float(msg.estimated_cost_usd) if msg.estimated_cost_usd else None,
-                input_cost_per_1k_tokens=float(msg.input_cost_per_1k_tokens) if msg.input_cost_per_1k_tokens else None,
-                output_cost_per_1k_tokens=float(msg.output_cost_per_1k_tokens) if msg.output_cost_per_1k_tokens else None
-            ) for msg in conversation.messages
-        ]
-    )
+    return ChatConversationResponse.model_validate(conversation)
 
 @router.delete("/conversations/{conversation_id}")
-async def delete_conversation(
+def delete_conversation(
     conversation_id: int,
     db: Session = Depends(get_db)
 ):
@@ -569,20 +869,25 @@ async def delete_conversation(
         >>> DELETE /api/chat/conversations/123
         {"message": "Conversation deleted successfully"}
     """
-    conversation = db.query(ChatConversation).filter(
+    # Delete without loading the rows; the row count doubles as the existence
+    # check. The messages go first, since databases created before the
+    # ON DELETE CASCADE was declared do not cascade them.
+    db.query(ChatMessage).filter(
+        ChatMessage.conversation_id == conversation_id
+    ).delete(synchronize_session=False)
+    deleted = db.query(ChatConversation).filter(
         ChatConversation.id == conversation_id
-    ).first()
+    ).delete(synchronize_session=False)
     
-    if not conversation:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    db.delete(conversation)
     db.commit()
     
     return {"message": "Conversation deleted successfully"}
 
 @router.delete("/conversations")
-async def delete_all_conversations(
+def delete_all_conversations(
     db: Session = Depends(get_db)
 ):
     """Delete all conversations and messages.
@@ -600,14 +905,10 @@ async def delete_all_conversations(
         >>> DELETE /api/chat/conversations
         {"message": "All conversations deleted successfully", "deleted_count": 15}
     """
-    # Count conversations before deletion
-    conversation_count = db.query(ChatConversation).count()
-    
-    # Delete all chat messages first (due to foreign key constraints)
-    db.query(ChatMessage).delete()
-    
-    # Delete all conversations
-    db.query(ChatConversation).delete()
+    # Bulk deletes; the messages go first, since databases created before the
+    # ON DELETE CASCADE was declared do not cascade them
+    db.query(ChatMessage).delete(synchronize_session=False)
+    conversation_count = db.query(ChatConversation).delete(synchronize_session=False)
     
     db.commit()
     
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request
 from fastapi.responses import JSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import os
@@ -39,7 +40,7 @@ _context_services = {
 def get_context_service(service_name: str):
     """Lazy load context service instances"""
     if _context_services[service_name] is None:
-        logger.info(f"Initializing {service_name} context service for prompt execution")
+        logger.info("Initializing context service for prompt execution", service=service_name)
         if service_name == "semantic-kernel":
             _context_services[service_name] = SemanticKernelContextService()
         elif service_name == "langchain":
@@ -316,7 +317,8 @@ async def execute_context_prompt(
         execution_record.input_cost_per_1k_tokens = usage_info["input_cost_per_1k_tokens"]
         execution_record.output_cost_per_1k_tokens = usage_info["output_cost_per_1k_tokens"]
         execution_record.status = "completed"
-        execution_record.completed_at = datetime.utcnow()
+        # Stamped with the database clock, like the record's created_at
+        execution_record.completed_at = func.now()
         
         # Save to database
         db.add(execution_record)
@@ -460,7 +462,7 @@ async def delete_uploaded_file(
 
 
 @router.get("/executions", response_model=List[ContextExecutionList])
-async def get_context_executions(
+def get_context_executions(
     skip: int = 0,
     limit: int = 20,
     db: Session = Depends(get_db)
@@ -501,7 +503,7 @@ async def get_context_executions(
 
 
 @router.get("/executions/{execution_id}", response_model=ContextPromptResponse)
-async def get_context_execution(
+def get_context_execution(
     execution_id: int,
     db: Session = Depends(get_db)
 ):
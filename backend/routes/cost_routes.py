@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import Optional, List
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Callable, Dict, Optional, List, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy import BigInteger, Float, func, desc, and_, case, cast, literal, null, select, union_all
 from datetime import datetime, timedelta
+from collections import defaultdict
+from operator import itemgetter
+import asyncio
+import time
+import orjson
 
-from schemas.cost import (
-    CostUsageResponse, CostSummary, CostByMethod, CostByModel, 
-    DailyCostUsage, RecentRequest
-)
+from schemas.cost import CostUsageResponse, CostSummary
 from pydantic import BaseModel
 from typing import Literal
-from database import get_db, Story, ChatMessage, ChatConversation, ContextPromptExecution
+from database import get_db, Story, ChatMessage, ChatConversation, ContextPromptExecution, get_billed_data_version, billed_data_changed
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -45,6 +49,238 @@ class TransactionsResponse(BaseModel):
     transaction_count: int
 
 
+# Costs are stored with six decimal places, so the analytics add them up as
+# whole micro-dollars: the sums are exact integers, with no floating point
+# error to round away, and are converted to dollars only for the response.
+_MICRO_USD = 1_000_000
+
+
+def _micro_usd(cost):
+    """A cost column in dollars as a whole number of micro-dollars."""
+    return cast(func.round(cost * _MICRO_USD), BigInteger)
+
+
+def _billed_requests(start_date: datetime, end_date: datetime, daily_start: datetime):
+    """Subquery of every billed request in the date range, from all sources.
+    
+    Stories, AI chat messages and completed context executions that have a
+    cost are combined with UNION ALL into rows of (method, model, day,
+    cost, tokens), so one query can aggregate them all. Chat messages take
+    their method and model from their conversation. ``cost`` is in whole
+    micro-dollars, see ``_micro_usd``.
+    
+    ``day`` is the request's date from ``daily_start`` on, and NULL before
+    it. It is always NULL for context executions, which the daily usage
+    does not include.
+    
+    The analytics aggregate these source rows on every (uncached) request
+    rather than reading pre-aggregated rollup tables: rows leave the source
+    tables through bulk deletes and ``ON DELETE CASCADE``, which the
+    application never sees, so a rollup maintained on insert would drift.
+    The billed-row indexes keep the scans to the requested window.
+    """
+    def day(created_at):
+        return case((created_at >= daily_start, func.date(created_at))).label('day')
+    
+    stories = select(
+        Story.method.label('method'),
+        Story.model.label('model'),
+        day(Story.created_at),
+        _micro_usd(Story.estimated_cost_usd).label('cost'),
+        Story.total_tokens.label('tokens')
+    ).where(
+        Story.created_at >= start_date,
+        Story.created_at <= end_date,
+        Story.estimated_cost_usd.isnot(None)
+    )
+    
+    chats = select(
+        ChatConversation.method,
+        ChatConversation.model,
+        day(ChatMessage.created_at),
+        _micro_usd(ChatMessage.estimated_cost_usd),
+        ChatMessage.total_tokens
+    ).join_from(ChatMessage, ChatConversation).where(
+        ChatMessage.created_at >= start_date,
+        ChatMessage.created_at <= end_date,
+        ChatMessage.role == 'assistant',  # Only count AI responses
+        ChatMessage.estimated_cost_usd.isnot(None)
+    )
+    
+    contexts = select(
+        ContextPromptExecution.method,
+        ContextPromptExecution.model,
+        null(),
+        _micro_usd(ContextPromptExecution.estimated_cost_usd),
+        ContextPromptExecution.total_tokens
+    ).where(
+        ContextPromptExecution.created_at >= start_date,
+        ContextPromptExecution.created_at <= end_date,
+        ContextPromptExecution.status == 'completed',
+        ContextPromptExecution.estimated_cost_usd.isnot(None)
+    )
+    
+    return union_all(stories, chats, contexts).subquery()
+
+
+def _top_billed_requests(start_date: datetime, end_date: datetime, limit: int):
+    """Query for the costliest billed requests in the date range, from all sources.
+    
+    The rows are shaped like RecentRequest, with the cost as a float and
+    no NULL model or token count, so they need no converting. Context
+    executions report their filename as the primary character.
+    """
+    stories = select(
+        Story.id.label('id'),
+        literal('story').label('type'),
+        Story.method.label('method'),
+        func.coalesce(Story.model, 'unknown').label('model'),
+        cast(Story.estimated_cost_usd, Float).label('cost_usd'),
+        func.coalesce(Story.total_tokens, 0).label('tokens_used'),
+        Story.created_at.label('created_at'),
+        Story.primary_character.label('primary_character'),
+        null().label('conversation_title')
+    ).where(
+        Story.created_at >= start_date,
+        Story.created_at <= end_date,
+        Story.estimated_cost_usd.isnot(None)
+    )
+    
+    chats = select(
+        ChatMessage.id,
+        literal('chat'),
+        ChatConversation.method,
+        func.coalesce(ChatConversation.model, 'unknown'),
+        cast(ChatMessage.estimated_cost_usd, Float),
+        func.coalesce(ChatMessage.total_tokens, 0),
+        ChatMessage.created_at,
+        null(),
+        ChatConversation.title
+    ).join_from(ChatMessage, ChatConversation).where(
+        ChatMessage.created_at >= start_date,
+        ChatMessage.created_at <= end_date,
+        ChatMessage.role == 'assistant',
+        ChatMessage.estimated_cost_usd.isnot(None)
+    )
+    
+    contexts = select(
+        ContextPromptExecution.id,
+        literal('context'),
+        ContextPromptExecution.method,
+        func.coalesce(ContextPromptExecution.model, 'unknown'),
+        cast(ContextPromptExecution.estimated_cost_usd, Float),
+        func.coalesce(ContextPromptExecution.total_tokens, 0),
+        ContextPromptExecution.created_at,
+        ContextPromptExecution.original_filename,  # Use filename as identifier
+        null()
+    ).where(
+        ContextPromptExecution.created_at >= start_date,
+        ContextPromptExecution.created_at <= end_date,
+        ContextPromptExecution.status == 'completed',
+        ContextPromptExecution.estimated_cost_usd.isnot(None)
+    )
+    
+    return union_all(stories, chats, contexts).order_by(desc('cost_usd')).limit(limit)
+
+
+def _empty_costs() -> list:
+    """Zeroed cost totals for one summary or breakdown entry.
+    
+    The totals are a ``[total_cost, request_count, total_tokens]`` list,
+    with the cost in micro-dollars, which the roll-up updates in place for
+    every aggregated row.
+    """
+    return [0, 0, 0]
+
+
+def _cost_totals(billed) -> tuple:
+    """Aggregate columns of (total_cost, request_count, total_tokens) over ``billed``.
+    
+    None of them is ever NULL, and all are whole numbers, with the cost in
+    micro-dollars. PostgreSQL sums integers as NUMERIC, which the driver
+    returns as Decimal, so the rows are added up through ``_add_costs``.
+    """
+    return (
+        func.coalesce(func.sum(billed.c.cost), 0).label('total_cost'),
+        func.count().label('request_count'),
+        func.coalesce(func.sum(billed.c.tokens), 0).label('total_tokens')
+    )
+
+
+def _add_costs(costs: list, total_cost: int, request_count: int, total_tokens: int) -> None:
+    """Add aggregated costs to a set of totals, as ints that orjson can encode."""
+    costs[0] += int(total_cost)
+    costs[1] += int(request_count)
+    costs[2] += int(total_tokens)
+
+
+def _summary(totals: Sequence) -> dict:
+    """Overall cost summary, shaped like CostSummary, from a set of totals.
+    
+    Both /usage and /summary report their totals through this, so the two
+    always agree.
+    """
+    total_cost, total_requests, total_tokens = totals
+    
+    return {
+        "total_cost_usd": total_cost / _MICRO_USD,
+        "total_requests": total_requests,
+        "total_tokens": total_tokens,
+        "average_cost_per_request": round(total_cost / total_requests) / _MICRO_USD if total_requests > 0 else 0.0,
+        "average_tokens_per_request": round(total_tokens / total_requests, 2) if total_requests > 0 else 0.0
+    }
+
+
+# Cost dashboards poll these analytics, so responses are kept for a short
+# while as serialized JSON; a cache hit runs no queries and no validation.
+# The response models document the endpoints; the responses are built as
+# plain dicts and encoded with orjson.
+# Entries are tagged with the billed data version (see database.py), so
+# committing billed rows makes every cached response stale; bulk deletes
+# elsewhere are only picked up when the entries expire.
+_COST_CACHE_TTL_SECONDS = 60
+_cost_cache: Dict[Tuple[str, int], Tuple[float, int, bytes]] = {}
+_cost_cache_locks: Dict[Tuple[str, int], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _fresh_content(key: Tuple[str, int]) -> Optional[bytes]:
+    """Return the cached JSON for ``key`` if it is still fresh."""
+    cached = _cost_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic() and cached[1] == get_billed_data_version():
+        return cached[2]
+    return None
+
+
+async def _cached_content(key: Tuple[str, int], build: Callable[[], dict]) -> bytes:
+    """Return the cached JSON for ``key``, building it if stale.
+    
+    A stale entry is built in the threadpool, so its queries do not block
+    the event loop. Only one request builds a given entry: requests that
+    miss while it is being built wait for it and are served the result.
+    The version read before building keeps an entry from outliving a
+    write committed while it was built.
+    """
+    content = _fresh_content(key)
+    if content is not None:
+        return content
+    
+    async with _cost_cache_locks[key]:
+        # Another request may have built the entry while this one waited
+        content = _fresh_content(key)
+        if content is not None:
+            return content
+        
+        version = get_billed_data_version()
+        content = orjson.dumps(await run_in_threadpool(build))
+        _cost_cache[key] = (time.monotonic() + _COST_CACHE_TTL_SECONDS, version, content)
+        return content
+
+
+async def _cached_json(key: Tuple[str, int], build: Callable[[], dict]) -> Response:
+    """Return the cached JSON response for ``key``, building it if stale."""
+    return Response(content=await _cached_content(key, build), media_type="application/json")
+
+
 @router.get("/usage", response_model=CostUsageResponse)
 async def get_cost_usage(
     days: int = Query(30, description="Number of days to analyze", ge=1, le=365),
@@ -73,8 +309,18 @@ async def get_cost_usage(
     """
     logger.info("Cost usage analytics requested", days=days)
     
+    return await _cached_json(("usage", days), lambda: _cost_usage(days, db))
+
+
+def _cost_usage(days: int, db: Session, end_date: Optional[datetime] = None) -> dict:
+    """Build the cost usage analytics for the ``days`` days up to ``end_date``.
+    
+    The result is a plain dict shaped like CostUsageResponse, encoded to
+    JSON directly, with no model instances built only to be serialized.
+    ``end_date`` defaults to now.
+    """
     # Calculate date range
-    end_date = datetime.utcnow()
+    end_date = end_date or datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
     
@@ -82,405 +328,90 @@ async def get_cost_usage(
                 start_date=start_date.isoformat(),
                 end_date=end_date.isoformat())
     
-    # Get story costs
-    story_costs = db.query(
-        func.coalesce(func.sum(Story.estimated_cost_usd), 0).label('total_cost'),
-        func.count(Story.id).label('request_count'),
-        func.coalesce(func.sum(Story.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            Story.created_at >= start_date,
-            Story.created_at <= end_date,
-            Story.estimated_cost_usd.isnot(None)
-        )
-    ).first()
-    
-    # Get chat costs
-    chat_costs = db.query(
-        func.coalesce(func.sum(ChatMessage.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ChatMessage.id).label('request_count'),
-        func.coalesce(func.sum(ChatMessage.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ChatMessage.created_at >= start_date,
-            ChatMessage.created_at <= end_date,
-            ChatMessage.role == 'assistant',  # Only count AI responses
-            ChatMessage.estimated_cost_usd.isnot(None)
-        )
-    ).first()
+    # Daily usage covers the last 14 days at most, for better visualization
+    daily_days = min(days, 14)
+    daily_start = end_date - timedelta(days=daily_days)
     
-    # Get context prompt costs
-    context_costs = db.query(
-        func.coalesce(func.sum(ContextPromptExecution.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ContextPromptExecution.id).label('request_count'),
-        func.coalesce(func.sum(ContextPromptExecution.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ContextPromptExecution.created_at >= start_date,
-            ContextPromptExecution.created_at <= end_date,
-            ContextPromptExecution.status == 'completed',
-            ContextPromptExecution.estimated_cost_usd.isnot(None)
-        )
-    ).first()
+    # One query aggregates the billed requests of all three sources by
+    # method, model and day; the summary and the breakdowns are rolled up
+    # from its rows
+    billed = _billed_requests(start_date, end_date, daily_start)
+    rows = db.execute(
+        select(
+            billed.c.method,
+            billed.c.model,
+            billed.c.day,
+            *_cost_totals(billed)
+        ).group_by(billed.c.method, billed.c.model, billed.c.day)
+    ).all()
+    
+    totals = _empty_costs()
+    method_costs = defaultdict(_empty_costs)
+    model_costs = defaultdict(_empty_costs)
+    # Every day of the daily usage starts at zero, in date order, so days
+    # with no requests need no filling in afterwards
+    first_day = daily_start.date()
+    daily_costs = {
+        (first_day + timedelta(days=offset)).strftime('%Y-%m-%d'): _empty_costs()
+        for offset in range((end_date.date() - first_day).days + 1)
+    }
+    for method, model, day, *costs in rows:
+        _add_costs(totals, *costs)
+        _add_costs(method_costs[method], *costs)
+        if model:  # Skip null models
+            _add_costs(model_costs[model], *costs)
+        if day:
+            # SQLite date() function returns string, not date object
+            date_str = day if isinstance(day, str) else day.strftime('%Y-%m-%d')
+            if date_str in daily_costs:
+                _add_costs(daily_costs[date_str], *costs)
     
     # Calculate overall summary
-    total_cost = (float(story_costs.total_cost or 0) + 
-                  float(chat_costs.total_cost or 0) + 
-                  float(context_costs.total_cost or 0))
-    total_requests = ((story_costs.request_count or 0) + 
-                      (chat_costs.request_count or 0) + 
-                      (context_costs.request_count or 0))
-    total_tokens = ((story_costs.total_tokens or 0) + 
-                    (chat_costs.total_tokens or 0) + 
-                    (context_costs.total_tokens or 0))
-    
-    summary = CostSummary(
-        total_cost_usd=round(total_cost, 6),
-        total_requests=total_requests,
-        total_tokens=total_tokens,
-        average_cost_per_request=round(total_cost / total_requests, 6) if total_requests > 0 else 0.0,
-        average_tokens_per_request=round(total_tokens / total_requests, 2) if total_requests > 0 else 0.0
-    )
+    summary = _summary(totals)
     
     logger.info("Cost summary calculated",
-               total_cost_usd=summary.total_cost_usd,
-               total_requests=summary.total_requests,
-               total_tokens=summary.total_tokens)
-    
-    # Get cost breakdown by method
-    story_by_method = db.query(
-        Story.method,
-        func.coalesce(func.sum(Story.estimated_cost_usd), 0).label('total_cost'),
-        func.count(Story.id).label('request_count'),
-        func.coalesce(func.sum(Story.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            Story.created_at >= start_date,
-            Story.created_at <= end_date,
-            Story.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(Story.method).all()
-    
-    chat_by_method = db.query(
-        ChatConversation.method,
-        func.coalesce(func.sum(ChatMessage.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ChatMessage.id).label('request_count'),
-        func.coalesce(func.sum(ChatMessage.total_tokens), 0).label('total_tokens')
-    ).join(ChatMessage).filter(
-        and_(
-            ChatMessage.created_at >= start_date,
-            ChatMessage.created_at <= end_date,
-            ChatMessage.role == 'assistant',
-            ChatMessage.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(ChatConversation.method).all()
-    
-    context_by_method = db.query(
-        ContextPromptExecution.method,
-        func.coalesce(func.sum(ContextPromptExecution.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ContextPromptExecution.id).label('request_count'),
-        func.coalesce(func.sum(ContextPromptExecution.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ContextPromptExecution.created_at >= start_date,
-            ContextPromptExecution.created_at <= end_date,
-            ContextPromptExecution.status == 'completed',
-            ContextPromptExecution.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(ContextPromptExecution.method).all()
-    
-    # Combine method costs
-    method_costs = {}
-    for row in story_by_method:
-        method_costs[row.method] = {
-            'total_cost': float(row.total_cost or 0),
-            'request_count': row.request_count or 0,
-            'total_tokens': row.total_tokens or 0
-        }
-    
-    for row in chat_by_method:
-        if row.method in method_costs:
-            method_costs[row.method]['total_cost'] += float(row.total_cost or 0)
-            method_costs[row.method]['request_count'] += row.request_count or 0
-            method_costs[row.method]['total_tokens'] += row.total_tokens or 0
-        else:
-            method_costs[row.method] = {
-                'total_cost': float(row.total_cost or 0),
-                'request_count': row.request_count or 0,
-                'total_tokens': row.total_tokens or 0
-            }
-    
-    for row in context_by_method:
-        if row.method in method_costs:
-            method_costs[row.method]['total_cost'] += float(row.total_cost or 0)
-            method_costs[row.method]['request_count'] += row.request_count or 0
-            method_costs[row.method]['total_tokens'] += row.total_tokens or 0
-        else:
-            method_costs[row.method] = {
-                'total_cost': float(row.total_cost or 0),
-                'request_count': row.request_count or 0,
-                'total_tokens': row.total_tokens or 0
-            }
+               total_cost_usd=summary["total_cost_usd"],
+               total_requests=summary["total_requests"],
+               total_tokens=summary["total_tokens"])
     
     by_method = [
-        CostByMethod(
-            method=method,
-            total_cost_usd=round(data['total_cost'], 6),
-            request_count=data['request_count'],
-            total_tokens=data['total_tokens'],
-            average_cost_per_request=round(data['total_cost'] / data['request_count'], 6) if data['request_count'] > 0 else 0.0
-        )
-        for method, data in method_costs.items()
+        {
+            "method": method,
+            "total_cost_usd": total_cost / _MICRO_USD,
+            "request_count": request_count,
+            "total_tokens": total_tokens,
+            "average_cost_per_request": round(total_cost / request_count) / _MICRO_USD if request_count > 0 else 0.0
+        }
+        for method, (total_cost, request_count, total_tokens) in method_costs.items()
     ]
-    by_method.sort(key=lambda x: x.total_cost_usd, reverse=True)
-    
-    # Get cost breakdown by model
-    story_by_model = db.query(
-        Story.model,
-        func.coalesce(func.sum(Story.estimated_cost_usd), 0).label('total_cost'),
-        func.count(Story.id).label('request_count'),
-        func.coalesce(func.sum(Story.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            Story.created_at >= start_date,
-            Story.created_at <= end_date,
-            Story.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(Story.model).all()
-    
-    chat_by_model = db.query(
-        ChatConversation.model,
-        func.coalesce(func.sum(ChatMessage.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ChatMessage.id).label('request_count'),
-        func.coalesce(func.sum(ChatMessage.total_tokens), 0).label('total_tokens')
-    ).join(ChatMessage).filter(
-        and_(
-            ChatMessage.created_at >= start_date,
-            ChatMessage.created_at <= end_date,
-            ChatMessage.role == 'assistant',
-            ChatMessage.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(ChatConversation.model).all()
-    
-    context_by_model = db.query(
-        ContextPromptExecution.model,
-        func.coalesce(func.sum(ContextPromptExecution.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ContextPromptExecution.id).label('request_count'),
-        func.coalesce(func.sum(ContextPromptExecution.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ContextPromptExecution.created_at >= start_date,
-            ContextPromptExecution.created_at <= end_date,
-            ContextPromptExecution.status == 'completed',
-            ContextPromptExecution.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(ContextPromptExecution.model).all()
-    
-    # Combine model costs
-    model_costs = {}
-    for row in story_by_model:
-        if row.model:  # Skip null models
-            model_costs[row.model] = {
-                'total_cost': float(row.total_cost or 0),
-                'request_count': row.request_count or 0,
-                'total_tokens': row.total_tokens or 0
-            }
-    
-    for row in chat_by_model:
-        if row.model:  # Skip null models
-            if row.model in model_costs:
-                model_costs[row.model]['total_cost'] += float(row.total_cost or 0)
-                model_costs[row.model]['request_count'] += row.request_count or 0
-                model_costs[row.model]['total_tokens'] += row.total_tokens or 0
-            else:
-                model_costs[row.model] = {
-                    'total_cost': float(row.total_cost or 0),
-                    'request_count': row.request_count or 0,
-                    'total_tokens': row.total_tokens or 0
-                }
-    
-    for row in context_by_model:
-        if row.model:  # Skip null models
-            if row.model in model_costs:
-                model_costs[row.model]['total_cost'] += float(row.total_cost or 0)
-                model_costs[row.model]['request_count'] += row.request_count or 0
-                model_costs[row.model]['total_tokens'] += row.total_tokens or 0
-            else:
-                model_costs[row.model] = {
-                    'total_cost': float(row.total_cost or 0),
-                    'request_count': row.request_count or 0,
-                    'total_tokens': row.total_tokens or 0
-                }
+    by_method.sort(key=itemgetter("total_cost_usd"), reverse=True)
     
     by_model = [
-        CostByModel(
-            model=model,
-            total_cost_usd=round(data['total_cost'], 6),
-            request_count=data['request_count'],
-            total_tokens=data['total_tokens'],
-            average_cost_per_request=round(data['total_cost'] / data['request_count'], 6) if data['request_count'] > 0 else 0.0
-        )
-        for model, data in model_costs.items()
+        {
+            "model": model,
+            "total_cost_usd": total_cost / _MICRO_USD,
+            "request_count": request_count,
+            "total_tokens": total_tokens,
+            "average_cost_per_request": round(total_cost / request_count) / _MICRO_USD if request_count > 0 else 0.0
+        }
+        for model, (total_cost, request_count, total_tokens) in model_costs.items()
     ]
-    by_model.sort(key=lambda x: x.total_cost_usd, reverse=True)
-    
-    # Get daily usage (last 14 days for better visualization)
-    daily_days = min(days, 14)
-    daily_start = end_date - timedelta(days=daily_days)
-    
-    # Story daily costs
-    story_daily = db.query(
-        func.date(Story.created_at).label('date'),
-        func.coalesce(func.sum(Story.estimated_cost_usd), 0).label('total_cost'),
-        func.count(Story.id).label('request_count'),
-        func.coalesce(func.sum(Story.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            Story.created_at >= daily_start,
-            Story.created_at <= end_date,
-            Story.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(func.date(Story.created_at)).all()
-    
-    # Chat daily costs
-    chat_daily = db.query(
-        func.date(ChatMessage.created_at).label('date'),
-        func.coalesce(func.sum(ChatMessage.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ChatMessage.id).label('request_count'),
-        func.coalesce(func.sum(ChatMessage.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ChatMessage.created_at >= daily_start,
-            ChatMessage.created_at <= end_date,
-            ChatMessage.role == 'assistant',
-            ChatMessage.estimated_cost_usd.isnot(None)
-        )
-    ).group_by(func.date(ChatMessage.created_at)).all()
-    
-    # Combine daily costs
-    daily_costs = {}
-    for row in story_daily:
-        # SQLite date() function returns string, not date object
-        date_str = str(row.date) if isinstance(row.date, str) else row.date.strftime('%Y-%m-%d')
-        daily_costs[date_str] = {
-            'total_cost': float(row.total_cost or 0),
-            'request_count': row.request_count or 0,
-            'total_tokens': row.total_tokens or 0
+    by_model.sort(key=itemgetter("total_cost_usd"), reverse=True)
+    
+    daily_usage = [
+        {
+            "date": date_str,
+            "total_cost_usd": total_cost / _MICRO_USD,
+            "request_count": request_count,
+            "total_tokens": total_tokens
         }
+        for date_str, (total_cost, request_count, total_tokens) in daily_costs.items()
+    ]
     
-    for row in chat_daily:
-        # SQLite date() function returns string, not date object
-        date_str = str(row.date) if isinstance(row.date, str) else row.date.strftime('%Y-%m-%d')
-        if date_str in daily_costs:
-            daily_costs[date_str]['total_cost'] += float(row.total_cost or 0)
-            daily_costs[date_str]['request_count'] += row.request_count or 0
-            daily_costs[date_str]['total_tokens'] += row.total_tokens or 0
-        else:
-            daily_costs[date_str] = {
-                'total_cost': float(row.total_cost or 0),
-                'request_count': row.request_count or 0,
-                'total_tokens': row.total_tokens or 0
-            }
-    
-    # Fill in missing dates with zero costs
-    current_date = daily_start.date()
-    end_date_only = end_date.date()
-    daily_usage = []
-    
-    while current_date <= end_date_only:
-        date_str = current_date.strftime('%Y-%m-%d')
-        if date_str in daily_costs:
-            daily_usage.append(DailyCostUsage(
-                date=date_str,
-                total_cost_usd=round(daily_costs[date_str]['total_cost'], 6),
-                request_count=daily_costs[date_str]['request_count'],
-                total_tokens=daily_costs[date_str]['total_tokens']
-            ))
-        else:
-            daily_usage.append(DailyCostUsage(
-                date=date_str,
-                total_cost_usd=0.0,
-                request_count=0,
-                total_tokens=0
-            ))
-        current_date += timedelta(days=1)
-    
-    # Get recent high-cost requests (top 10)
-    recent_stories = db.query(Story).filter(
-        and_(
-            Story.created_at >= start_date,
-            Story.created_at <= end_date,
-            Story.estimated_cost_usd.isnot(None)
-        )
-    ).order_by(desc(Story.estimated_cost_usd)).limit(5).all()
-    
-    recent_chats = db.query(ChatMessage, ChatConversation.title).join(
-        ChatConversation
-    ).filter(
-        and_(
-            ChatMessage.created_at >= start_date,
-            ChatMessage.created_at <= end_date,
-            ChatMessage.role == 'assistant',
-            ChatMessage.estimated_cost_usd.isnot(None)
-        )
-    ).order_by(desc(ChatMessage.estimated_cost_usd)).limit(5).all()
-    
-    recent_context = db.query(ContextPromptExecution).filter(
-        and_(
-            ContextPromptExecution.created_at >= start_date,
-            ContextPromptExecution.created_at <= end_date,
-            ContextPromptExecution.status == 'completed',
-            ContextPromptExecution.estimated_cost_usd.isnot(None)
-        )
-    ).order_by(desc(ContextPromptExecution.estimated_cost_usd)).limit(5).all()
-    
-    recent_requests = []
-    
-    # Add story requests
-    for story in recent_stories:
-        recent_requests.append(RecentRequest(
-            id=story.id,
-            type="story",
-            method=story.method,
-            model=story.model or "unknown",
-            cost_usd=float(story.estimated_cost_usd),
-            tokens_used=story.total_tokens or 0,
-            created_at=story.created_at,
-            primary_character=story.primary_character,
-            conversation_title=None
-        ))
-    
-    # Add chat requests
-    for message, conv_title in recent_chats:
-        recent_requests.append(RecentRequest(
-            id=message.id,
-            type="chat",
-            method=message.conversation.method,
-            model=message.conversation.model or "unknown",
-            cost_usd=float(message.estimated_cost_usd),
-            tokens_used=message.total_tokens or 0,
-            created_at=message.created_at,
-            primary_character=None,
-            conversation_title=conv_title
-        ))
-    
-    # Add context prompt requests
-    for context in recent_context:
-        recent_requests.append(RecentRequest(
-            id=context.id,
-            type="context",
-            method=context.method,
-            model=context.model or "unknown",
-            cost_usd=float(context.estimated_cost_usd),
-            tokens_used=context.total_tokens or 0,
-            created_at=context.created_at,
-            primary_character=context.original_filename,  # Use filename as identifier
-            conversation_title=None
-        ))
-    
-    # Sort by cost and take top 10
-    recent_requests.sort(key=lambda x: x.cost_usd, reverse=True)
-    recent_requests = recent_requests[:10]
+    # Get recent high-cost requests (top 10), merged and ranked in SQL
+    recent_requests = [
+        dict(row) for row in db.execute(_top_billed_requests(start_date, end_date, 10)).mappings()
+    ]
     
     logger.info("Cost usage analytics completed",
                methods_analyzed=len(by_method),
@@ -488,14 +419,80 @@ async def get_cost_usage(
                daily_points=len(daily_usage),
                recent_requests=len(recent_requests))
     
-    return CostUsageResponse(
-        summary=summary,
-        by_method=by_method,
-        by_model=by_model,
-        daily_usage=daily_usage,
-        recent_requests=recent_requests,
-        date_range=date_range
-    )
+    return {
+        "summary": summary,
+        "by_method": by_method,
+        "by_model": by_model,
+        "daily_usage": daily_usage,
+        "recent_requests": recent_requests,
+        "date_range": date_range
+    }
+
+
+@router.get("/usage/stream")
+async def stream_cost_usage(
+    days: int = Query(30, description="Number of days to analyze", ge=1, le=365),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """Get the cost usage analytics as newline-delimited JSON.
+    
+    Sends the sections of /usage as one JSON object per line, starting with
+    ``{"summary": ...}``, so a dashboard can show the totals before the
+    breakdowns for a long window arrive. The following lines hold
+    ``by_method``, ``by_model``, ``daily_usage``, ``recent_requests`` and
+    ``date_range`` in turn. A fresh /usage response is streamed from the
+    cache; otherwise the summary is sent as soon as its aggregate is done,
+    and the breakdowns, built for the same window, are cached for /usage.
+    If another request built that /usage response in the meantime, its
+    breakdowns are sent after its own summary, which replaces the first.
+    
+    Args:
+        days: Number of days to analyze (1-365). Defaults to 30.
+        db: Database session (injected).
+        
+    Returns:
+        StreamingResponse of application/x-ndjson lines.
+    """
+    logger.info("Cost usage stream requested", days=days)
+    
+    return StreamingResponse(_cost_usage_lines(days, db), media_type="application/x-ndjson")
+
+
+async def _cost_usage_lines(days: int, db: Session) -> AsyncIterator[bytes]:
+    """Yield the cost usage analytics one section per line.
+    
+    The session is closed when the stream ends: the request's dependency
+    cleanup may already have run by the time the body is sent.
+    """
+    try:
+        key = ("usage", days)
+        content = _fresh_content(key)
+        sent = set()
+        if content is None:
+            # Build the breakdowns for the summary's window, so the two
+            # agree. The entry may instead come from another request that
+            # built it while this one waited; that entry's summary covers
+            # its own window and is sent again with it.
+            end_date = datetime.utcnow()
+            summary = await run_in_threadpool(_cost_summary, days, db, end_date)
+            yield orjson.dumps({"summary": summary}) + b"\n"
+            
+            built = False
+            
+            def build() -> dict:
+                nonlocal built
+                built = True
+                return _cost_usage(days, db, end_date)
+            
+            content = await _cached_content(key, build)
+            if built:
+                sent.add("summary")
+        
+        for section, value in orjson.loads(content).items():
+            if section not in sent:
+                yield orjson.dumps({section: value}) + b"\n"
+    finally:
+        await run_in_threadpool(db.close)
 
 
 @router.get("/summary", response_model=CostSummary)
@@ -517,69 +514,21 @@ async def get_cost_summary(
     """
     logger.info("Cost summary requested", days=days)
     
+    return await _cached_json(("summary", days), lambda: _cost_summary(days, db))
+
+
+def _cost_summary(days: int, db: Session, end_date: Optional[datetime] = None) -> dict:
+    """Build the cost summary for the ``days`` days up to ``end_date`` (default now), shaped like CostSummary."""
     # Calculate date range
-    end_date = datetime.utcnow()
+    end_date = end_date or datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    # Get story costs
-    story_costs = db.query(
-        func.coalesce(func.sum(Story.estimated_cost_usd), 0).label('total_cost'),
-        func.count(Story.id).label('request_count'),
-        func.coalesce(func.sum(Story.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            Story.created_at >= start_date,
-            Story.created_at <= end_date,
-            Story.estimated_cost_usd.isnot(None)
-        )
-    ).first()
-    
-    # Get chat costs
-    chat_costs = db.query(
-        func.coalesce(func.sum(ChatMessage.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ChatMessage.id).label('request_count'),
-        func.coalesce(func.sum(ChatMessage.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ChatMessage.created_at >= start_date,
-            ChatMessage.created_at <= end_date,
-            ChatMessage.role == 'assistant',
-            ChatMessage.estimated_cost_usd.isnot(None)
-        )
-    ).first()
+    # One aggregate over the billed requests of all three sources
+    billed = _billed_requests(start_date, end_date, end_date)
+    totals = _empty_costs()
+    _add_costs(totals, *db.execute(select(*_cost_totals(billed))).one())
     
-    # Get context prompt costs
-    context_costs = db.query(
-        func.coalesce(func.sum(ContextPromptExecution.estimated_cost_usd), 0).label('total_cost'),
-        func.count(ContextPromptExecution.id).label('request_count'),
-        func.coalesce(func.sum(ContextPromptExecution.total_tokens), 0).label('total_tokens')
-    ).filter(
-        and_(
-            ContextPromptExecution.created_at >= start_date,
-            ContextPromptExecution.created_at <= end_date,
-            ContextPromptExecution.status == 'completed',
-            ContextPromptExecution.estimated_cost_usd.isnot(None)
-        )
-    ).first()
-    
-    # Calculate summary
-    total_cost = (float(story_costs.total_cost or 0) + 
-                  float(chat_costs.total_cost or 0) + 
-                  float(context_costs.total_cost or 0))
-    total_requests = ((story_costs.request_count or 0) + 
-                      (chat_costs.request_count or 0) + 
-                      (context_costs.request_count or 0))
-    total_tokens = ((story_costs.total_tokens or 0) + 
-                    (chat_costs.total_tokens or 0) + 
-                    (context_costs.total_tokens or 0))
-    
-    return CostSummary(
-        total_cost_usd=round(total_cost, 6),
-        total_requests=total_requests,
-        total_tokens=total_tokens,
-        average_cost_per_request=round(total_cost / total_requests, 6) if total_requests > 0 else 0.0,
-        average_tokens_per_request=round(total_tokens / total_requests, 2) if total_requests > 0 else 0.0
-    )
+    return _summary(totals)
 
 
 @router.delete("/usage")
@@ -605,12 +554,16 @@ async def clear_all_cost_data(
         total_count = story_count + chat_message_count + chat_conversation_count + context_count
         
         # Delete all records with cost data
-        # For conversations, let cascade handle the messages automatically
+        # Messages go before their conversations, since databases created
+        # before the ON DELETE CASCADE was declared do not cascade them
+        db.query(ChatMessage).delete()
         deleted_conversations = db.query(ChatConversation).delete()
         deleted_contexts = db.query(ContextPromptExecution).delete()
         deleted_stories = db.query(Story).delete()
         
         db.commit()
+        # Bulk deletes fire no flush events; drop the cached analytics here
+        billed_data_changed()
         
         # After commit, count remaining records to verify complete deletion
         remaining_stories = db.query(Story).count()
@@ -696,8 +649,10 @@ async def get_all_transactions(
             generation_time_ms=story.generation_time_ms
         ))
     
-    # Get all chat messages
-    chat_messages = db.query(ChatMessage, ChatConversation).join(
+    # Get all chat messages, with just the conversation columns they report
+    chat_messages = db.query(
+        ChatMessage, ChatConversation.method, ChatConversation.model, ChatConversation.title
+    ).join(
         ChatConversation
     ).filter(
         and_(
@@ -708,16 +663,16 @@ async def get_all_transactions(
         )
     ).order_by(desc(ChatMessage.created_at)).all()
     
-    for msg, conv in chat_messages:
+    for msg, conv_method, conv_model, conv_title in chat_messages:
         transactions.append(Transaction(
             id=msg.id,
             type="chat",
-            method=conv.method,
-            model=conv.model or "unknown",
+            method=conv_method,
+            model=conv_model or "unknown",
             created_at=msg.created_at,
             transaction_guid=msg.transaction_guid,
             request_id=msg.request_id,
-            conversation_title=conv.title,
+            conversation_title=conv_title,
             content_preview=msg.content[:100] + "..." if msg.content else None,
             input_tokens=msg.input_tokens,
             output_tokens=msg.output_tokens,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, Optional, List
 import time
 from sqlalchemy.orm import Session
@@ -44,7 +45,7 @@ def get_service(service_name: str):
         True
     """
     if _services[service_name] is None:
-        logger.info(f"Initializing {service_name} service")
+        logger.info("Initializing story service", service=service_name)
         if service_name == "semantic_kernel":
             _services[service_name] = SemanticKernelService()
         elif service_name == "langchain":
@@ -155,7 +156,7 @@ async def generate_story_handler(
         )
         
         # Database operations with retry protection
-        story_record = await _save_story_to_db(db, story_record)
+        story_record = await run_in_threadpool(_save_story_to_db, db, story_record)
         
         db_save_time = (time.time() - db_start_time) * 1000
         total_time = (time.time() - start_time) * 1000
@@ -204,9 +205,12 @@ async def generate_story_handler(
         raise
 
 @retry_database_ops
-async def _save_story_to_db(db: Session, story_record: Story) -> Story:
+def _save_story_to_db(db: Session, story_record: Story) -> Story:
     """Save story to database with retry protection.
     
+    Blocking; the story handler runs it in the threadpool so the commit
+    and any retry waits stay off the event loop.
+    
     Args:
         db: Database session
         story_record: Story record to save
@@ -373,7 +377,7 @@ async def generate_story_langgraph(
 
 @router.get("/stories", response_model=List[StoryList])
 @retry_database_ops
-async def get_stories(
+def get_stories(
     skip: int = 0,
     limit: int = 10,
     db: Session = Depends(get_db)
@@ -424,7 +428,7 @@ async def get_stories(
 
 @router.get("/stories/{story_id}", response_model=StoryDB)
 @retry_database_ops
-async def get_story(
+def get_story(
     story_id: int,
     db: Session = Depends(get_db)
 ):
@@ -461,7 +465,7 @@ async def get_story(
     return StoryDB.from_orm(story)
 
 @router.get("/stories/search/characters", response_model=List[StoryList])
-async def search_stories_by_characters(
+def search_stories_by_characters(
     character: str,
     db: Session = Depends(get_db)
 ):
@@ -525,7 +529,7 @@ async def search_stories_by_characters(
 
 
 @router.delete("/stories")
-async def delete_all_stories(
+def delete_all_stories(
     db: Session = Depends(get_db)
 ):
     """Delete all generated stories.
@@ -538,11 +542,8 @@ async def delete_all_stories(
     logger.info("Delete all stories request received")
     
     try:
-        # Count stories before deletion
-        story_count = db.query(Story).count()
-        
-        # Delete all stories
-        db.query(Story).delete()
+        # One bulk delete; its row count is the number of stories removed
+        story_count = db.query(Story).delete(synchronize_session=False)
         db.commit()
         
         logger.info("All stories deleted successfully", deleted_count=story_count)
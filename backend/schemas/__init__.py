@@ -1,7 +1,7 @@
 from .story import StoryRequest, StoryResponse, StoryDB, StoryList
-from .chat import ChatMessageRequest, ChatMessageResponse, ChatConversationResponse, ChatConversationList, ChatResponse
+from .chat import ChatMessageRequest, ChatMessageResponse, ChatConversationSummary, ChatConversationResponse, ChatConversationList, ChatResponse
 
 __all__ = [
     "StoryRequest", "StoryResponse", "StoryDB", "StoryList",
-    "ChatMessageRequest", "ChatMessageResponse", "ChatConversationResponse", "ChatConversationList", "ChatResponse"
+    "ChatMessageRequest", "ChatMessageResponse", "ChatConversationSummary", "ChatConversationResponse", "ChatConversationList", "ChatResponse"
 ]
\ No newline at end of file
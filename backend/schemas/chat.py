@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -9,8 +9,17 @@ class ChatMessageRequest(BaseModel):
     conversation_id: Optional[int] = Field(None, description="ID of existing conversation, or None for new")
 
 
-class ChatMessageResponse(BaseModel):
-    """Response model for chat message"""
+class _UTCTimestampModel(BaseModel):
+    """Base for responses whose timestamps are naive UTC datetimes"""
+
+    @field_serializer('created_at', 'updated_at', check_fields=False)
+    def serialize_timestamp(self, v: datetime) -> str:
+        """Serialize naive UTC timestamps with a 'Z' suffix"""
+        return v.isoformat() + 'Z'
+
+
+class ChatMessageResponse(_UTCTimestampModel):
+    """Response model for chat message, validated directly from a ChatMessage row"""
     id: int
     role: str
     content: str
@@ -18,7 +27,7 @@ class ChatMessageResponse(BaseModel):
     input_tokens: Optional[int]
     output_tokens: Optional[int] 
     total_tokens: Optional[int]
-    created_at: str
+    created_at: datetime
     estimated_cost_usd: Optional[float]
     input_cost_per_1k_tokens: Optional[float]
     output_cost_per_1k_tokens: Optional[float]
@@ -26,22 +35,32 @@ class ChatMessageResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator('estimated_cost_usd', 'input_cost_per_1k_tokens', 'output_cost_per_1k_tokens', mode='before')
+    @classmethod
+    def zero_cost_as_none(cls, v):
+        """Report zero or missing costs as null"""
+        return v or None
+
 
-class ChatConversationResponse(BaseModel):
-    """Response model for chat conversation"""
+class ChatConversationSummary(_UTCTimestampModel):
+    """Conversation metadata, without the messages, returned with each chat turn"""
     id: int
     title: str
     method: str
     model: Optional[str]
-    created_at: str
-    updated_at: str
-    messages: List[ChatMessageResponse]
+    created_at: datetime
+    updated_at: datetime
 
     class Config:
         from_attributes = True
 
 
-class ChatConversationList(BaseModel):
+class ChatConversationResponse(ChatConversationSummary):
+    """Response model for chat conversation, validated directly from a ChatConversation row"""
+    messages: List[ChatMessageResponse]
+
+
+class ChatConversationList(_UTCTimestampModel):
     """List view of chat conversations"""
     id: int
     title: str
@@ -49,12 +68,12 @@ class ChatConversationList(BaseModel):
     model: Optional[str]
     message_count: int
     last_message_preview: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 
 class ChatResponse(BaseModel):
     """Response model for chat API"""
-    conversation: ChatConversationResponse
+    conversation: ChatConversationSummary
     message: ChatMessageResponse
     request_id: Optional[str]
\ No newline at end of file
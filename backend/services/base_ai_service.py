@@ -21,7 +21,8 @@ Class Hierarchy:
             └── LangGraphContextService
 """
 
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 import asyncio
 import time
 from openai import AsyncOpenAI, APIError, APIConnectionError, RateLimitError
@@ -41,6 +42,40 @@ from exceptions import (
 
 logger = get_logger(__name__)
 
+@lru_cache(maxsize=None)
+def _model_rates(model: str) -> Tuple[float, float]:
+    """Per-1k-token input and output prices for a model, as floats.
+    
+    The configured model doesn't change at runtime, so its pricing is
+    looked up and converted once instead of on every API call.
+    """
+    pricing = get_model_pricing(model)
+    return float(pricing["input_cost_per_1k"]), float(pricing["output_cost_per_1k"])
+
+def _usage_info(model: str, input_tokens: int, output_tokens: int, total_tokens: int,
+                execution_time_ms: float) -> Dict[str, Any]:
+    """Token usage, cost and timing for one API call, as returned by the services."""
+    # Calculate cost information using pricing module
+    input_cost, output_cost, total_cost = calculate_cost(model, input_tokens, output_tokens)
+    input_cost_per_1k, output_cost_per_1k = _model_rates(model)
+    
+    return {
+        # Token usage information
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": total_tokens,
+        
+        # Cost information (converted to float for JSON serialization)
+        "estimated_cost_usd": float(total_cost),
+        "input_cost": float(input_cost),
+        "output_cost": float(output_cost),
+        "input_cost_per_1k_tokens": input_cost_per_1k,
+        "output_cost_per_1k_tokens": output_cost_per_1k,
+        
+        # Performance metrics
+        "execution_time_ms": round(execution_time_ms, 2)
+    }
+
 class BaseAIService(TransactionAware):
     """Base class for all AI-powered services.
     
@@ -79,6 +114,9 @@ class BaseAIService(TransactionAware):
     def __init__(self):
         self._client: Optional[AsyncOpenAI] = None
         self._http_client: Optional[httpx.AsyncClient] = None
+        # Services are shared by concurrent requests; the lock makes sure
+        # only the first of them creates the client
+        self._client_lock = asyncio.Lock()
         self.service_name = self.__class__.__name__
         self.provider_name = settings.provider_name
         # Expose custom_settings to all services for header generation and custom logic
@@ -88,7 +126,8 @@ class BaseAIService(TransactionAware):
         """Ensure the OpenAI client is initialized.
         
         Creates the client on first access to avoid initialization
-        overhead during service creation.
+        overhead during service creation. Concurrent first calls wait
+        for the same client rather than each creating one.
         
         Returns:
             An AsyncOpenAI client instance.
@@ -97,7 +136,9 @@ class BaseAIService(TransactionAware):
             APIKeyError: If client initialization fails.
         """
         if self._client is None:
-            self._client = await self._create_client()
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = await self._create_client()
         return self._client
     
     @retry_network_ops
@@ -181,7 +222,7 @@ class BaseAIService(TransactionAware):
                     
             else:
                 # Generic provider - minimal headers
-                logger.info(f"Creating headers for generic provider '{settings.provider_name}'")
+                logger.info("Creating headers for generic provider", provider=settings.provider_name)
                 # Most providers handle auth via the api_key parameter
                 # Add minimal app identification
                 headers["X-App-Name"] = settings.app_name
@@ -190,7 +231,7 @@ class BaseAIService(TransactionAware):
             # Log the headers being used (mask sensitive data)
             safe_headers = {k: v if k.lower() not in ['authorization', 'x-api-key', 'api-key'] 
                            else '***' for k, v in headers.items()}
-            logger.info(f"Created headers for provider '{settings.provider_name}'", headers=safe_headers)
+            logger.info("Created headers for provider", provider=settings.provider_name, headers=safe_headers)
             
             if settings.provider_api_type == "openai":
                 # Use OpenAI-compatible client
@@ -323,27 +364,8 @@ class BaseAIService(TransactionAware):
             output_tokens = response.usage.completion_tokens if response.usage else 0
             total_tokens = response.usage.total_tokens if response.usage else 0
             
-            # Calculate cost information using pricing module
-            input_cost, output_cost, total_cost = calculate_cost(model, input_tokens, output_tokens)
-            pricing = get_model_pricing(model)
-            
             # Prepare comprehensive usage information including costs
-            usage_info = {
-                # Token usage information
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "total_tokens": total_tokens,
-                
-                # Cost information (converted to float for JSON serialization)
-                "estimated_cost_usd": float(total_cost),
-                "input_cost": float(input_cost),
-                "output_cost": float(output_cost),
-                "input_cost_per_1k_tokens": float(pricing["input_cost_per_1k"]),
-                "output_cost_per_1k_tokens": float(pricing["output_cost_per_1k"]),
-                
-                # Performance metrics
-                "execution_time_ms": round(execution_time_ms, 2)
-            }
+            usage_info = _usage_info(model, input_tokens, output_tokens, total_tokens, execution_time_ms)
             
             logger.info("API call successful",
                        service=self.service_name,
@@ -358,37 +380,127 @@ class BaseAIService(TransactionAware):
             
             return content or "", usage_info
             
-        except asyncio.TimeoutError:
+        except Exception as e:
+            raise self._api_error(e)
+    
+    async def _stream_api(self, messages: List[Dict[str, str]], usage_info: Dict[str, Any],
+                          **kwargs) -> AsyncIterator[str]:
+        """Call OpenAI API with a streamed response.
+        
+        Yields the response text as the provider sends it, so callers can
+        pass it on before generation finishes. Once the stream ends,
+        ``usage_info`` is filled in with the fields ``_call_api`` returns;
+        token counts are 0 if the provider reports no usage for streams.
+        
+        Streams are not retried: after the first chunk a retry would repeat
+        text the caller has already passed on.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            usage_info: Dictionary to fill with token counts, cost and timing.
+            **kwargs: Optional parameters, as for ``_call_api``.
+            
+        Yields:
+            The response text, chunk by chunk.
+            
+        Raises:
+            APIRateLimitError: If rate limits are exceeded.
+            CustomAPIConnectionError: For connection failures, timeouts and
+                other API errors.
+        """
+        try:
+            model = settings.provider_model
+            
+            params = {
+                "model": model,
+                "messages": messages,
+                "temperature": kwargs.get("temperature", 0.7),
+                "max_tokens": kwargs.get("max_tokens", 500),
+                "timeout": settings.openai_timeout,
+                "stream": True,
+                # Usage comes in a final chunk with no choices
+                "stream_options": {"include_usage": True}
+            }
+            
+            logger.debug("Streaming from provider API",
+                        provider=settings.provider_name,
+                        service=self.service_name,
+                        model=model,
+                        message_count=len(messages))
+            
+            start_time = time.time()
+            client = await self._ensure_client()
+            stream = await client.chat.completions.create(**params)
+            
+            usage = None
+            response_length = 0
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    content = chunk.choices[0].delta.content
+                    response_length += len(content)
+                    yield content
+            execution_time_ms = (time.time() - start_time) * 1000
+            
+            usage_info.update(_usage_info(
+                model,
+                usage.prompt_tokens if usage else 0,
+                usage.completion_tokens if usage else 0,
+                usage.total_tokens if usage else 0,
+                execution_time_ms
+            ))
+            
+            logger.info("API stream completed",
+                       service=self.service_name,
+                       provider=settings.provider_name,
+                       model=model,
+                       response_length=response_length,
+                       execution_time_ms=usage_info["execution_time_ms"],
+                       input_tokens=usage_info["input_tokens"],
+                       output_tokens=usage_info["output_tokens"],
+                       total_tokens=usage_info["total_tokens"],
+                       estimated_cost_usd=usage_info["estimated_cost_usd"])
+            
+        except Exception as e:
+            raise self._api_error(e)
+    
+    def _api_error(self, error: Exception) -> Exception:
+        """Log a failed API call and return the exception to raise for it.
+        
+        Provider errors are translated to the application's exceptions;
+        anything else is returned unchanged.
+        """
+        if isinstance(error, asyncio.TimeoutError):
             logger.error("API call timed out",
                         service=self.service_name,
                         timeout=settings.openai_timeout)
-            raise TimeoutError(f"API call timed out after {settings.openai_timeout} seconds")
+            return TimeoutError(f"API call timed out after {settings.openai_timeout} seconds")
         
-        except RateLimitError as e:
+        if isinstance(error, RateLimitError):
             logger.error("API rate limit exceeded",
                         service=self.service_name,
-                        error=str(e))
-            raise APIRateLimitError("API rate limit exceeded. Please try again later.")
+                        error=str(error))
+            return APIRateLimitError("API rate limit exceeded. Please try again later.")
         
-        except APIConnectionError as e:
+        if isinstance(error, APIConnectionError):
             logger.error("API connection failed",
                         service=self.service_name,
-                        error=str(e))
-            raise CustomAPIConnectionError(f"Failed to connect to API: {str(e)}")
+                        error=str(error))
+            return CustomAPIConnectionError(f"Failed to connect to API: {str(error)}")
         
-        except APIError as e:
+        if isinstance(error, APIError):
             logger.error("API error occurred",
                         service=self.service_name,
-                        error=str(e),
-                        error_type=type(e).__name__)
-            raise CustomAPIConnectionError(f"API error: {str(e)}")
+                        error=str(error),
+                        error_type=type(error).__name__)
+            return CustomAPIConnectionError(f"API error: {str(error)}")
         
-        except Exception as e:
-            logger.error("Unexpected error in API call",
-                        service=self.service_name,
-                        error=str(e),
-                        error_type=type(e).__name__)
-            raise
+        logger.error("Unexpected error in API call",
+                    service=self.service_name,
+                    error=str(error),
+                    error_type=type(error).__name__)
+        return error
     
     @retry_network_ops
     async def close(self):
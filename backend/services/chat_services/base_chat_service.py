@@ -1,6 +1,7 @@
 """Base chat service for conversational AI capabilities."""
 
-from typing import List, Dict, Any
+from functools import cached_property
+from typing import AsyncIterator, List, Dict, Any
 from ..base_ai_service import BaseAIService
 from prompts.chat_prompts import get_semantic_kernel_chat_prompt
 from logging_config import get_logger
@@ -74,22 +75,7 @@ class ChatService(BaseAIService):
             ... )
         """
         
-        # Build conversation context
-        messages = []
-        
-        # Add system message for chat context
-        system_message = {
-            "role": "system", 
-            "content": self._get_chat_system_prompt()
-        }
-        messages.append(system_message)
-        
-        # Add conversation history
-        if conversation_history:
-            messages.extend(conversation_history)
-        
-        # Add current user message
-        messages.append({"role": "user", "content": message})
+        messages = self._chat_messages(message, conversation_history)
         
         logger.info("Sending chat message",
                    service=self.service_name,
@@ -109,6 +95,54 @@ class ChatService(BaseAIService):
         
         return response, usage_info
     
+    async def stream_message(self, message: str, conversation_history: List[Dict[str, str]],
+                             usage_info: Dict[str, Any]) -> AsyncIterator[str]:
+        """Send a message and stream the AI response as it is generated.
+        
+        Builds the same context as ``send_message``. The response text is
+        yielded in chunks; once the stream ends, ``usage_info`` holds the
+        same fields ``send_message`` returns.
+        
+        Args:
+            message: The user's message text.
+            conversation_history: Previous messages, as for ``send_message``.
+            usage_info: Dictionary to fill with token usage and cost.
+            
+        Yields:
+            The AI's response text, chunk by chunk.
+            
+        Examples:
+            >>> usage = {}
+            >>> async for chunk in service.stream_message("Hello!", [], usage):
+            ...     print(chunk, end="")
+        """
+        messages = self._chat_messages(message, conversation_history)
+        
+        logger.info("Streaming chat message",
+                   service=self.service_name,
+                   message_length=len(message),
+                   context_length=len(messages))
+        
+        async for chunk in self._stream_api(messages, usage_info):
+            yield chunk
+    
+    def _chat_messages(self, message: str, conversation_history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build the conversation context: system message, history, then the user message."""
+        messages = [self._system_message]
+        if conversation_history:
+            messages.extend(conversation_history)
+        messages.append({"role": "user", "content": message})
+        return messages
+    
+    @cached_property
+    def _system_message(self) -> Dict[str, str]:
+        """The system message sent first on every chat turn.
+        
+        Built once per service instance; it is only read when the request
+        payload is serialized, so the same dict is shared by every turn.
+        """
+        return {"role": "system", "content": self._get_chat_system_prompt()}
+    
     def _get_chat_system_prompt(self) -> str:
         """Get the system prompt for chat context.
         
@@ -36,16 +36,26 @@ Usage Examples:
 
 from contextvars import ContextVar
 from typing import Optional
-import uuid
+from os import urandom
 from contextlib import contextmanager
 
 # Thread-safe context variable for storing transaction GUID
 _transaction_guid_var: ContextVar[Optional[str]] = ContextVar('transaction_guid', default=None)
 
+# Context variable for the ID of the HTTP request being handled
+_request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+
+# RFC 4122 variant nibble (0b10xx) for each random hex digit
+_VARIANT_NIBBLES = "89ab" * 4
+
 
 def generate_transaction_guid() -> str:
     """Generate a new UUID4 transaction GUID.
     
+    Formats ``os.urandom`` hex directly rather than building a ``uuid.UUID``,
+    which keeps this cheap enough to call several times per request.
+    
     Returns:
         str: A new UUID4 string in standard format (e.g., '550e8400-e29b-41d4-a716-446655440000')
         
@@ -56,7 +66,9 @@ def generate_transaction_guid() -> str:
         >>> '-' in guid
         True
     """
-    return str(uuid.uuid4())
+    h = urandom(16).hex()
+    # Set the version (4) and RFC 4122 variant nibbles
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_VARIANT_NIBBLES[int(h[16], 16)]}{h[17:20]}-{h[20:]}"
 
 
 def get_current_transaction_guid() -> Optional[str]:
@@ -215,6 +227,43 @@ def transaction_context(guid: Optional[str] = None):
         reset_transaction_guid(token)
 
 
+def get_current_request_id() -> Optional[str]:
+    """Get the ID of the HTTP request being handled.
+    
+    The request ID is set by the HTTP middleware for the lifetime of each
+    request, so code anywhere in the call tree can read it without the
+    request object being passed down.
+    
+    Returns:
+        Optional[str]: The current request ID, or None outside a request
+        
+    Examples:
+        >>> with request_id_context("req-123"):
+        ...     get_current_request_id()
+        'req-123'
+        >>> get_current_request_id() is None
+        True
+    """
+    return _request_id_var.get()
+
+
+@contextmanager
+def request_id_context(request_id: str):
+    """Context manager that sets the current request ID for a block.
+    
+    Args:
+        request_id: The ID of the request being handled
+        
+    Yields:
+        str: The request ID that was set for this context
+    """
+    token = _request_id_var.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id_var.reset(token)
+
+
 # Convenience class for property-based access
 class TransactionAware:
     """Mixin class providing transaction GUID property access.
@@ -684,8 +684,10 @@ class StoryGenerator {
             }
 
             const data = await response.json();
+            const isNewConversation = !this.currentConversation;
             
-            // Update current conversation
+            // Update current conversation (metadata only; messages are
+            // loaded from the conversation endpoint when it is opened)
             this.currentConversation = data.conversation;
             
             // Add AI response to UI
@@ -697,7 +699,7 @@ class StoryGenerator {
             this.addMessageToUI(data.message.content, 'assistant', data.message.generation_time_ms, tokenInfo);
             
             // Update conversation title if this was a new conversation
-            if (this.currentConversation.messages.length === 2) {
+            if (isNewConversation) {
                 document.getElementById('chatTitle').textContent = this.currentConversation.title;
                 this.loadConversations(); // Refresh sidebar
             }
@@ -284,6 +284,512 @@ class TestConversationManagementEndpoints:
             assert response.status_code == 404
 
 
+@pytest.mark.api
+class TestChatServiceRegistry:
+    """Test the shared chat service instances."""
+    
+    def test_services_are_shared_singletons(self):
+        """Test that each lookup returns the instance built at import."""
+        from routes.chat_routes import get_chat_service
+        from services.chat_services import LangChainChatService
+        
+        service = get_chat_service("langchain")
+        
+        assert isinstance(service, LangChainChatService)
+        assert get_chat_service("langchain") is service
+        with pytest.raises(KeyError):
+            get_chat_service("unknown")
+
+
+@pytest.mark.api
+class TestConversationTitle:
+    """Test titles generated from the first message."""
+
+    @pytest.mark.parametrize("message,title", [
+        ("Hello, how are you?", "Hello, how are you?"),
+        ("  Padded message" + " " * 60, "Padded message"),
+        ("A" * 50, "A" * 50),
+        ("A" * 51, "A" * 50 + "..."),
+    ])
+    def test_title_uses_stripped_length(self, message, title):
+        """Test that only a stripped message over 50 characters gets an ellipsis."""
+        from routes.chat_routes import generate_conversation_title
+
+        assert generate_conversation_title(message) == title
+
+
+@pytest.mark.api
+class TestTrimHistory:
+    """Test the conversation history context budget."""
+    
+    @pytest.mark.parametrize("max_chars,kept,trimmed", [
+        (100, ["a", "b", "c"], False),
+        (60, ["b", "c"], True),
+        (59, ["c"], True),
+        (0, [], True),
+    ])
+    def test_history_keeps_newest_whole_messages_within_budget(self, in_memory_db_session, max_chars, kept, trimmed):
+        """Test that the history query drops older messages and keeps order."""
+        from database import ChatConversation, ChatMessage
+        from routes.chat_routes import _ROLES, _load_conversation
+        
+        conversation = ChatConversation(title="Budget", method="langchain")
+        in_memory_db_session.add(conversation)
+        in_memory_db_session.flush()
+        in_memory_db_session.add_all([
+            ChatMessage(conversation_id=conversation.id, role="user", content="a" * 40),
+            ChatMessage(conversation_id=conversation.id, role="assistant", content="b" * 30),
+            ChatMessage(conversation_id=conversation.id, role="user", content="c" * 30),
+        ])
+        in_memory_db_session.commit()
+        
+        exists, history, was_trimmed = _load_conversation(in_memory_db_session, conversation.id, 50, max_chars)
+        
+        assert exists
+        assert [msg["content"][0] for msg in history] == kept
+        assert was_trimmed is trimmed
+        assert all(msg["role"] is _ROLES[msg["role"]] for msg in history)
+    
+    @pytest.mark.asyncio
+    async def test_chat_turn_sends_trimmed_history(self, in_memory_db_session):
+        """Test that only the history within budget reaches the service."""
+        from database import ChatConversation, ChatMessage
+        
+        conversation = ChatConversation(title="Long", method="langchain")
+        in_memory_db_session.add(conversation)
+        in_memory_db_session.flush()
+        in_memory_db_session.add_all([
+            ChatMessage(conversation_id=conversation.id, role="user", content="old " * 3000),
+            ChatMessage(conversation_id=conversation.id, role="assistant", content="recent"),
+        ])
+        in_memory_db_session.commit()
+        service = _mock_chat_service()
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=service):
+            await _send_chat_message(in_memory_db_session, "Next", conversation.id)
+        
+        history = service.send_message.call_args.args[1]
+        assert history == [{"role": "assistant", "content": "recent"}]
+
+
+_USAGE = {
+    "input_tokens": 10, "output_tokens": 5, "total_tokens": 15,
+    "estimated_cost_usd": None, "input_cost_per_1k_tokens": None,
+    "output_cost_per_1k_tokens": None
+}
+
+
+def _mock_chat_service(chunks=("Hi", " there"), error=None):
+    """Chat service double that answers every message with a fixed reply.
+    
+    The streamed reply is sent as ``chunks``; if ``error`` is given, it is
+    raised after the first chunk.
+    """
+    from unittest.mock import AsyncMock
+    
+    service = Mock()
+    service.send_message = AsyncMock(return_value=("".join(chunks), dict(_USAGE)))
+    
+    async def stream_message(message, history, usage_info):
+        for position, chunk in enumerate(chunks):
+            if error and position:
+                raise error
+            yield chunk
+        usage_info.update(_USAGE)
+    
+    service.stream_message = stream_message
+    return service
+
+
+async def _send_chat_message(session, message, conversation_id=None):
+    """Run one LangChain chat turn through the route handler."""
+    from routes.chat_routes import handle_chat_message
+    from schemas import ChatMessageRequest
+    
+    return await handle_chat_message(
+        ChatMessageRequest(message=message, conversation_id=conversation_id),
+        "langchain", "LangChain", session
+    )
+
+
+async def _stream_chat_message(session, message, conversation_id=None):
+    """Run one streamed LangChain chat turn and collect its (event, data) pairs."""
+    from routes.chat_routes import stream_chat_message
+    from schemas import ChatMessageRequest
+    
+    response = await stream_chat_message(
+        ChatMessageRequest(message=message, conversation_id=conversation_id),
+        "langchain", session
+    )
+    events = []
+    async for event in response.body_iterator:
+        name, data = (line.split(": ", 1)[1] for line in event.strip().split("\n"))
+        events.append((name, json.loads(data)))
+    return events
+
+
+@pytest.mark.api
+class TestConversationQueries:
+    """Test the conversation read queries against a real session."""
+    
+    @pytest.fixture
+    def conversations(self, in_memory_db_session):
+        """Create one conversation with messages and one without."""
+        from database import ChatConversation, ChatMessage
+        
+        chatty = ChatConversation(title="Chatty", method="langchain", model="test-model")
+        empty = ChatConversation(title="Empty", method="langgraph", model="test-model")
+        in_memory_db_session.add_all([chatty, empty])
+        in_memory_db_session.flush()
+        in_memory_db_session.add_all([
+            ChatMessage(conversation_id=chatty.id, role="user", content="Hello"),
+            ChatMessage(conversation_id=chatty.id, role="assistant", content="x" * 150),
+        ])
+        in_memory_db_session.commit()
+        return chatty, empty
+    
+    def test_list_counts_and_previews_in_one_query(self, in_memory_db_session, conversations, capture_statements):
+        """Test that counts and previews are loaded with a single statement."""
+        from routes.chat_routes import get_conversations
+        
+        with capture_statements(in_memory_db_session) as statements:
+            result = get_conversations(skip=0, limit=20, db=in_memory_db_session)
+        
+        assert len(statements) == 1
+        by_title = {conv.title: conv for conv in result}
+        assert by_title["Chatty"].message_count == 2
+        assert by_title["Chatty"].last_message_preview == "x" * 100 + "..."
+        assert by_title["Empty"].message_count == 0
+        assert by_title["Empty"].last_message_preview is None
+        assert by_title["Empty"].model_dump(mode="json")["updated_at"].endswith("Z")
+    
+    def test_list_pagination_applies_to_conversations(self, in_memory_db_session, conversations):
+        """Test that limit counts conversations, not joined message rows."""
+        from routes.chat_routes import get_conversations
+        
+        result = get_conversations(skip=0, limit=1, db=in_memory_db_session)
+        
+        assert len(result) == 1
+    
+    def test_list_pages_keep_their_counts_and_previews(self, in_memory_db_session, conversations):
+        """Test that each page carries the counts and previews of its own conversations."""
+        from routes.chat_routes import get_conversations
+        
+        pages = [get_conversations(skip=skip, limit=1, db=in_memory_db_session) for skip in (0, 1, 2)]
+        
+        listed = {page[0].title: page[0] for page in pages[:2]}
+        assert set(listed) == {"Chatty", "Empty"}
+        assert listed["Chatty"].message_count == 2
+        assert listed["Chatty"].last_message_preview == "x" * 100 + "..."
+        assert listed["Empty"].message_count == 0
+        assert pages[2] == []
+    
+    def test_get_conversation_loads_messages_eagerly(self, in_memory_db_session, conversations, capture_statements):
+        """Test that messages are loaded with the conversation, in order."""
+        from routes.chat_routes import get_conversation
+        
+        conversation_id = conversations[0].id
+        in_memory_db_session.expire_all()
+        
+        with capture_statements(in_memory_db_session) as statements:
+            result = get_conversation(conversation_id=conversation_id, db=in_memory_db_session)
+        
+        assert len(statements) == 2
+        assert "transaction_guid" not in statements[1]
+        assert [msg.role for msg in result.messages] == ["user", "assistant"]
+    
+    def test_get_conversation_serializes_like_the_api(self, in_memory_db_session, conversations):
+        """Test timestamp and cost formatting of responses built from ORM rows."""
+        from decimal import Decimal
+        from routes.chat_routes import get_conversation
+        
+        chatty = conversations[0]
+        chatty.messages[0].estimated_cost_usd = Decimal("0")
+        chatty.messages[1].estimated_cost_usd = Decimal("0.000125")
+        in_memory_db_session.commit()
+        
+        data = get_conversation(conversation_id=chatty.id, db=in_memory_db_session).model_dump(mode="json")
+        
+        assert data["created_at"].endswith("Z")
+        assert data["updated_at"].endswith("Z")
+        assert data["messages"][0]["created_at"].endswith("Z")
+        assert data["messages"][0]["estimated_cost_usd"] is None
+        assert data["messages"][1]["estimated_cost_usd"] == 0.000125
+    
+    @pytest.mark.asyncio
+    async def test_chat_turn_statements(self, in_memory_db_session, conversations, capture_statements):
+        """Test that a chat turn reads its history, then only updates and inserts."""
+        from database import ChatMessage
+        
+        conversation_id = conversations[0].id
+        in_memory_db_session.expire_all()
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=_mock_chat_service()), \
+                capture_statements(in_memory_db_session) as statements:
+            result = await _send_chat_message(in_memory_db_session, "Again", conversation_id)
+        
+        assert [s.split()[0] for s in statements] == ["SELECT", "SELECT", "UPDATE", "INSERT", "INSERT"]
+        assert "updated_at=CURRENT_TIMESTAMP" in statements[2] and "RETURNING" in statements[2]
+        assert result.conversation.id == conversation_id
+        assert not hasattr(result.conversation, "messages")
+        assert result.message.content == "Hi there"
+        assert result.message.id is not None
+        assert result.message.created_at is not None
+        
+        messages = in_memory_db_session.query(ChatMessage).filter(ChatMessage.conversation_id == conversation_id).all()
+        assert [msg.content for msg in messages][-2:] == ["Again", "Hi there"]
+
+    
+    @pytest.mark.asyncio
+    async def test_chat_turn_reads_only_recent_history(self, in_memory_db_session, conversations):
+        """Test that the history query is limited to the newest messages."""
+        from config import settings
+        
+        service = _mock_chat_service()
+        
+        with patch.object(settings, "chat_history_max_messages", 1), \
+                patch("routes.chat_routes.get_chat_service", return_value=service):
+            await _send_chat_message(in_memory_db_session, "Again", conversations[0].id)
+        
+        assert service.send_message.call_args.args[1] == [{"role": "assistant", "content": "x" * 150}]
+    
+    @pytest.mark.asyncio
+    async def test_chat_turn_holds_no_connection_during_ai_call(self, in_memory_db_session, conversations):
+        """Test that the history read transaction ends before the AI call."""
+        service = _mock_chat_service()
+        reply = service.send_message.return_value
+        in_transaction = []
+        
+        async def send_message(message, history):
+            in_transaction.append(in_memory_db_session.in_transaction())
+            return reply
+        
+        service.send_message.side_effect = send_message
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=service):
+            await _send_chat_message(in_memory_db_session, "Again", conversations[0].id)
+        
+        assert in_transaction == [False]
+    
+    @pytest.mark.asyncio
+    async def test_conversation_deleted_during_ai_call_is_404(self, in_memory_db_session, conversations):
+        """Test that nothing is saved when the conversation disappears mid-turn."""
+        from fastapi import HTTPException
+        from database import ChatConversation, ChatMessage
+        
+        conversation_id = conversations[0].id
+        service = _mock_chat_service()
+        reply = service.send_message.return_value
+        
+        async def send_message(message, history):
+            in_memory_db_session.query(ChatMessage).filter(ChatMessage.conversation_id == conversation_id).delete()
+            in_memory_db_session.query(ChatConversation).filter(ChatConversation.id == conversation_id).delete()
+            in_memory_db_session.commit()
+            return reply
+        
+        service.send_message.side_effect = send_message
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=service):
+            with pytest.raises(HTTPException) as exc_info:
+                await _send_chat_message(in_memory_db_session, "Again", conversation_id)
+        
+        assert exc_info.value.status_code == 404
+        assert in_memory_db_session.query(ChatMessage).filter(ChatMessage.conversation_id == conversation_id).count() == 0
+
+@pytest.mark.api
+class TestNewConversation:
+    """Test starting a conversation against a real session."""
+    
+    @pytest.mark.asyncio
+    async def test_new_conversation_is_saved(self, in_memory_db_session):
+        """Test that the conversation and both messages are saved."""
+        from database import ChatMessage
+        from transaction_context import request_id_context
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=_mock_chat_service()), \
+                request_id_context("req-1"):
+            result = await _send_chat_message(in_memory_db_session, "Hello")
+        
+        assert result.request_id == "req-1"
+        assert result.conversation.id is not None
+        assert result.conversation.title == "Hello"
+        
+        messages = in_memory_db_session.query(ChatMessage).filter(ChatMessage.conversation_id == result.conversation.id).all()
+        assert [msg.role for msg in messages] == ["user", "assistant"]
+        assert result.message.id == messages[-1].id
+    
+    @pytest.mark.asyncio
+    async def test_new_conversation_writes_only_inserts(self, in_memory_db_session, capture_statements):
+        """Test that a new conversation is written by INSERTs alone, with no reload."""
+        with patch("routes.chat_routes.get_chat_service", return_value=_mock_chat_service()), \
+                capture_statements(in_memory_db_session) as statements:
+            result = await _send_chat_message(in_memory_db_session, "Hello")
+        
+        assert [s.split()[0] for s in statements] == ["INSERT", "INSERT", "INSERT"]
+        assert result.message.id is not None
+        assert result.message.created_at is not None
+        assert result.conversation.updated_at is not None
+    
+    @pytest.mark.asyncio
+    async def test_ai_failure_writes_nothing(self, in_memory_db_session, capture_statements):
+        """Test that nothing is written when the AI call for a new conversation fails."""
+        from database import ChatConversation
+        
+        service = _mock_chat_service()
+        service.send_message.side_effect = RuntimeError("provider down")
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=service), \
+                capture_statements(in_memory_db_session) as statements:
+            with pytest.raises(RuntimeError):
+                await _send_chat_message(in_memory_db_session, "Hello")
+        
+        assert statements == []
+        assert in_memory_db_session.query(ChatConversation).count() == 0
+
+
+@pytest.mark.api
+class TestStreamingChat:
+    """Test streamed chat turns against a real session."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_sends_chunks_then_the_saved_turn(self, in_memory_db_session):
+        """Test that chunks are sent as they arrive and the turn is saved at the end."""
+        from database import ChatMessage
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=_mock_chat_service()):
+            events = await _stream_chat_message(in_memory_db_session, "Hello")
+        
+        assert events[:2] == [("chunk", {"content": "Hi"}), ("chunk", {"content": " there"})]
+        name, done = events[2]
+        assert name == "done" and len(events) == 3
+        assert done["message"]["content"] == "Hi there"
+        assert done["message"]["total_tokens"] == 15
+        assert done["conversation"]["title"] == "Hello"
+        
+        messages = in_memory_db_session.query(ChatMessage).filter(
+            ChatMessage.conversation_id == done["conversation"]["id"]
+        ).all()
+        assert [(msg.role, msg.content) for msg in messages] == [("user", "Hello"), ("assistant", "Hi there")]
+    
+    @pytest.mark.asyncio
+    async def test_stream_continues_a_conversation(self, in_memory_db_session):
+        """Test that a streamed turn sends the history and saves to the conversation."""
+        with patch("routes.chat_routes.get_chat_service", return_value=_mock_chat_service()):
+            first = await _stream_chat_message(in_memory_db_session, "Hello")
+            conversation_id = first[-1][1]["conversation"]["id"]
+            events = await _stream_chat_message(in_memory_db_session, "Again", conversation_id)
+        
+        name, done = events[-1]
+        assert name == "done"
+        assert done["conversation"]["id"] == conversation_id
+        assert done["message"]["content"] == "Hi there"
+    
+    @pytest.mark.asyncio
+    async def test_stream_failure_sends_error_and_saves_nothing(self, in_memory_db_session):
+        """Test that a provider failure mid-stream ends with an error event."""
+        from database import ChatConversation
+        
+        service = _mock_chat_service(error=RuntimeError("provider down"))
+        with patch("routes.chat_routes.get_chat_service", return_value=service):
+            events = await _stream_chat_message(in_memory_db_session, "Hello")
+        
+        assert events == [("chunk", {"content": "Hi"}), ("error", {"detail": "provider down"})]
+        assert in_memory_db_session.query(ChatConversation).count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_stream_missing_conversation_is_404(self, in_memory_db_session):
+        """Test that a missing conversation is reported before the stream starts."""
+        from fastapi import HTTPException
+        
+        with patch("routes.chat_routes.get_chat_service", return_value=_mock_chat_service()):
+            with pytest.raises(HTTPException) as exc_info:
+                await _stream_chat_message(in_memory_db_session, "Hello", 999)
+        
+        assert exc_info.value.status_code == 404
+
+
+@pytest.mark.api
+class TestConversationDeletion:
+    """Test that deleting conversations cascades to their messages."""
+    
+    @pytest.fixture(params=["cascade", "legacy"])
+    def db(self, request, in_memory_db_session):
+        """Session with SQLite foreign keys enforced, as the app's engine does.
+        
+        The ``legacy`` schema recreates chat_messages as databases created
+        before the ON DELETE CASCADE have it.
+        """
+        from sqlalchemy import text
+        from sqlalchemy.schema import CreateTable
+        from database import ChatMessage
+        
+        if request.param == "legacy":
+            engine = in_memory_db_session.get_bind()
+            ddl = str(CreateTable(ChatMessage.__table__).compile(engine))
+            assert " ON DELETE CASCADE" in ddl
+            in_memory_db_session.execute(text("DROP TABLE chat_messages"))
+            in_memory_db_session.execute(text(ddl.replace(" ON DELETE CASCADE", "")))
+            in_memory_db_session.commit()
+        
+        in_memory_db_session.execute(text("PRAGMA foreign_keys=ON"))
+        yield in_memory_db_session
+        in_memory_db_session.rollback()
+        in_memory_db_session.execute(text("PRAGMA foreign_keys=OFF"))
+    
+    @pytest.fixture
+    def conversation_ids(self, db):
+        """Create two conversations with two messages each."""
+        from database import ChatConversation, ChatMessage
+        
+        conversations = [
+            ChatConversation(title=f"Conversation {i}", method="langchain")
+            for i in range(2)
+        ]
+        db.add_all(conversations)
+        db.flush()
+        db.add_all([
+            ChatMessage(conversation_id=conversation.id, role=role, content="Hello")
+            for conversation in conversations
+            for role in ("user", "assistant")
+        ])
+        db.commit()
+        return [conversation.id for conversation in conversations]
+    
+    def test_delete_conversation_cascades(self, db, conversation_ids):
+        """Test that a conversation's messages are removed with it."""
+        from database import ChatMessage
+        from routes.chat_routes import delete_conversation
+        
+        delete_conversation(conversation_id=conversation_ids[0], db=db)
+        
+        remaining = {message.conversation_id for message in db.query(ChatMessage).all()}
+        assert remaining == {conversation_ids[1]}
+    
+    def test_delete_missing_conversation_is_404(self, db, conversation_ids, capture_statements):
+        """Test that deleting an unknown conversation raises 404 and deletes nothing."""
+        from fastapi import HTTPException
+        from database import ChatMessage
+        from routes.chat_routes import delete_conversation
+        
+        with capture_statements(db) as statements:
+            with pytest.raises(HTTPException) as exc_info:
+                delete_conversation(conversation_id=max(conversation_ids) + 1, db=db)
+        
+        assert exc_info.value.status_code == 404
+        assert len(statements) == 2
+        assert db.query(ChatMessage).count() == 4
+    
+    def test_delete_all_conversations_cascades(self, db, conversation_ids):
+        """Test that deleting everything reports the count and leaves no messages."""
+        from database import ChatMessage
+        from routes.chat_routes import delete_all_conversations
+        
+        result = delete_all_conversations(db=db)
+        
+        assert result["deleted_count"] == 2
+        assert db.query(ChatMessage).count() == 0
+
+
 @pytest.mark.api
 class TestChatHistoryEndpoints:
     """Test chat history and search endpoints."""
@@ -427,5 +933,18 @@ class TestChatErrorHandling:
         assert response.status_code in [200, 400, 415]
 
 
+@pytest.mark.api
+class TestServerSentEvents:
+    """Test the server-sent event framing of the streaming chat endpoints."""
+    
+    def test_event_data_is_encoded_like_the_json_responses(self):
+        """Test that event payloads are compact orjson with non-ASCII text kept."""
+        from routes.chat_routes import _sse_event
+        
+        data = {"content": "héllo", "cost": 0.1}
+        
+        assert _sse_event("token", data) == 'event: token\ndata: {"content":"héllo","cost":0.1}\n\n'
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
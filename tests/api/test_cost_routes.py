@@ -8,6 +8,7 @@ import pytest
 from unittest.mock import patch, Mock
 from datetime import datetime, timedelta
 from decimal import Decimal
+import json
 
 
 @pytest.mark.api
@@ -506,5 +507,295 @@ class TestCostExportEndpoints:
             assert response.headers.get('content-type', '').startswith('application/json')
 
 
+
+@pytest.mark.api
+class TestCostRollUp:
+    """Test the cost roll-up against a real session."""
+    
+    @pytest.fixture
+    def billed(self, in_memory_db_session):
+        """A story, a chat and a context execution with costs, plus unbilled rows."""
+        from database import Story, ChatConversation, ChatMessage, ContextPromptExecution
+        
+        now = datetime.utcnow()
+        conversation = ChatConversation(title="Chat", method="langchain", model="model-a")
+        in_memory_db_session.add_all([
+            Story(primary_character="A", secondary_character="B", combined_characters="A & B",
+                  story_content="...", method="langchain", model="model-a", total_tokens=100,
+                  estimated_cost_usd=Decimal("0.5"), created_at=now - timedelta(days=2)),
+            Story(primary_character="C", secondary_character="D", combined_characters="C & D",
+                  story_content="...", method="langgraph", model="model-b", total_tokens=50,
+                  estimated_cost_usd=None, created_at=now - timedelta(days=1)),
+            conversation,
+        ])
+        in_memory_db_session.flush()
+        in_memory_db_session.add_all([
+            ChatMessage(conversation_id=conversation.id, role="user", content="Hi",
+                        created_at=now - timedelta(days=1)),
+            ChatMessage(conversation_id=conversation.id, role="assistant", content="Hello",
+                        total_tokens=20, estimated_cost_usd=Decimal("0.25"), created_at=now - timedelta(days=1)),
+            ContextPromptExecution(original_filename="notes.txt", file_type="txt", file_size_bytes=10,
+                                   system_prompt="s", user_prompt="u", method="langgraph", model="model-b",
+                                   total_tokens=30, estimated_cost_usd=Decimal("1.0"), status="completed",
+                                   created_at=now - timedelta(days=20)),
+        ])
+        in_memory_db_session.commit()
+        return in_memory_db_session
+    
+    @pytest.fixture
+    def app_session(self, billed):
+        """An application session on the same database, which tracks billed writes."""
+        from database import SessionLocal
+        
+        session = SessionLocal(bind=billed.get_bind())
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    def test_usage_rolls_up_all_sources_in_one_query(self, billed, capture_statements):
+        """Test that the summary and breakdowns combine every source from one aggregate."""
+        from routes.cost_routes import _cost_usage
+        from schemas.cost import CostUsageResponse
+        
+        with capture_statements(billed) as selects:
+            usage = _cost_usage(30, billed)
+        
+        # One aggregate for the roll-up, one ranked list for the recent requests
+        assert len(selects) == 2
+        assert all("UNION ALL" in statement for statement in selects)
+        assert usage["summary"]["total_cost_usd"] == 1.75
+        assert usage["summary"]["total_requests"] == 3
+        assert usage["summary"]["total_tokens"] == 150
+        assert {m["method"]: m["total_cost_usd"] for m in usage["by_method"]} == {"langgraph": 1.0, "langchain": 0.75}
+        assert {m["model"]: m["request_count"] for m in usage["by_model"]} == {"model-a": 2, "model-b": 1}
+        # Context executions are not part of the daily usage
+        assert sum(day["total_cost_usd"] for day in usage["daily_usage"]) == 0.75
+        assert [(r["type"], r["cost_usd"]) for r in usage["recent_requests"]] == [
+            ("context", 1.0), ("story", 0.5), ("chat", 0.25)
+        ]
+        assert usage["recent_requests"][1]["primary_character"] == "A"
+        assert usage["recent_requests"][2]["conversation_title"] == "Chat"
+        assert isinstance(usage["recent_requests"][0]["created_at"], datetime)
+        CostUsageResponse.model_validate(usage)
+    
+    def test_summary_matches_usage(self, billed):
+        """Test that the quick summary agrees with the full analytics."""
+        from routes.cost_routes import _cost_summary, _cost_usage
+        
+        assert _cost_summary(30, billed) == _cost_usage(30, billed)["summary"]
+    
+    def test_numeric_sums_encode_as_json(self, billed):
+        """Test that totals summed as NUMERIC, as on PostgreSQL, still encode."""
+        import orjson
+        from sqlalchemy import Numeric, cast
+        from routes import cost_routes
+        
+        cost_totals = cost_routes._cost_totals
+        
+        def numeric_totals(billed_rows):
+            return tuple(cast(column, Numeric).label(column.name) for column in cost_totals(billed_rows))
+        
+        with patch.object(cost_routes, "_cost_totals", numeric_totals):
+            summary = cost_routes._cost_summary(30, billed)
+            usage = cost_routes._cost_usage(30, billed)
+        
+        assert isinstance(billed.execute(cost_routes.select(
+            *numeric_totals(cost_routes._billed_requests(datetime.min, datetime.max, datetime.max))
+        )).one()[0], Decimal)
+        assert orjson.loads(orjson.dumps(summary))["total_cost_usd"] == 1.75
+        assert orjson.loads(orjson.dumps(usage))["summary"] == summary
+    
+    @pytest.mark.asyncio
+    async def test_responses_are_cached_until_billed_data_changes(self, billed, app_session):
+        """Test that repeated polls are served from the cache until a billed row is written."""
+        from database import Story
+        from routes import cost_routes
+        
+        with patch.dict(cost_routes._cost_cache, clear=True), \
+                patch.object(cost_routes, "_cost_summary", wraps=cost_routes._cost_summary) as build:
+            first = await cost_routes.get_cost_summary(days=30, db=billed)
+            second = await cost_routes.get_cost_summary(days=30, db=billed)
+            
+            assert build.call_count == 1
+            assert second.body == first.body
+            assert json.loads(first.body)["total_requests"] == 3
+            
+            app_session.add(Story(primary_character="E", secondary_character="F", combined_characters="E & F",
+                                  story_content="...", method="langchain", model="model-a", total_tokens=10,
+                                  estimated_cost_usd=Decimal("0.1"), created_at=datetime.utcnow()))
+            app_session.commit()
+            third = await cost_routes.get_cost_summary(days=30, db=billed)
+        
+        assert build.call_count == 2
+        assert json.loads(third.body)["total_requests"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_transactions_read_chat_conversations_in_the_join(self, billed, capture_statements):
+        """Test that chat transactions take their conversation fields from the joined query."""
+        from routes.cost_routes import get_all_transactions
+        
+        billed.expire_all()
+        with capture_statements(billed) as selects:
+            response = await get_all_transactions(days=30, db=billed)
+        
+        # One query per source, and no lazy loads of the conversations
+        assert len(selects) == 3
+        chat = next(t for t in response.transactions if t.type == "chat")
+        assert (chat.method, chat.model, chat.conversation_title) == ("langchain", "model-a", "Chat")
+    
+    @pytest.mark.asyncio
+    async def test_usage_stream_sends_the_summary_first(self, billed):
+        """Test that the streamed analytics hold the /usage sections, summary first."""
+        from routes import cost_routes
+        
+        expected = json.loads(json.dumps(cost_routes._cost_usage(30, billed), default=str))
+        
+        with patch.dict(cost_routes._cost_cache, clear=True):
+            response = await cost_routes.stream_cost_usage(days=30, db=billed)
+            lines = [line async for line in response.body_iterator]
+        
+        assert response.media_type == "application/x-ndjson"
+        assert all(line.endswith(b"\n") for line in lines)
+        sections = [json.loads(line) for line in lines]
+        assert list(sections[0]) == ["summary"]
+        assert sections[0]["summary"] == expected["summary"]
+        streamed = {}
+        for section in sections:
+            streamed.update(section)
+        assert list(streamed) == list(expected)
+        assert streamed["by_model"] == expected["by_model"]
+        assert len(streamed["recent_requests"]) == len(expected["recent_requests"])
+    
+    @pytest.mark.asyncio
+    async def test_usage_stream_matches_and_shares_the_usage_cache(self, billed):
+        """Test that a stream covers one window and is then served from the /usage cache."""
+        from routes import cost_routes
+        
+        async def _stream():
+            response = await cost_routes.stream_cost_usage(days=30, db=billed)
+            sections = [json.loads(line) async for line in response.body_iterator]
+            assert list(sections[0]) == ["summary"]
+            streamed = {}
+            for section in sections:
+                streamed.update(section)
+            return streamed
+        
+        with patch.dict(cost_routes._cost_cache, clear=True):
+            built = await _stream()
+            usage = await cost_routes.get_cost_usage(days=30, db=billed)
+            with patch.object(cost_routes, "_cost_summary", side_effect=AssertionError), \
+                    patch.object(cost_routes, "_cost_usage", side_effect=AssertionError):
+                cached = await _stream()
+        
+        assert built == json.loads(usage.body)
+        assert cached == built
+    
+    @pytest.mark.asyncio
+    async def test_usage_stream_resends_the_summary_of_an_entry_built_elsewhere(self, billed):
+        """Test that breakdowns another request built are sent with their own summary."""
+        import asyncio
+        import time
+        import orjson
+        from database import get_billed_data_version
+        from routes import cost_routes
+        
+        key = ("usage", 30)
+        other = {"summary": {"total_requests": 99}, "by_method": []}
+        
+        with patch.dict(cost_routes._cost_cache, clear=True):
+            async with cost_routes._cost_cache_locks[key]:
+                response = await cost_routes.stream_cost_usage(days=30, db=billed)
+                lines = response.body_iterator
+                first = json.loads(await lines.__anext__())
+                waiting = asyncio.ensure_future(lines.__anext__())
+                await asyncio.sleep(0)
+                # Another request finishes building the entry while this one waits
+                cost_routes._cost_cache[key] = (time.monotonic() + 60, get_billed_data_version(),
+                                                orjson.dumps(other))
+            rest = [json.loads(await waiting)] + [json.loads(line) async for line in lines]
+        
+        assert first["summary"]["total_requests"] == 3
+        assert rest == [{"summary": {"total_requests": 99}}, {"by_method": []}]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_build_the_entry_once(self, billed):
+        """Test that requests missing the cache together share one build."""
+        import asyncio
+        import time
+        from routes import cost_routes
+        
+        builds = []
+        
+        def _build(days, db):
+            builds.append(days)
+            time.sleep(0.05)
+            return {"days": days}
+        
+        with patch.dict(cost_routes._cost_cache, clear=True), \
+                patch.object(cost_routes, "_cost_summary", _build):
+            responses = await asyncio.gather(
+                *(cost_routes.get_cost_summary(days=30, db=billed) for _ in range(3))
+            )
+        
+        assert builds == [30]
+        assert all(json.loads(response.body) == {"days": 30} for response in responses)
+    
+    def test_cache_version_moves_on_commit_not_flush(self, billed, app_session):
+        """Test that flushed billed rows only invalidate the cache once they are committed."""
+        from database import Story, get_billed_data_version
+        
+        def _story():
+            return Story(primary_character="E", secondary_character="F", combined_characters="E & F",
+                         story_content="...", method="langchain", model="model-a", total_tokens=10,
+                         estimated_cost_usd=Decimal("0.1"), created_at=datetime.utcnow())
+        
+        version = get_billed_data_version()
+        app_session.add(_story())
+        app_session.flush()
+        assert get_billed_data_version() == version
+        app_session.commit()
+        assert get_billed_data_version() == version + 1
+        
+        app_session.add(_story())
+        app_session.flush()
+        app_session.rollback()
+        app_session.commit()
+        assert get_billed_data_version() == version + 1
+    
+    def test_only_application_sessions_track_billed_writes(self, billed):
+        """Test that sessions not made by SessionLocal run no cost cache bookkeeping."""
+        from database import Story, get_billed_data_version
+        
+        version = get_billed_data_version()
+        billed.add(Story(primary_character="E", secondary_character="F", combined_characters="E & F",
+                         story_content="...", method="langchain", model="model-a", total_tokens=10,
+                         estimated_cost_usd=Decimal("0.1"), created_at=datetime.utcnow()))
+        billed.flush()
+        
+        assert "billed_data_changed" not in billed.info
+        billed.commit()
+        assert get_billed_data_version() == version
+    
+    @pytest.mark.asyncio
+    async def test_analytics_are_built_off_the_event_loop(self, billed):
+        """Test that the analytics queries run in the threadpool, not on the event loop thread."""
+        import threading
+        from routes import cost_routes
+        
+        threads = []
+        
+        def _build(days, db):
+            threads.append(threading.get_ident())
+            return {"days": days}
+        
+        with patch.dict(cost_routes._cost_cache, clear=True), \
+                patch.object(cost_routes, "_cost_usage", _build):
+            response = await cost_routes.get_cost_usage(days=7, db=billed)
+        
+        assert json.loads(response.body) == {"days": 7}
+        assert threads and threads[0] != threading.get_ident()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
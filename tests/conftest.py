@@ -15,6 +15,7 @@ import pytest
 from typing import Generator, AsyncGenerator
 from unittest.mock import patch, MagicMock
 import tempfile
+from contextlib import contextmanager
 import shutil
 from pathlib import Path
 
@@ -25,7 +26,7 @@ sys.path.insert(0, str(backend_path))
 # Import after path setup
 from fastapi.testclient import TestClient
 import sqlalchemy
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -96,6 +97,31 @@ def in_memory_db_session(in_memory_db_engine) -> Generator[Session, None, None]:
         Base.metadata.drop_all(in_memory_db_engine)
 
 
+@contextmanager
+def _capture_statements(session: Session) -> Generator[list, None, None]:
+    """Collect the SQL statements executed on the session's engine."""
+    statements = []
+    engine = session.get_bind()
+    
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def capture_statements():
+    """Provide a context manager that collects the SQL a session executes.
+    
+    Usage: ``with capture_statements(session) as statements: ...``
+    """
+    return _capture_statements
+
+
 @pytest.fixture
 def test_db_session(test_db_engine) -> Generator[Session, None, None]:
     """Provide a real database session for integration tests with transaction rollback."""
@@ -2,7 +2,7 @@ import pytest
 from pathlib import Path
 from prompts.prompt_utils import load_prompt_file, format_template, validate_template_variables
 from prompts.semantic_kernel_prompts import get_chat_messages
-from prompts.langchain_prompts import get_langchain_messages
+from prompts.langchain_prompts import get_langchain_messages, get_user_prompt_template, _compile_user_template
 from prompts.langgraph_prompts import get_initial_messages, get_enhancement_messages
 
 class TestPromptUtils:
@@ -54,6 +54,20 @@ class TestLangChainPrompts:
         assert hasattr(messages[1], 'content')  # HumanMessage
         assert "Santa" in messages[1].content
         assert "Rudolph" in messages[1].content
+    
+    def test_user_prompt_matches_str_format(self):
+        """Test the compiled user template against str.format"""
+        messages = get_langchain_messages("Santa", "Rudolph")
+        expected = get_user_prompt_template().format(
+            primary_character="Santa", secondary_character="Rudolph"
+        )
+        assert messages[1].content == expected
+    
+    def test_compile_user_template_other_shapes(self):
+        """Test templates outside the fast path still format correctly"""
+        template = "{secondary_character} meets {primary_character!r} {{twice}}"
+        formatter = _compile_user_template(template)
+        assert formatter("Santa", "Rudolph") == "Rudolph meets 'Santa' {twice}"
 
 class TestLangGraphPrompts:
     def test_get_initial_messages(self):
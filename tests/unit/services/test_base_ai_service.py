@@ -242,6 +242,47 @@ class TestBaseAIService:
                 with pytest.raises(Exception):  # Should handle rate limit error
                     await service_instance._call_api(messages)
     
+    @pytest.mark.asyncio
+    async def test_stream_api_yields_chunks_then_fills_usage(self, service_instance):
+        """Test that a streamed call yields content and reports the final usage chunk."""
+        def chunk(content=None, usage=None):
+            delta = Mock(content=content)
+            return Mock(choices=[Mock(delta=delta)] if content is not None else [], usage=usage)
+        
+        async def stream():
+            for item in (chunk("Test "), chunk(""), chunk("response"),
+                         chunk(usage=Mock(prompt_tokens=50, completion_tokens=25, total_tokens=75))):
+                yield item
+        
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.return_value = stream()
+        
+        with patch.object(service_instance, '_ensure_client', return_value=mock_client):
+            usage = {}
+            chunks = [text async for text in service_instance._stream_api([{"role": "user", "content": "test"}], usage)]
+        
+        assert chunks == ["Test ", "response"]
+        assert usage["total_tokens"] == 75
+        assert "estimated_cost_usd" in usage
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+    
+    @pytest.mark.asyncio
+    async def test_stream_api_translates_errors(self, service_instance):
+        """Test that provider errors from a stream become the app's exceptions."""
+        from exceptions import APIRateLimitError
+        
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.side_effect = RateLimitError(
+            message="Rate limit exceeded",
+            response=Mock(status_code=429),
+            body=None
+        )
+        
+        with patch.object(service_instance, '_ensure_client', return_value=mock_client):
+            with pytest.raises(APIRateLimitError):
+                async for _ in service_instance._stream_api([{"role": "user", "content": "test"}], {}):
+                    pass
+    
     def test_cost_calculation_integration(self, service_instance):
         """Test integration with cost calculation."""
         usage_info = {
@@ -254,6 +295,23 @@ class TestBaseAIService:
         # This tests the integration point
         assert usage_info["total_tokens"] == usage_info["input_tokens"] + usage_info["output_tokens"]
     
+    def test_model_rates_are_looked_up_once(self, service_class):
+        """Test that a model's per-1k rates are converted once and reused."""
+        from services.base_ai_service import _model_rates
+        from pricing import get_model_pricing
+        
+        model = "meta-llama/llama-3-8b-instruct"
+        pricing = get_model_pricing(model)
+        _model_rates.cache_clear()
+        
+        with patch("services.base_ai_service.get_model_pricing", return_value=pricing) as mock_pricing:
+            first = _model_rates(model)
+            second = _model_rates(model)
+        
+        assert first == (float(pricing["input_cost_per_1k"]), float(pricing["output_cost_per_1k"]))
+        assert second is first
+        mock_pricing.assert_called_once_with(model)
+    
     def test_transaction_context_integration(self, service_instance):
         """Test integration with transaction context."""
         # BaseAIService inherits from TransactionAware
@@ -391,6 +449,30 @@ class TestBaseAIServiceAsync:
                 # Should only create client once
                 assert mock_create.call_count == 1
     
+    @pytest.mark.asyncio
+    async def test_concurrent_client_access_while_creation_awaits(self, service_class):
+        """Test that one client is created even when creation suspends."""
+        with patch("services.base_ai_service.settings") as mock_settings, \
+             patch("services.base_ai_service.custom_settings", None):
+            
+            mock_settings.provider_name = "test"
+            service = service_class()
+            
+            mock_client = AsyncMock(spec=AsyncOpenAI)
+            create_calls = 0
+            
+            async def slow_create():
+                nonlocal create_calls
+                create_calls += 1
+                await asyncio.sleep(0)
+                return mock_client
+            
+            with patch.object(service, '_create_client', side_effect=slow_create):
+                clients = await asyncio.gather(*[service._ensure_client() for _ in range(3)])
+            
+            assert all(client is mock_client for client in clients)
+            assert create_calls == 1
+    
     @pytest.mark.asyncio
     async def test_async_context_manager(self, service_class):
         """Test if service can be used as async context manager."""
@@ -0,0 +1,385 @@
+"""
+Unit tests for logging configuration.
+
+Tests the structlog processors and file output pipeline in logging_config.
+"""
+
+import io
+import logging
+import queue
+
+import pytest
+import structlog
+
+from logging_config import (
+    BufferedTimedRotatingFileHandler,
+    DroppingQueueHandler,
+    DualOutputProcessor,
+    IsoTimeStamper,
+    JsonLineFormatter,
+    LogQueueListener,
+    PlainTextFormatter,
+    QueuedStream,
+    SamplingProcessor,
+    TransactionGuidProcessor,
+    configure_logging,
+    get_logger,
+    is_debug_enabled,
+)
+from transaction_context import transaction_context
+
+
+class _RecordingHandler(logging.Handler):
+    """Handler that keeps every record it receives."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.flush_count = 0
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        self.flush_count += 1
+
+
+@pytest.mark.unit
+class TestDualOutputProcessor:
+    """Test the asynchronous file output processor."""
+
+    def test_events_are_written_after_close(self):
+        """Test that queued events are drained to the handler on close."""
+        handler = _RecordingHandler()
+        processor = DualOutputProcessor(handler)
+
+        for i in range(10):
+            processor(None, "info", {"event": "hello", "logger": "test", "i": i})
+        processor(None, "error", {"event": "failed", "logger": "test"})
+        processor.close()
+
+        assert len(handler.records) == 11
+        assert [r.msg["i"] for r in handler.records[:10]] == list(range(10))
+        assert handler.records[-1].levelno == logging.ERROR
+        assert handler.flush_count >= 1
+
+    def test_event_dict_is_returned_unchanged(self):
+        """Test that the console pipeline gets the original event dict."""
+        handler = _RecordingHandler()
+        processor = DualOutputProcessor(handler)
+        event_dict = {"event": "hello", "logger": "test"}
+
+        result = processor(None, "info", event_dict)
+        event_dict["mutated"] = True
+        processor.close()
+
+        assert result is event_dict
+        assert "mutated" not in handler.records[0].msg
+
+    def test_low_levels_dropped_when_queue_full(self):
+        """Test that DEBUG/INFO are dropped but errors kept under backlog."""
+        handler = _RecordingHandler()
+        processor = DualOutputProcessor(handler, max_queue_size=0)
+
+        processor(None, "info", {"event": "dropped"})
+        processor(None, "debug", {"event": "dropped"})
+        processor(None, "error", {"event": "kept"})
+        processor.close()
+
+        assert processor.dropped_count == 2
+        assert [r.msg["event"] for r in handler.records] == ["kept"]
+
+    def test_rendered_lines_are_written_as_is(self):
+        """Test that rendered bytes are decoded and passed through unchanged."""
+        handler = _RecordingHandler()
+        processor = DualOutputProcessor(handler, rendered=True)
+
+        line = b'{"event":"hello"}'
+        assert processor(None, "warning", line) is line
+        processor.close()
+
+        assert handler.records[0].msg == '{"event":"hello"}'
+        assert handler.records[0].levelno == logging.WARNING
+
+    def test_close_is_idempotent(self):
+        """Test that closing twice does not raise."""
+        processor = DualOutputProcessor(_RecordingHandler())
+        processor.close()
+        processor.close()
+
+
+@pytest.mark.unit
+class TestBufferedTimedRotatingFileHandler:
+    """Test the buffered rotating file handler."""
+
+    @staticmethod
+    def _record(level, msg):
+        return logging.LogRecord("test", level, "", 0, msg, (), None)
+
+    def test_info_records_stay_buffered(self, tmp_path):
+        """Test that low-level records are not flushed on every emit."""
+        log_file = tmp_path / "app.log"
+        handler = BufferedTimedRotatingFileHandler(str(log_file), when="H", encoding="utf-8")
+        try:
+            handler.emit(self._record(logging.INFO, "buffered"))
+            assert log_file.read_text(encoding="utf-8") == ""
+
+            handler.flush()
+            assert log_file.read_text(encoding="utf-8") == "buffered\n"
+        finally:
+            handler.close()
+
+    def test_error_records_flush_immediately(self, tmp_path):
+        """Test that records at flush_level are written straight away."""
+        log_file = tmp_path / "app.log"
+        handler = BufferedTimedRotatingFileHandler(str(log_file), when="H", encoding="utf-8")
+        try:
+            handler.emit(self._record(logging.INFO, "first"))
+            handler.emit(self._record(logging.ERROR, "second"))
+            assert log_file.read_text(encoding="utf-8") == "first\nsecond\n"
+        finally:
+            handler.close()
+
+
+@pytest.mark.unit
+class TestLogQueueListener:
+    """Test the queued console output path."""
+
+    def test_bytes_and_records_written_after_stop(self):
+        """Test that both queued lines and records reach their outputs."""
+        log_queue = queue.Queue(maxsize=100)
+        stream = io.BytesIO()
+        handler = _RecordingHandler()
+        listener = LogQueueListener(log_queue, stream, handler)
+        listener.start()
+
+        QueuedStream(log_queue).write(b'{"event":"hello"}\n')
+        queued_logger = logging.Logger("queued")
+        queued_logger.addHandler(DroppingQueueHandler(log_queue))
+        queued_logger.warning("careful")
+        listener.stop()
+        listener.stop()
+
+        assert stream.getvalue() == b'{"event":"hello"}\n'
+        assert [r.getMessage() for r in handler.records] == ["careful"]
+
+    def test_burst_of_lines_written_in_one_call(self):
+        """Test that lines queued together are coalesced into one write."""
+
+        class _CountingStream(io.BytesIO):
+            writes = 0
+
+            def write(self, data):
+                self.writes += 1
+                return super().write(data)
+
+        log_queue = queue.Queue(maxsize=100)
+        stream = _CountingStream()
+        listener = LogQueueListener(log_queue, stream)
+        queued = QueuedStream(log_queue)
+        for i in range(50):
+            queued.write(b"%d\n" % i)
+        listener.start()
+        listener.stop()
+
+        assert stream.getvalue() == b"".join(b"%d\n" % i for i in range(50))
+        assert stream.writes == 1
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that writers count drops when the queue is full."""
+        log_queue = queue.Queue(maxsize=1)
+        stream = QueuedStream(log_queue)
+        queue_handler = DroppingQueueHandler(log_queue)
+
+        stream.write(b"kept\n")
+        stream.write(b"dropped\n")
+        queue_handler.handle(logging.LogRecord("t", logging.INFO, "", 0, "dropped", (), None))
+
+        assert stream.dropped_count == 1
+        assert queue_handler.dropped_count == 1
+        assert log_queue.get_nowait() == b"kept\n"
+
+
+@pytest.mark.unit
+class TestGetLogger:
+    """Test logger retrieval."""
+
+    def test_returns_resolved_logger_once_configured(self):
+        """Test that configured loggers are bound, not lazy proxies."""
+        configure_logging()
+
+        logger = get_logger("test_logging_config")
+
+        assert structlog.get_config()["cache_logger_on_first_use"] is True
+        assert isinstance(logger, structlog.BoundLoggerBase)
+        assert not isinstance(logger, structlog._config.BoundLoggerLazyProxy)
+
+
+@pytest.mark.unit
+class TestReconfigureLogging:
+    """Test that reconfiguring logging keeps existing loggers writing."""
+
+    def test_existing_logger_still_writes_after_reconfigure(self, capfd):
+        """Test that a logger resolved before reconfiguring reaches the console."""
+        import logging_config
+
+        configure_logging()
+        logger = get_logger("test_logging_config")
+        configure_logging()
+
+        logger.info("after-reconfigure")
+        logging_config._queue_listener.stop()
+
+        assert "after-reconfigure" in capfd.readouterr().err
+
+    def test_reconfigure_registers_no_exit_hooks(self, monkeypatch):
+        """Test that exit hooks are registered once, not per configuration."""
+        import atexit
+
+        registered = []
+        monkeypatch.setattr(atexit, "register", registered.append)
+        configure_logging()
+        configure_logging()
+
+        assert registered == []
+
+    def test_debug_after_production_emits_debug_events(self, capfd):
+        """Test that debug mode drops the production level filter."""
+        import logging_config
+
+        configure_logging()
+        configure_logging(debug=True)
+
+        get_logger("test_logging_config").debug("debug-after-production")
+        logging_config._queue_listener.stop()
+
+        assert "debug-after-production" in capfd.readouterr().err
+
+
+@pytest.mark.unit
+class TestIsDebugEnabled:
+    """Test the debug level check used to guard hot-path debug logs."""
+
+    def test_follows_configured_level(self):
+        """Test that the check tracks the level set by configure_logging."""
+        configure_logging(log_level="DEBUG")
+        assert is_debug_enabled() is True
+
+        configure_logging(log_level="INFO")
+        assert is_debug_enabled() is False
+
+
+@pytest.mark.unit
+class TestTransactionGuidProcessor:
+    """Test transaction GUID injection."""
+
+    def test_no_guid_outside_transaction(self):
+        """Test that events outside a transaction are left untouched."""
+        event_dict = TransactionGuidProcessor()(None, "info", {"event": "startup"})
+        assert event_dict == {"event": "startup"}
+
+    def test_guid_added_inside_transaction(self):
+        """Test that the active GUID is added without overriding explicit values."""
+        processor = TransactionGuidProcessor()
+        with transaction_context("test-guid"):
+            assert processor(None, "info", {})["transaction_guid"] == "test-guid"
+            explicit = processor(None, "info", {"transaction_guid": "other"})
+            assert explicit["transaction_guid"] == "other"
+
+
+@pytest.mark.unit
+class TestPlainTextFormatter:
+    """Test plain text formatting of structured events."""
+
+    @staticmethod
+    def _format(msg):
+        record = logging.LogRecord("fallback", logging.INFO, "", 0, msg, (), None)
+        return PlainTextFormatter().format(record)
+
+    def test_formats_event_dict(self):
+        """Test the prefix and key=value extras, skipping None values."""
+        line = self._format({
+            "timestamp": "2024-01-01T00:00:00Z",
+            "level": "info",
+            "logger": "main",
+            "event": "Request completed",
+            "status_code": 200,
+            "error": None,
+        })
+        assert line == "[2024-01-01T00:00:00Z] [INFO] [main] Request completed | status_code=200"
+
+    def test_omits_empty_logger_and_event(self):
+        """Test that empty logger names and events are left out."""
+        line = self._format({"timestamp": "T", "level": "warning", "logger": "", "event": ""})
+        assert line == "[T] [WARNING]"
+
+    def test_non_dict_messages_use_standard_formatting(self):
+        """Test that plain string records fall back to logging.Formatter."""
+        assert self._format("plain message") == "plain message"
+
+
+@pytest.mark.unit
+class TestJsonLineFormatter:
+    """Test JSON lines formatting of structured events."""
+
+    @staticmethod
+    def _format(msg):
+        record = logging.LogRecord("fallback", logging.INFO, "", 0, msg, (), None)
+        return JsonLineFormatter().format(record)
+
+    def test_formats_event_dict(self):
+        """Test that event dicts become one JSON object per line."""
+        line = self._format({"event": "hello", "status_code": 200, 1: "x"})
+        assert line == '{"event":"hello","status_code":200,"1":"x"}'
+
+    def test_rendered_lines_pass_through(self):
+        """Test that already rendered lines are not re-serialized."""
+        assert self._format('{"event":"hello"}') == '{"event":"hello"}'
+
+
+@pytest.mark.unit
+class TestSamplingProcessor:
+    """Test level-based log sampling."""
+
+    def test_zero_rate_drops_events(self):
+        """Test that a rate of 0.0 drops every event for that method."""
+        processor = SamplingProcessor({"debug": 0.0})
+        with pytest.raises(structlog.DropEvent):
+            processor(None, "debug", {"event": "noise"})
+
+    def test_unlisted_methods_are_kept(self):
+        """Test that methods without a rate always pass through."""
+        processor = SamplingProcessor({"debug": 0.0, "info": 0.0})
+        event_dict = {"event": "failure"}
+        assert processor(None, "error", event_dict) is event_dict
+
+    def test_rate_applies_to_random_draw(self):
+        """Test that events are kept when the draw falls below the rate."""
+        processor = SamplingProcessor({"info": 0.5})
+        processor._random = lambda: 0.25
+        assert processor(None, "info", {"event": "kept"}) == {"event": "kept"}
+
+        processor._random = lambda: 0.75
+        with pytest.raises(structlog.DropEvent):
+            processor(None, "info", {"event": "dropped"})
+
+
+@pytest.mark.unit
+class TestIsoTimeStamper:
+    """Test the cached ISO timestamp processor."""
+
+    def test_matches_iso_format(self):
+        """Test the UTC ISO 8601 output for a fixed time."""
+        stamper = IsoTimeStamper()
+        stamper._time = lambda: 1704110400.123456
+
+        assert stamper.stamp() == "2024-01-01T12:00:00.123456Z"
+
+    def test_prefix_refreshed_on_new_second(self):
+        """Test that the cached prefix follows the clock across seconds."""
+        stamper = IsoTimeStamper()
+        stamper._time = lambda: 1704110400.5
+        assert stamper(None, "info", {})["timestamp"] == "2024-01-01T12:00:00.500000Z"
+
+        stamper._time = lambda: 1704110401.25
+        assert stamper(None, "info", {})["timestamp"] == "2024-01-01T12:00:01.250000Z"
@@ -0,0 +1,135 @@
+"""
+Unit tests for HTTP middleware.
+
+Tests request/response logging and error handling in ObservabilityMiddleware.
+"""
+
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from exceptions import Error
+from middleware import ObservabilityMiddleware
+from transaction_context import get_current_request_id
+
+
+def _create_app(**middleware_kwargs):
+    """Build a small app wrapped in ObservabilityMiddleware."""
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {
+            "length": len(body),
+            "request_id": request.state.request_id,
+            "context_request_id": get_current_request_id()
+        }
+
+    @app.get("/fail-large")
+    async def fail_large():
+        return JSONResponse(status_code=500, content={"detail": "y" * 10000})
+
+    @app.get("/fail")
+    async def fail():
+        return JSONResponse(status_code=418, content={"error": "teapot"})
+
+    @app.get("/fail-cookies")
+    async def fail_cookies():
+        response = JSONResponse(status_code=401, content={"error": "login"})
+        response.set_cookie("first", "1")
+        response.set_cookie("second", "2")
+        return response
+
+    @app.get("/raise-error")
+    async def raise_error():
+        raise Error("bad input")
+
+    @app.get("/raise-unexpected")
+    async def raise_unexpected():
+        raise RuntimeError("secret details")
+
+    app.add_middleware(ObservabilityMiddleware, **middleware_kwargs)
+    return app
+
+
+@pytest.mark.unit
+class TestObservabilityMiddleware:
+    """Test the ASGI logging and error handling middleware."""
+
+    @pytest.mark.parametrize("capture_request_body", [True, False])
+    def test_request_body_reaches_handler(self, capture_request_body):
+        """Test that the request body is passed through intact, teed or not."""
+        client = TestClient(_create_app(max_body_log_bytes=4, capture_request_body=capture_request_body))
+
+        response = client.post("/echo", content=b"x" * 1000)
+
+        assert response.status_code == 200
+        assert response.json()["length"] == 1000
+
+    def test_ids_in_state_and_headers(self):
+        """Test that the request ID is shared with handlers, in state and context, and returned."""
+        client = TestClient(_create_app())
+
+        response = client.post("/echo", content=b"{}")
+
+        assert response.headers["X-Request-ID"] == response.json()["request_id"]
+        assert response.json()["context_request_id"] == response.json()["request_id"]
+        for header in ("X-Request-ID", "X-Transaction-GUID"):
+            parsed = uuid.UUID(response.headers[header])
+            assert parsed.version == 4
+            assert str(parsed) == response.headers[header]
+
+    def test_error_response_passed_through(self):
+        """Test that error responses reach the client unchanged."""
+        client = TestClient(_create_app())
+
+        response = client.get("/fail")
+
+        assert response.status_code == 418
+        assert response.json() == {"error": "teapot"}
+        assert "X-Request-ID" in response.headers
+
+    def test_large_error_response_passed_through(self):
+        """Test that error bodies beyond the log cap still reach the client."""
+        client = TestClient(_create_app(max_error_body_log_bytes=16))
+
+        response = client.get("/fail-large")
+
+        assert response.status_code == 500
+        assert response.json() == {"detail": "y" * 10000}
+
+    def test_error_response_keeps_repeated_headers(self):
+        """Test that multi-valued headers such as Set-Cookie are not collapsed."""
+        client = TestClient(_create_app())
+
+        response = client.get("/fail-cookies")
+
+        assert response.status_code == 401
+        cookies = response.headers.get_list("set-cookie")
+        assert len(cookies) == 2
+        assert response.headers["X-Request-ID"]
+
+    def test_custom_error_becomes_400(self):
+        """Test that application Error exceptions become JSON 400 responses."""
+        client = TestClient(_create_app())
+
+        response = client.get("/raise-error")
+
+        assert response.status_code == 400
+        assert response.json()["error"]["type"] == "Error"
+        assert response.json()["error"]["message"] == "bad input"
+        assert response.headers["X-Request-ID"]
+
+    def test_unexpected_error_becomes_generic_500(self):
+        """Test that unexpected exceptions become generic JSON 500 responses."""
+        client = TestClient(_create_app())
+
+        response = client.get("/raise-unexpected")
+
+        assert response.status_code == 500
+        assert response.json()["error"]["code"] == "INTERNAL_ERROR"
+        assert "secret details" not in response.text
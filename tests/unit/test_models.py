@@ -380,5 +380,21 @@ class TestModelSerialization:
             assert isinstance(float_cost, float)
 
 
+@pytest.mark.unit
+class TestModelInfo:
+    """Test the provider/model info stored with each record."""
+    
+    def test_model_info_is_shared_and_read_only(self):
+        """Test that the info reflects settings and is built only once."""
+        from config import settings
+        from database import get_model_info
+        
+        info = get_model_info()
+        
+        assert info == {"provider": settings.provider_name, "model": settings.provider_model}
+        assert get_model_info() is info
+        with pytest.raises(TypeError):
+            info["model"] = "other"
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
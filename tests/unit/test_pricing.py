@@ -0,0 +1,54 @@
+"""
+Unit tests for model pricing.
+
+Tests cost calculation in the pricing module.
+"""
+
+import pytest
+from decimal import Decimal
+
+from pricing import PROVIDER_PRICING, calculate_cost, get_model_pricing
+
+
+@pytest.mark.unit
+class TestCalculateCost:
+    """Test per-request cost calculation."""
+
+    def test_matches_decimal_pricing(self):
+        """Test that costs equal tokens / 1000 * price for every model."""
+        for model, pricing in PROVIDER_PRICING.items():
+            input_cost, output_cost, total_cost = calculate_cost(model, 1234, 567)
+
+            expected_input = Decimal(1234) / 1000 * pricing["input_cost_per_1k"]
+            expected_output = Decimal(567) / 1000 * pricing["output_cost_per_1k"]
+            assert input_cost == expected_input
+            assert output_cost == expected_output
+            assert total_cost == expected_input + expected_output
+
+    def test_known_model(self):
+        """Test the documented Llama 3 example."""
+        _, _, total_cost = calculate_cost("meta-llama/llama-3-8b-instruct", 1000, 500)
+        assert total_cost == Decimal("0.00027")
+
+    def test_unknown_model_is_free(self):
+        """Test that unknown models fall back to zero cost."""
+        assert calculate_cost("unknown-model", 1000, 500) == (0, 0, 0)
+
+    def test_free_model_short_circuits(self):
+        """Test that free models return the shared zero result."""
+        assert calculate_cost("llama2", 1000, 500) == (0, 0, 0)
+        assert calculate_cost("llama2", 1000, 500) is calculate_cost("mistral", 1, 1)
+
+
+@pytest.mark.unit
+class TestPricingTables:
+    """Test the shared pricing data."""
+
+    def test_pricing_tables_are_read_only(self):
+        """Test that shared prices cannot be mutated at runtime."""
+        with pytest.raises(TypeError):
+            PROVIDER_PRICING["new-model"] = {}
+        with pytest.raises(TypeError):
+            get_model_pricing("openai/gpt-4")["input_cost_per_1k"] = Decimal("0")
+        with pytest.raises(TypeError):
+            get_model_pricing("unknown-model")["input_cost_per_1k"] = Decimal("1")